@@ -0,0 +1,100 @@
+"""
+Benchmark calculate_field_variations on a report with many change details
+
+Builds a synthetic list of change details whose changed fields are master
+sheet headers (plus a few case/underscore variants and unknown columns) and
+times the header -> ReconciliationReport field lookup table against the
+previous per-change scan of the header map.
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_field_variations [--changes 10000]
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from routers.universal_records import helpers
+from utils.quarterly_sheets_manager import quarterly_manager
+
+EXTRA_FIELDS = ["UNMAPPED_REMARK", "Branch Code"]
+
+
+def build_change_details(changes: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """``changes`` change details with 1-8 changed fields each"""
+    rng = random.Random(seed)
+    headers = quarterly_manager._get_default_headers()
+    fields = (
+        headers
+        + [header.lower() for header in headers[:10]]
+        + list(helpers.RECONCILIATION_HEADER_FIELDS.values())[:10]
+        + EXTRA_FIELDS
+    )
+    return [
+        {
+            "policy_number": f"POL{number:09d}",
+            "changed_fields": {
+                field: "Updated" for field in rng.sample(fields, rng.randint(1, 8))
+            },
+        }
+        for number in range(changes)
+    ]
+
+
+def legacy_field_variations(processed_records: List[Dict[str, Any]]) -> Dict[str, int]:
+    """The previous implementation: scan the header map for every change"""
+    header_to_field_map = helpers.RECONCILIATION_HEADER_FIELDS
+    field_variations = {}
+    for header in quarterly_manager._get_default_headers():
+        field_name = header_to_field_map.get(header)
+        field_variations[field_name or helpers._header_to_identifier(header)] = 0
+
+    for record in processed_records:
+        for field in list(record.get("changed_fields", {}).keys()):
+            mapped_field = None
+            for header, field_name in header_to_field_map.items():
+                if (
+                    field.lower() == header.lower()
+                    or field.lower().replace(" ", "_") == field_name
+                ):
+                    mapped_field = field_name
+                    break
+            if not mapped_field:
+                mapped_field = helpers._header_to_identifier(str(field))
+            if mapped_field in field_variations:
+                field_variations[mapped_field] += 1
+    return field_variations
+
+
+def _time(function, *args) -> float:
+    started_at = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--changes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    details = build_change_details(args.changes)
+    assert helpers.calculate_field_variations(details) == legacy_field_variations(
+        details
+    )
+
+    legacy = min(_time(legacy_field_variations, details) for _ in range(args.repeat))
+    current = min(
+        _time(helpers.calculate_field_variations, details) for _ in range(args.repeat)
+    )
+    changed = sum(len(detail["changed_fields"]) for detail in details)
+
+    print(f"{'Implementation':<24}{'Seconds':>10}{'Changes/s':>14}")
+    print(f"{'header map scan':<24}{legacy:>10.4f}{changed / legacy:>14,.0f}")
+    print(f"{'lookup table':<24}{current:>10.4f}{changed / current:>14,.0f}")
+    print(f"Speedup: {legacy / current:.1f}x over {args.changes} change details")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark parse_csv_with_mapping for every insurer in record-mapper.csv
+
+Builds a synthetic statement per insurer, using that insurer's source headers
+(GST formula components expanded, plus a few unmapped columns), and times the
+mapping of the whole file.
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_insurer_mapping [--rows 100000] [--insurer ICICI]
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from typing import Dict, List
+
+from routers.universal_records import helpers
+
+SAMPLE_VALUES = ["", "0", "1,234.50", "987.1", "ABC LTD", "MH12AB1234", "Y"]
+DATE_VALUES = ["15/04/2025", "2025-04-15", "15-04-2025 10:30", "15/04/25"]
+
+
+def _source_columns(mapping: Dict[str, str]) -> List[str]:
+    columns = []
+    for source in mapping:
+        if "+" in source:
+            columns.extend(component.strip() for component in source.split("+"))
+        else:
+            columns.append(source)
+    return columns + ["UNMAPPED_REMARK", "UNMAPPED_BRANCH"]
+
+
+def build_statement(mapping: Dict[str, str], rows: int, seed: int = 7) -> str:
+    """Synthetic insurer CSV with ``rows`` data rows"""
+    rng = random.Random(seed)
+    columns = _source_columns(mapping)
+    date_columns = {
+        index
+        for index, column in enumerate(columns)
+        if mapping.get(column) in helpers.MAPPED_DATE_FIELDS
+    }
+    policy_columns = {
+        index
+        for index, column in enumerate(columns)
+        if mapping.get(column) == "Policy number"
+    }
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["\ufeff" + columns[0]] + columns[1:])
+    for row_number in range(rows):
+        writer.writerow(
+            [
+                f"POL{row_number:09d}"
+                if index in policy_columns
+                else rng.choice(DATE_VALUES)
+                if index in date_columns
+                else rng.choice(SAMPLE_VALUES)
+                for index in range(len(columns))
+            ]
+        )
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--insurer", action="append", help="Limit to these insurers")
+    args = parser.parse_args()
+
+    helpers._load_mappings_from_csv()
+    insurers = args.insurer or helpers.get_available_insurers()
+
+    print(f"{'Insurer':<32}{'Columns':>8}{'Seconds':>10}{'Rows/s':>12}")
+    for insurer_name in insurers:
+        mapping = helpers.get_insurer_mapping(insurer_name)
+        if not mapping:
+            print(f"{insurer_name:<32} no mapping")
+            continue
+
+        content = build_statement(mapping, args.rows)
+        started_at = time.perf_counter()
+        records, headers, _ = helpers.parse_csv_with_mapping(content, mapping)
+        elapsed = time.perf_counter() - started_at
+        assert len(records) == args.rows
+
+        print(
+            f"{insurer_name:<32}{len(headers):>8}{elapsed:>10.2f}{args.rows / elapsed:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
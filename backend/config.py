@@ -227,6 +227,44 @@ GOOGLE_SHEETS_CREDENTIALS = {
     "universe_domain": os.getenv("GOOGLE_SHEETS_UNIVERSE_DOMAIN"),
 }
 GOOGLE_SHEETS_DOCUMENT_ID = os.getenv("GOOGLE_SHEETS_DOCUMENT_ID")
+# How long a downloaded quarter sheet snapshot is served from memory (0 disables)
+GOOGLE_SHEETS_SNAPSHOT_TTL_SECONDS = int(
+    os.getenv("GOOGLE_SHEETS_SNAPSHOT_TTL_SECONDS", "60")
+)
+# How often cached template rows/headers are re-checked against the sheet
+GOOGLE_SHEETS_TEMPLATE_CHECK_MINUTES = float(
+    os.getenv("GOOGLE_SHEETS_TEMPLATE_CHECK_MINUTES", "10")
+)
+# How long the cached worksheet list (titles, quarter sheets) is trusted
+GOOGLE_SHEETS_DIRECTORY_REFRESH_SECONDS = int(
+    os.getenv("GOOGLE_SHEETS_DIRECTORY_REFRESH_SECONDS", "300")
+)
+# Timeout for each request made by the async Sheets client
+GOOGLE_SHEETS_HTTP_TIMEOUT_SECONDS = float(
+    os.getenv("GOOGLE_SHEETS_HTTP_TIMEOUT_SECONDS", "30")
+)
+# Sheets API request quota of the whole project (read and write quotas are separate)
+GOOGLE_SHEETS_READ_REQUESTS_PER_MINUTE = int(
+    os.getenv("GOOGLE_SHEETS_READ_REQUESTS_PER_MINUTE", "60")
+)
+GOOGLE_SHEETS_WRITE_REQUESTS_PER_MINUTE = int(
+    os.getenv("GOOGLE_SHEETS_WRITE_REQUESTS_PER_MINUTE", "60")
+)
+# Processes the Sheets refill rate is split across; 1 lets every process use the
+# whole quota and relies on 429 backoff when they overshoot it together
+GOOGLE_SHEETS_WORKER_PROCESSES = int(os.getenv("GOOGLE_SHEETS_WORKER_PROCESSES", "1"))
+# Retries for Sheets requests that fail with 429 or 5xx
+GOOGLE_SHEETS_MAX_RETRIES = int(os.getenv("GOOGLE_SHEETS_MAX_RETRIES", "5"))
+# Outbox entries the sheet sync worker writes per batch
+SHEET_SYNC_BATCH_SIZE = int(os.getenv("SHEET_SYNC_BATCH_SIZE", "100"))
+# How often the sheet sync worker polls the outbox when not notified
+SHEET_SYNC_POLL_SECONDS = float(os.getenv("SHEET_SYNC_POLL_SECONDS", "5"))
+# Attempts before an outbox entry is marked failed
+SHEET_SYNC_MAX_ATTEMPTS = int(os.getenv("SHEET_SYNC_MAX_ATTEMPTS", "10"))
+# How often the upload job runner polls for queued universal-record uploads
+UPLOAD_JOB_POLL_SECONDS = float(os.getenv("UPLOAD_JOB_POLL_SECONDS", "5"))
+# Attempts before a universal-record upload job is marked failed
+UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 LLMWHISPERER_API_KEY = os.getenv("LLMWHISPERER_API_KEY")
@@ -17,7 +17,12 @@ from routers.superadmin.superadmin import router as superadmin_router
 from routers.universal_records.universal_records import (
     router as universal_records_router,
 )
+from routers.universal_records.upload_jobs import upload_job_runner
 from routers.users.users import router as users_router
+from utils.async_sheets import async_sheets_client
+from utils.sheet_cache import sheet_snapshot_cache
+from utils.sheet_outbox import sheet_sync_worker
+from utils.sheets_scheduler import sheets_scheduler
 
 sentry_sdk.init(
     dsn="https://9b2f10070541c7e5fd5f968f9062e470@o4510076195504128.ingest.us.sentry.io/4510076196880384",
@@ -60,12 +65,17 @@ logger.info("--- FastAPI application starting up ---")
 @app.on_event("startup")
 async def startup_event():
     """Application startup event"""
+    sheet_sync_worker.start()
+    upload_job_runner.start()
     logger.info("Application startup completed successfully")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
+    await sheet_sync_worker.stop()
+    await upload_job_runner.stop()
+    await async_sheets_client.aclose()
     logger.info("Application shutdown completed successfully")
 
 
@@ -193,6 +203,15 @@ def health_check():
     return {"status": "healthy", "service": "insurezeal-api"}
 
 
+@app.get("/health/sheets")
+def sheets_health_check():
+    """Google Sheets request scheduler metrics (queue depth, wait times, 429s)"""
+    return {
+        "scheduler": sheets_scheduler.stats(),
+        "snapshot_cache": sheet_snapshot_cache.stats(),
+    }
+
+
 logger.info("--- FastAPI application startup complete ---")
 
 
@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
     PrimaryKeyConstraint,
     SmallInteger,
@@ -329,6 +330,14 @@ class CutPay(Base):
         Numeric(15, 2), nullable=True
     )
 
+    # Quarterly sheet sync state, set once the sheet sync worker wrote the row
+    synced_to_cutpay_sheet: Mapped[bool] = mapped_column(
+        Boolean, server_default=text("false"), nullable=False
+    )
+    cutpay_sheet_row_id: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True
+    )
+
 
 class Policy(Base):
     """
@@ -786,3 +795,189 @@ class ReconciliationReport(Base):
         Index("idx_reconciliation_reports_created_at", "created_at"),
         Index("idx_reconciliation_reports_processed_by", "processed_by"),
     )
+
+
+class SheetSyncOutbox(Base):
+    """
+    Sheet Sync Outbox Model
+    Pending Google Sheets writes, inserted in the same transaction as the
+    CutPay/Policy change and drained to the quarterly sheets by a background worker
+    """
+
+    __tablename__ = "sheet_sync_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    # What changed: "cutpay" or "policy", and "create" or "update"
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+    source_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    operation: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Target quarterly sheet row, identified by policy number
+    policy_number: Mapped[str] = mapped_column(String(100), nullable=False)
+    quarter: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Entries sharing a key are coalesced; only the latest payload is written
+    idempotency_key: Mapped[str] = mapped_column(String(200), nullable=False)
+
+    # Complete Google Sheets record keyed by sheet header
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # Delivery state: pending → processing → done / failed
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="pending", server_default="pending"
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    sheet_row: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    available_at: Mapped[DateTime] = mapped_column(
+        DateTime(True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+    locked_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(True), nullable=True)
+    processed_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(True), nullable=True
+    )
+
+    # Audit fields
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+
+    # Constraints
+    __table_args__ = (
+        Index("idx_sheet_sync_outbox_status_available", "status", "available_at"),
+        Index("idx_sheet_sync_outbox_idempotency_key", "idempotency_key"),
+        Index("idx_sheet_sync_outbox_policy_number", "policy_number"),
+    )
+
+
+class UniversalRecordUploadJob(Base):
+    """
+    Universal Record Upload Job Model
+    A statement upload reconciled against quarterly sheets in the background,
+    with progress counters and per-quarter checkpoints for resuming
+    """
+
+    __tablename__ = "universal_record_upload_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    # What was uploaded and where it goes
+    insurer_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    file_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # SHA-256 of the file content, insurer mapping and targets; an identical
+    # re-upload reuses the job instead of reconciling again
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Target sheets as [{"quarter": 1, "year": 2025}, ...]
+    targets: Mapped[list] = mapped_column(JSONB, nullable=False)
+
+    # Mapped, deduplicated statement records and the file info of the report
+    records: Mapped[list] = mapped_column(JSONB, nullable=False)
+    file_info: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # Run state: queued → running → completed / failed
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="queued", server_default="queued"
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    current_quarter: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+
+    # Progress counters across the finished (and current) quarters
+    rows_parsed: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rows_matched: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rows_updated: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rows_added: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rows_errored: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    # Results of finished quarters keyed by sheet name ("Q1-2025"); a resumed
+    # job skips these
+    checkpoints: Mapped[dict] = mapped_column(
+        JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb")
+    )
+
+    # Final processing report and the persisted reconciliation report
+    report: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    reconciliation_report_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("reconciliation_reports.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    processed_by: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    available_at: Mapped[DateTime] = mapped_column(
+        DateTime(True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+    locked_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(True), nullable=True)
+    started_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(True), nullable=True
+    )
+    finished_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(True), nullable=True
+    )
+
+    # Audit fields
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        onupdate=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
+
+    # Constraints
+    __table_args__ = (
+        Index("idx_universal_record_upload_jobs_status", "status", "available_at"),
+        Index("idx_universal_record_upload_jobs_processed_by", "processed_by"),
+        Index("idx_universal_record_upload_jobs_fingerprint", "fingerprint"),
+    )
+
+
+class UniversalRecordRowHash(Base):
+    """
+    Universal Record Row Hash Model
+    Hash of the statement row last reconciled into each quarterly sheet row,
+    so overlapping uploads only reconcile rows that changed since
+    """
+
+    __tablename__ = "universal_record_row_hashes"
+
+    year: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    quarter: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    # Normalized policy number identifying the sheet row
+    policy_number: Mapped[str] = mapped_column(String(100), nullable=False)
+    # 16-byte BLAKE2b digest of the mapped record and insurer
+    row_hash: Mapped[bytes] = mapped_column(LargeBinary(16), nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        onupdate=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
+
+    # Constraints
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "year", "quarter", "policy_number", name="universal_record_row_hashes_pkey"
+        ),
+    )
@@ -83,6 +83,7 @@ import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -681,7 +682,9 @@ async def assign_child_id(
             "created_at": child_request.created_at,
             "updated_at": child_request.updated_at,
         }
-        google_sheets_sync.sync_child_id_request(google_sheets_dict, "APPROVE")
+        await run_in_threadpool(
+            google_sheets_sync.sync_child_id_request, google_sheets_dict, "APPROVE"
+        )
 
         return ChildIdResponse.model_validate(req_dict)
 
@@ -791,7 +794,9 @@ async def reject_child_request(
             "created_at": child_request.created_at,
             "updated_at": child_request.updated_at,
         }
-        google_sheets_sync.sync_child_id_request(google_sheets_dict, "REJECT")
+        await run_in_threadpool(
+            google_sheets_sync.sync_child_id_request, google_sheets_dict, "REJECT"
+        )
 
         return ChildIdResponse.model_validate(req_dict)
 
@@ -907,7 +912,9 @@ async def toggle_child_id_suspension(
         }
         # Determine the action based on the final status
         sync_action = "SUSPEND" if child_request.status == "suspended" else "UNSUSPEND"
-        google_sheets_sync.sync_child_id_request(google_sheets_dict, sync_action)
+        await run_in_threadpool(
+            google_sheets_sync.sync_child_id_request, google_sheets_dict, sync_action
+        )
 
         return ChildIdResponse.model_validate(req_dict)
 
@@ -33,6 +33,7 @@ from models import (
     CutPayAgentConfig,
     Insurer,
 )
+from utils.sheet_outbox import enqueue_sheet_sync, sheet_sync_worker
 
 from ..auth.auth import get_current_user
 from .cutpay_helpers import (
@@ -45,6 +46,7 @@ from .cutpay_helpers import (
     prepare_complete_sheets_data,
     prepare_complete_sheets_data_for_update,
     resolve_broker_code_to_id,
+    resolve_sheet_names,
     resolve_insurer_code_to_id,
     validate_and_resolve_codes,
     validate_and_resolve_codes_with_names,
@@ -93,7 +95,7 @@ async def create_cutpay_transaction(
     cutpay = None
     try:
         logger.info(
-            "Step 1: Beginning core data transaction for new CutPay (selective fields only)."
+            "Beginning core data transaction for new CutPay (selective fields only)."
         )
         async with db.begin():
             validation_errors = validate_cutpay_data(cutpay_data.dict())
@@ -214,123 +216,53 @@ async def create_cutpay_transaction(
             auto_populate_relationship_data(cutpay, db)
 
             db.add(cutpay)
+            await db.flush()
+
+            # Queue the complete record (all fields) for the quarterly sheet in
+            # the same transaction; the sheet sync worker writes it. The
+            # savepoint keeps a failure here from rolling back the CutPay row.
+            try:
+                async with db.begin_nested():
+                    broker_name, insurer_name = await resolve_sheet_names(
+                        db, cutpay, broker_name, insurer_name
+                    )
+                    complete_sheets_data = prepare_complete_sheets_data(
+                        cutpay_data, cutpay, broker_name, insurer_name
+                    )
+                    from utils.quarterly_sheets_manager import quarterly_manager
+
+                    _, quarter, year = quarterly_manager.get_current_quarter_info()
+                    enqueue_sheet_sync(
+                        db,
+                        source="cutpay",
+                        source_id=cutpay.id,
+                        operation="CREATE",
+                        policy_number=cutpay.policy_number,
+                        record_data=complete_sheets_data,
+                        quarter=quarter,
+                        year=year,
+                    )
+            except Exception:
+                logger.critical(
+                    f"Queueing Google Sheets sync failed for new CutPay, but database changes are saved. Traceback:\n{traceback.format_exc()}"
+                )
 
         await db.refresh(cutpay)
+        sheet_sync_worker.notify()
         logger.info(
-            f"Step 1 SUCCESS: Successfully created CutPay ID {cutpay.id} with selective fields."
+            f"Successfully created CutPay ID {cutpay.id} with selective fields; Google Sheets sync queued."
         )
+        return database_cutpay_response(cutpay)
 
     except Exception as e:
         logger.critical(
-            f"Step 1 FAILED: Database creation failed. Traceback:\n{traceback.format_exc()}"
+            f"Database creation failed. Traceback:\n{traceback.format_exc()}"
         )
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create CutPay transaction in the database: {str(e)}",
         )
 
-    sync_results = None
-    try:
-        logger.info(
-            f"Step 2: Starting Google Sheets sync for new CutPay ID {cutpay.id} with ALL fields."
-        )
-        from utils.quarterly_sheets_manager import quarterly_manager
-
-        # If no names found from codes, get names from database using stored IDs
-        if not broker_name and cutpay.broker_id:
-            try:
-                broker_result = await db.execute(
-                    select(Broker).where(Broker.id == cutpay.broker_id)
-                )
-                broker = broker_result.scalar_one_or_none()
-                if broker:
-                    broker_name = broker.name
-                    logger.info(
-                        f"Retrieved broker name from database: {broker_name} (ID: {cutpay.broker_id})"
-                    )
-            except Exception as e:
-                logger.warning(f"Could not fetch broker name from database: {e}")
-
-        if not insurer_name and cutpay.insurer_id:
-            try:
-                insurer_result = await db.execute(
-                    select(Insurer).where(Insurer.id == cutpay.insurer_id)
-                )
-                insurer = insurer_result.scalar_one_or_none()
-                if insurer:
-                    insurer_name = insurer.name
-                    logger.info(
-                        f"Retrieved insurer name from database: {insurer_name} (ID: {cutpay.insurer_id})"
-                    )
-            except Exception as e:
-                logger.warning(f"Could not fetch insurer name from database: {e}")
-
-        logger.info(
-            f"Final names for Google Sheets - Broker: '{broker_name}', Insurer: '{insurer_name}'"
-        )
-
-        # Prepare complete data for Google Sheets (all fields from request)
-        complete_sheets_data = prepare_complete_sheets_data(
-            cutpay_data, cutpay, broker_name, insurer_name
-        )
-
-        logger.info(
-            f"Syncing {len(complete_sheets_data)} fields to Google Sheets: {list(complete_sheets_data.keys())}"
-        )
-
-        # Route to quarterly sheet with complete data
-        quarterly_result = await run_in_threadpool(
-            quarterly_manager.route_new_record_to_current_quarter, complete_sheets_data
-        )
-        sync_results = {"cutpay": quarterly_result}
-        logger.info(
-            f"Step 2 SUCCESS: Google Sheets sync finished for CutPay ID {cutpay.id}."
-        )
-
-    except Exception:
-        logger.critical(
-            f"Step 2 FAILED: Google Sheets sync failed for CutPay ID {cutpay.id}, but database changes are saved. Traceback:\n{traceback.format_exc()}"
-        )
-        return database_cutpay_response(cutpay)
-
-    if not sync_results:
-        logger.warning("Step 3 SKIPPED: No sync results to update flags.")
-        return database_cutpay_response(cutpay)
-
-    try:
-        logger.info(
-            "Step 3: Beginning transaction to update sync flags with a new session."
-        )
-        from config import AsyncSessionLocal
-
-        async with AsyncSessionLocal() as final_db_session:
-            async with final_db_session.begin():
-                result = await final_db_session.execute(
-                    select(CutPay).filter(CutPay.id == cutpay.id)
-                )
-                final_cutpay = result.scalar_one()
-
-                if sync_results.get("cutpay", {}).get("success"):
-                    final_cutpay.cutpay_sheet_row_id = sync_results["cutpay"].get(
-                        "row_id"
-                    )
-                    final_cutpay.synced_to_cutpay_sheet = True
-
-            await final_db_session.refresh(final_cutpay)
-            logger.info(
-                f"Step 3 SUCCESS: Successfully updated sync flags for CutPay ID {final_cutpay.id}."
-            )
-            logger.info(
-                f"--- Create for CutPay ID: {cutpay.id} finished successfully. ---"
-            )
-            return database_cutpay_response(final_cutpay)
-
-    except Exception:
-        logger.critical(
-            f"Step 3 FAILED: Updating sync flags failed for CutPay ID {cutpay.id}. Traceback:\n{traceback.format_exc()}"
-        )
-        return database_cutpay_response(cutpay)
-
 
 @router.get("/", response_model=List[CutPayDatabaseResponse])
 async def list_cutpay_transactions(
@@ -807,9 +739,9 @@ async def bulk_update_cutpay_transactions(
                 if sync_results.get("cutpay", {}).get("success"):
                     cutpay.synced_to_cutpay_sheet = True
                     if sync_results["cutpay"].get("row_number"):
-                        cutpay.cutpay_sheet_row_id = sync_results["cutpay"][
-                            "row_number"
-                        ]
+                        cutpay.cutpay_sheet_row_id = str(
+                            sync_results["cutpay"]["row_number"]
+                        )
 
                 await db.commit()
                 await db.refresh(cutpay)
@@ -903,8 +835,8 @@ async def manual_sync_to_google_sheets(
             # Update sync flags
             if quarterly_result and quarterly_result.get("success"):
                 cutpay.synced_to_cutpay_sheet = True
-                if quarterly_result.get("row_id"):
-                    cutpay.cutpay_sheet_row_id = quarterly_result["row_id"]
+                if quarterly_result.get("row_number"):
+                    cutpay.cutpay_sheet_row_id = str(quarterly_result["row_number"])
 
             await db.commit()
 
@@ -1058,10 +990,12 @@ async def get_cutpay_transaction_by_policy(
         try:
             from utils.quarterly_sheets_manager import quarterly_manager
 
-            # Get the specific quarter sheet by name
-            target_sheet = quarterly_manager.get_quarterly_sheet(quarter, year)
+            # Check the specific quarter sheet exists (cached worksheet directory)
+            target_exists = await run_in_threadpool(
+                quarterly_manager.sheet_exists, quarter_sheet_name
+            )
 
-            if not target_sheet:
+            if not target_exists:
                 logger.warning(
                     f"Quarter sheet '{quarter_sheet_name}' not found in Google Sheets"
                 )
@@ -1074,71 +1008,34 @@ async def get_cutpay_transaction_by_policy(
                 )
                 sheet_found = True
 
-                # Get all data from the specific sheet
-                all_values = target_sheet.get_all_values()
-                if not all_values:
+                # Locate the policy row through the policy number index
+                found = await quarterly_manager.afind_row_by_policy_number(
+                    quarter_sheet_name, policy_number
+                )
+
+                if found is None:
                     sheets_data = {
-                        "error": f"No data found in sheet '{quarter_sheet_name}'"
+                        "error": f"Policy number '{policy_number}' not found in sheet '{quarter_sheet_name}'"
                     }
-                else:
-                    headers = all_values[0] if all_values else []
                     logger.info(
-                        f"Sheet has {len(headers)} columns and {len(all_values)-1} data rows"
+                        f"Policy '{policy_number}' not found in sheet '{quarter_sheet_name}'"
                     )
+                else:
+                    headers = found["headers"]
+                    policy_row_data = found["values"]
+                    found_row_index = found["row_number"]
 
-                    # Find policy number column
-                    policy_col_index = -1
+                    # Map headers to values for the found row
+                    sheets_data = {}
                     for i, header in enumerate(headers):
-                        if header.lower().strip() in ["policy number", "policy_number"]:
-                            policy_col_index = i
-                            logger.info(
-                                f"Found policy number column at index {i}: '{header}'"
-                            )
-                            break
-
-                    if policy_col_index == -1:
-                        sheets_data = {
-                            "error": f"Policy number column not found in sheet '{quarter_sheet_name}'"
-                        }
-                        logger.warning(
-                            "Policy number column not found in sheet headers"
-                        )
-                    else:
-                        # Search for the policy number in the sheet
-                        policy_row_data = None
-                        found_row_index = -1
-
-                        # Skip header (row 1) and dummy/formula row (row 2)
-                        for row_index, row_data in enumerate(all_values[2:], start=3):
-                            if policy_col_index < len(row_data):
-                                cell_value = row_data[policy_col_index].strip()
-                                if cell_value == policy_number.strip():
-                                    policy_row_data = row_data
-                                    found_row_index = row_index
-                                    logger.info(
-                                        f"Found policy '{policy_number}' in sheet row {row_index}"
-                                    )
-                                    break
-
-                        if not policy_row_data:
-                            sheets_data = {
-                                "error": f"Policy number '{policy_number}' not found in sheet '{quarter_sheet_name}'"
-                            }
-                            logger.info(
-                                f"Policy '{policy_number}' not found in {len(all_values)-1} data rows"
-                            )
+                        if i < len(policy_row_data):
+                            sheets_data[header] = policy_row_data[i]
                         else:
-                            # Map headers to values for the found row
-                            sheets_data = {}
-                            for i, header in enumerate(headers):
-                                if i < len(policy_row_data):
-                                    sheets_data[header] = policy_row_data[i]
-                                else:
-                                    sheets_data[header] = ""
+                            sheets_data[header] = ""
 
-                            logger.info(
-                                f"Successfully retrieved {len(sheets_data)} fields from sheet '{quarter_sheet_name}' row {found_row_index}"
-                            )
+                    logger.info(
+                        f"Successfully retrieved {len(sheets_data)} fields from sheet '{quarter_sheet_name}' row {found_row_index}"
+                    )
 
         except Exception as sheets_error:
             logger.error(f"Failed to fetch from Google Sheets: {str(sheets_error)}")
@@ -1253,7 +1150,7 @@ async def update_cutpay_transaction_by_policy(
 
     try:
         logger.info(
-            f"Step 1: Beginning database update for policy '{policy_number}' in quarter '{quarter_sheet_name}' (selective fields only)."
+            f"Beginning database update for policy '{policy_number}' in quarter '{quarter_sheet_name}' (selective fields only)."
         )
         async with db.begin():
             # Get the existing record by policy number
@@ -1428,144 +1325,57 @@ async def update_cutpay_transaction_by_policy(
 
             # Auto-populate relationship data
             auto_populate_relationship_data(cutpay, db)
+            await db.flush()
+
+            # Queue the complete record for the quarterly sheet in the same
+            # transaction. The sheet row is looked up by the (possibly
+            # updated) policy number. The savepoint keeps a failure here from
+            # rolling back the CutPay update.
+            try:
+                async with db.begin_nested():
+                    broker_name, insurer_name = await resolve_sheet_names(
+                        db, cutpay, broker_name, insurer_name
+                    )
+                    complete_sheets_data = prepare_complete_sheets_data_for_update(
+                        cutpay_data, cutpay, broker_name, insurer_name
+                    )
+                    target_policy_number = (
+                        updated_policy_number
+                        if updated_policy_number
+                        else policy_number
+                    )
+                    enqueue_sheet_sync(
+                        db,
+                        source="cutpay",
+                        source_id=cutpay.id,
+                        operation="UPDATE",
+                        policy_number=target_policy_number,
+                        record_data=complete_sheets_data,
+                        quarter=quarter,
+                        year=year,
+                    )
+            except Exception:
+                logger.critical(
+                    f"Queueing quarterly Google Sheets sync failed for policy '{policy_number}', but database changes are saved. Traceback:\n{traceback.format_exc()}"
+                )
 
         # Refresh to get committed data
         await db.refresh(cutpay)
+        sheet_sync_worker.notify()
         logger.info(
-            f"Step 1 SUCCESS: Successfully updated policy '{policy_number}' (CutPay ID {cutpay.id}) with selective fields."
+            f"Successfully updated policy '{policy_number}' (CutPay ID {cutpay.id}) with selective fields; sync to '{quarter_sheet_name}' queued."
         )
+        return database_cutpay_response(cutpay)
 
     except Exception as e:
         logger.critical(
-            f"Step 1 FAILED: Database update failed for policy '{policy_number}'. Traceback:\n{traceback.format_exc()}"
+            f"Database update failed for policy '{policy_number}'. Traceback:\n{traceback.format_exc()}"
         )
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update CutPay transaction in the database: {str(e)}",
         )
 
-    # Google Sheets sync with complete data to specific quarterly sheet
-    sync_results = None
-    try:
-        logger.info(
-            f"Step 2: Starting quarterly Google Sheets sync for policy '{policy_number}' in '{quarter_sheet_name}' with ALL fields."
-        )
-        from utils.quarterly_sheets_manager import quarterly_manager
-
-        # If no names found from codes, get names from database using stored IDs
-        if not broker_name and cutpay.broker_id:
-            try:
-                broker_result = await db.execute(
-                    select(Broker).where(Broker.id == cutpay.broker_id)
-                )
-                broker = broker_result.scalar_one_or_none()
-                if broker:
-                    broker_name = broker.name
-                    logger.info(
-                        f"Retrieved broker name from database: {broker_name} (ID: {cutpay.broker_id})"
-                    )
-            except Exception as e:
-                logger.warning(f"Could not fetch broker name from database: {e}")
-
-        if not insurer_name and cutpay.insurer_id:
-            try:
-                insurer_result = await db.execute(
-                    select(Insurer).where(Insurer.id == cutpay.insurer_id)
-                )
-                insurer = insurer_result.scalar_one_or_none()
-                if insurer:
-                    insurer_name = insurer.name
-                    logger.info(
-                        f"Retrieved insurer name from database: {insurer_name} (ID: {cutpay.insurer_id})"
-                    )
-            except Exception as e:
-                logger.warning(f"Could not fetch insurer name from database: {e}")
-
-        logger.info(
-            f"Final names for quarterly Google Sheets - Broker: '{broker_name}', Insurer: '{insurer_name}'"
-        )
-
-        # Prepare complete data for Google Sheets (all fields from request)
-        complete_sheets_data = prepare_complete_sheets_data_for_update(
-            cutpay_data, cutpay, broker_name, insurer_name
-        )
-
-        logger.info(
-            f"Syncing {len(complete_sheets_data)} fields to quarterly sheet '{quarter_sheet_name}': {list(complete_sheets_data.keys())}"
-        )
-
-        # Use the update method that targets specific quarterly sheet by policy number
-        target_policy_number = (
-            updated_policy_number if updated_policy_number else policy_number
-        )
-        logger.info(
-            f"🔍 QUARTERLY SHEETS UPDATE DEBUG for policy '{target_policy_number}' in '{quarter_sheet_name}':"
-        )
-        logger.info(f"   - Original policy number: '{policy_number}'")
-        logger.info(f"   - Updated policy number: '{updated_policy_number}'")
-        logger.info(f"   - Target policy number: '{target_policy_number}'")
-        logger.info(f"   - Quarter: {quarter}, Year: {year}")
-
-        # Update the specific quarterly sheet with quarter and year parameters
-        quarterly_result = await run_in_threadpool(
-            quarterly_manager.update_existing_record_by_policy_number,
-            complete_sheets_data,
-            target_policy_number,
-            quarter,  # Specify quarter
-            year,  # Specify year
-        )
-
-        sync_results = {"cutpay": quarterly_result}
-        logger.info(
-            f"Step 2 SUCCESS: Quarterly Google Sheets sync finished for policy '{target_policy_number}' in '{quarter_sheet_name}': {quarterly_result.get('operation', 'UPDATE')}"
-        )
-
-    except Exception:
-        logger.critical(
-            f"Step 2 FAILED: Quarterly Google Sheets sync failed for policy '{policy_number}', but database changes are saved. Traceback:\n{traceback.format_exc()}"
-        )
-        return database_cutpay_response(cutpay)
-
-    if not sync_results:
-        logger.warning("Step 3 SKIPPED: No sync results to update flags.")
-        return database_cutpay_response(cutpay)
-
-    # Update sync flags
-    try:
-        logger.info(
-            "Step 3: Beginning transaction to update sync flags with a new session."
-        )
-        from config import AsyncSessionLocal
-
-        async with AsyncSessionLocal() as final_db_session:
-            async with final_db_session.begin():
-                result = await final_db_session.execute(
-                    select(CutPay).filter(CutPay.id == cutpay.id)
-                )
-                final_cutpay = result.scalar_one_or_none()
-
-                if final_cutpay and sync_results.get("cutpay", {}).get("success"):
-                    final_cutpay.synced_to_cutpay_sheet = True
-                    if sync_results["cutpay"].get("row_number"):
-                        final_cutpay.cutpay_sheet_row_id = sync_results["cutpay"][
-                            "row_number"
-                        ]
-
-            await final_db_session.refresh(final_cutpay)
-            logger.info(
-                f"Step 3 SUCCESS: Successfully updated sync flags for policy '{policy_number}' (CutPay ID {final_cutpay.id})."
-            )
-            logger.info(
-                f"--- Update for policy '{policy_number}' in '{quarter_sheet_name}' finished successfully. ---"
-            )
-            return database_cutpay_response(final_cutpay)
-
-    except Exception:
-        logger.critical(
-            f"Step 3 FAILED: Updating sync flags failed for policy '{policy_number}' (CutPay ID {cutpay.id}). Traceback:\n{traceback.format_exc()}"
-        )
-        return database_cutpay_response(cutpay)
-
 
 # New delete route - delete by policy number and quarter (same concept as get/update routes)
 @router.delete("/policy-delete")
@@ -1655,7 +1465,9 @@ async def delete_cutpay_transaction_by_policy(
         from utils.quarterly_sheets_manager import quarterly_manager
 
         # Get the specific quarter sheet
-        target_sheet = quarterly_manager.get_quarterly_sheet(quarter, year)
+        target_sheet = await run_in_threadpool(
+            quarterly_manager.get_quarterly_sheet, quarter, year
+        )
 
         if not target_sheet:
             logger.warning(
@@ -1667,56 +1479,24 @@ async def delete_cutpay_transaction_by_policy(
                 f"Found quarter sheet '{quarter_sheet_name}', searching for policy to delete..."
             )
 
-            # Get all data from the sheet to find the policy row
-            all_values = target_sheet.get_all_values()
-            if not all_values:
-                sheets_deletion_message = (
-                    f"No data found in quarter sheet '{quarter_sheet_name}'"
+            # Find the policy row through the policy number index and delete it
+            found_row_index = await run_in_threadpool(
+                quarterly_manager.delete_row_by_policy_number,
+                target_sheet,
+                policy_number,
+            )
+
+            if found_row_index is None:
+                sheets_deletion_message = f"Policy '{policy_number}' not found in quarter sheet '{quarter_sheet_name}'"
+                logger.info(
+                    f"Policy '{policy_number}' not found in quarter sheet '{quarter_sheet_name}'"
                 )
             else:
-                headers = all_values[0] if all_values else []
-
-                # Find policy number column
-                policy_col_index = -1
-                for i, header in enumerate(headers):
-                    if header.lower().strip() in ["policy number", "policy_number"]:
-                        policy_col_index = i
-                        logger.info(
-                            f"Found policy number column at index {i}: '{header}'"
-                        )
-                        break
-
-                if policy_col_index == -1:
-                    sheets_deletion_message = f"Policy number column not found in quarter sheet '{quarter_sheet_name}'"
-                    logger.warning("Policy number column not found in sheet headers")
-                else:
-                    # Find the row with matching policy number
-                    found_row_index = -1
-
-                    # Skip header (row 1) and dummy/formula row (row 2)
-                    for row_index, row_data in enumerate(all_values[2:], start=3):
-                        if policy_col_index < len(row_data):
-                            cell_value = row_data[policy_col_index].strip()
-                            if cell_value == policy_number.strip():
-                                found_row_index = row_index
-                                logger.info(
-                                    f"Found policy '{policy_number}' in quarter sheet at row {row_index}"
-                                )
-                                break
-
-                    if found_row_index == -1:
-                        sheets_deletion_message = f"Policy '{policy_number}' not found in quarter sheet '{quarter_sheet_name}'"
-                        logger.info(
-                            f"Policy '{policy_number}' not found in {len(all_values)-1} data rows"
-                        )
-                    else:
-                        # Delete the row from Google Sheets
-                        target_sheet.delete_rows(found_row_index)
-                        sheets_deletion_success = True
-                        sheets_deletion_message = f"Successfully deleted policy '{policy_number}' from quarter sheet '{quarter_sheet_name}' at row {found_row_index}"
-                        logger.info(
-                            f"Step 2 SUCCESS: Deleted policy '{policy_number}' from quarter sheet row {found_row_index}"
-                        )
+                sheets_deletion_success = True
+                sheets_deletion_message = f"Successfully deleted policy '{policy_number}' from quarter sheet '{quarter_sheet_name}' at row {found_row_index}"
+                logger.info(
+                    f"Step 2 SUCCESS: Deleted policy '{policy_number}' from quarter sheet row {found_row_index}"
+                )
 
     except Exception as sheets_error:
         logger.error(
@@ -2049,7 +1829,7 @@ async def get_agent_financial_summary_endpoint(
         # Get the summary sheet from Google Sheets
         try:
             # Access the summary sheet (assuming it's named "Summary" in the quarterly workbook)
-            summary_sheet = quarterly_manager.get_summary_sheet()
+            summary_sheet = await run_in_threadpool(quarterly_manager.get_summary_sheet)
 
             if not summary_sheet:
                 raise HTTPException(
@@ -2068,7 +1848,7 @@ async def get_agent_financial_summary_endpoint(
 
         # Get all data from the summary sheet
         try:
-            all_values = summary_sheet.get_all_values()
+            all_values = await quarterly_manager.aget_sheet_values(summary_sheet.title)
 
             if not all_values or len(all_values) < 2:
                 raise HTTPException(
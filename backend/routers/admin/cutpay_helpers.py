@@ -264,6 +264,42 @@ async def validate_and_resolve_codes(
     return broker_id, insurer_id
 
 
+async def resolve_sheet_names(
+    db: AsyncSession,
+    cutpay: CutPay,
+    broker_name: Optional[str],
+    insurer_name: Optional[str],
+) -> tuple[str, str]:
+    """Fill in broker/insurer names for Google Sheets from the stored IDs when codes gave none"""
+    if not broker_name and cutpay.broker_id:
+        try:
+            result = await db.execute(select(Broker).where(Broker.id == cutpay.broker_id))
+            broker = result.scalar_one_or_none()
+            if broker:
+                broker_name = broker.name
+                logger.info(
+                    f"Retrieved broker name from database: {broker_name} (ID: {cutpay.broker_id})"
+                )
+        except Exception as e:
+            logger.warning(f"Could not fetch broker name from database: {e}")
+
+    if not insurer_name and cutpay.insurer_id:
+        try:
+            result = await db.execute(
+                select(Insurer).where(Insurer.id == cutpay.insurer_id)
+            )
+            insurer = result.scalar_one_or_none()
+            if insurer:
+                insurer_name = insurer.name
+                logger.info(
+                    f"Retrieved insurer name from database: {insurer_name} (ID: {cutpay.insurer_id})"
+                )
+        except Exception as e:
+            logger.warning(f"Could not fetch insurer name from database: {e}")
+
+    return broker_name or "", insurer_name or ""
+
+
 # =============================================================================
 # EXISTING CUTPAY HELPERS CLASS
 # =============================================================================
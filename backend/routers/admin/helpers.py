@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import and_, desc, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -1175,7 +1176,9 @@ class AdminHelpers:
                     "created_at": existing_policy.created_at,
                     "updated_at": existing_policy.updated_at,
                 }
-                google_sheets_sync.sync_policy(policy_dict_for_sheets, "UPDATE")
+                await run_in_threadpool(
+                    google_sheets_sync.sync_policy, policy_dict_for_sheets, "UPDATE"
+                )
                 logger.info(
                     f"Universal record updated policy {existing_policy.id} synced to Google Sheets"
                 )
@@ -1256,7 +1259,9 @@ class AdminHelpers:
                 "created_at": new_policy.created_at,
                 "updated_at": new_policy.updated_at,
             }
-            google_sheets_sync.sync_policy(policy_dict_for_sheets, "CREATE")
+            await run_in_threadpool(
+                google_sheets_sync.sync_policy, policy_dict_for_sheets, "CREATE"
+            )
             logger.info(
                 f"Universal record policy {new_policy.id} synced to Google Sheets"
             )
@@ -1330,8 +1335,10 @@ class AdminHelpers:
                     "created_at": existing_cutpay.created_at,
                     "updated_at": existing_cutpay.updated_at,
                 }
-                google_sheets_sync.sync_cutpay_transaction(
-                    cutpay_dict_for_sheets, "UPDATE"
+                await run_in_threadpool(
+                    google_sheets_sync.sync_cutpay_transaction,
+                    cutpay_dict_for_sheets,
+                    "UPDATE",
                 )
                 logger.info(
                     f"Universal record updated cut pay {existing_cutpay.id} synced to Google Sheets"
@@ -1408,7 +1415,11 @@ class AdminHelpers:
                 "created_at": new_cutpay.created_at,
                 "updated_at": new_cutpay.updated_at,
             }
-            google_sheets_sync.sync_cutpay_transaction(cutpay_dict_for_sheets, "CREATE")
+            await run_in_threadpool(
+                google_sheets_sync.sync_cutpay_transaction,
+                cutpay_dict_for_sheets,
+                "CREATE",
+            )
             logger.info(
                 f"Universal record cut pay {new_cutpay.id} synced to Google Sheets"
             )
@@ -45,6 +45,7 @@ import uuid
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -249,7 +250,9 @@ async def create_child_id_request(
             "updated_at": child_request.updated_at,
         }
         try:
-            google_sheets_sync.sync_child_id_request(google_sheets_dict, "CREATE")
+            await run_in_threadpool(
+                google_sheets_sync.sync_child_id_request, google_sheets_dict, "CREATE"
+            )
             logger.info(f"Child ID request {child_request.id} synced to Google Sheets")
         except Exception as sync_error:
             logger.error(
@@ -1,9 +1,26 @@
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from utils.google_sheets import google_sheets_sync
+from fastapi.concurrency import run_in_threadpool
+from gspread.utils import numericise, numericise_all
 
+from utils.google_sheets import google_sheets_sync
+from utils.sheets_scheduler import off_event_loop
+
+from .sheet_export import (
+    EXPORT_HEADERS,
+    SUMMARY_HEADERS,
+    ExportSheet,
+    QuarterSummary,
+    export_rows,
+)
+from .sheet_query import (
+    InvalidCursorError,
+    PageCursor,
+    SheetTable,
+    sheet_table_cache,
+)
 from .schemas import (
     BulkUpdateField,
     BulkUpdateResult,
@@ -13,6 +30,70 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Fields matched by the free-text search on each data source
+MASTER_SEARCH_FIELDS = (
+    "policy_number",
+    "child_id",
+    "customer_name",
+    "insurer_name",
+    "broker_name",
+    "registration_number",
+)
+QUARTER_SEARCH_FIELDS = (
+    "policy_number",
+    "agent_code",
+    "customer_name",
+    "insurer_name",
+    "broker_name",
+    "registration_number",
+)
+
+
+def paginate(
+    positions: List[int], page: int, page_size: int, start: Optional[int] = None
+) -> Tuple[List[int], int, int]:
+    """
+    Slice one page of row positions; returns (page, total_count, total_pages)
+
+    ``start`` (a resumed cursor) overrides the offset derived from ``page``.
+    """
+    total_count = len(positions)
+    total_pages = (total_count + page_size - 1) // page_size
+    start_idx = (page - 1) * page_size if start is None else start
+    return positions[start_idx : start_idx + page_size], total_count, total_pages
+
+
+def quarter_sheet_table(
+    sheet_name: str,
+    all_values: List[List[str]],
+    previous: Optional[SheetTable] = None,
+) -> SheetTable:
+    """
+    Table of a quarter sheet's data rows (row 3+, blank rows skipped)
+
+    Args:
+        sheet_name: Name of the quarter sheet
+        all_values: Snapshot values of the quarter sheet
+        previous: Table of the sheet's previous snapshot, whose search
+            indexes are carried over for the rows that did not change
+    """
+    headers = all_values[0] if all_values else []
+    data_rows = [row for row in all_values[2:] if any(cell.strip() for cell in row)]
+    table = SheetTable(headers, data_rows, index_search=True, name=sheet_name)
+    if previous is not None:
+        table.inherit_search_indexes(previous)
+    return table
+
+
+def quarter_row_to_record(headers: List[str], row: Sequence[str]) -> MasterSheetRecord:
+    """Build the MasterSheetRecord of one quarter sheet data row"""
+    return MasterSheetRecord(
+        **{
+            header: row[i] if i < len(row) else ""
+            for i, header in enumerate(headers)
+        }
+    )
+
 
 class MISHelpers:
     """
@@ -154,8 +235,10 @@ class MISHelpers:
                 }
 
             # Get Master sheet
-            master_sheet = self.sheets_client._get_or_create_worksheet(
-                "Master", self.sheets_client._get_master_sheet_headers()
+            master_sheet = await run_in_threadpool(
+                self.sheets_client._get_or_create_worksheet,
+                "Master",
+                self.sheets_client._get_master_sheet_headers(),
             )
 
             if not master_sheet:
@@ -170,90 +253,35 @@ class MISHelpers:
                 }
 
             # Get all data from the sheet
-            all_data = master_sheet.get_all_records()
-            headers = self.sheets_client._get_master_sheet_headers()
-
-            logger.info(f"Retrieved {len(all_data)} records from Master sheet")
+            all_values = await self.sheets_client.aget_all_values(master_sheet.title)
+            headers = all_values[0] if all_values else []
+            data_rows = all_values[1:]
 
-            # Convert to our record format
-            all_records = []
-            for idx, row_data in enumerate(all_data):
-                record = self._convert_row_to_record(
-                    row_data, idx + 2
-                )  # +2 because row 1 is headers, and we're 0-indexed
-                all_records.append(record)
+            logger.info(f"Retrieved {len(data_rows)} records from Master sheet")
 
-            # Apply search filter if provided
+            # Cells are compared as gspread's get_all_records() would return them
+            table = SheetTable(headers, data_rows, convert=numericise)
+            positions = table.select(
+                search, MASTER_SEARCH_FIELDS, filter_by, sort_by, sort_order
+            )
             if search and search.strip():
-                search_term = search.strip().lower()
-                filtered_records = []
-                for record in all_records:
-                    # Search across key fields using new field names
-                    searchable_fields = [
-                        record.policy_number,
-                        record.child_id,
-                        record.customer_name,
-                        record.insurer_name,
-                        record.broker_name,
-                        record.registration_number,
-                    ]
-
-                    if any(
-                        field and search_term in str(field).lower()
-                        for field in searchable_fields
-                    ):
-                        filtered_records.append(record)
-
-                all_records = filtered_records
-                logger.info(f"Search '{search}' filtered to {len(all_records)} records")
-
-            # Apply field filters if provided (supports multiple values per field)
+                logger.info(f"Search '{search}' filtered to {len(positions)} records")
             if filter_by:
-                for field_name, filter_values in filter_by.items():
-                    if filter_values:  # filter_values is now a list
-                        # Clean the filter values (remove empty/None values)
-                        clean_values = [
-                            v.strip().lower() for v in filter_values if v and v.strip()
-                        ]
-                        if clean_values:
-                            all_records = [
-                                record
-                                for record in all_records
-                                if hasattr(record, field_name)
-                                and getattr(record, field_name)
-                                and any(
-                                    filter_val
-                                    in str(getattr(record, field_name)).lower()
-                                    for filter_val in clean_values
-                                )
-                            ]
                 logger.info(
-                    f"Field filters applied, {len(all_records)} records remaining"
+                    f"Field filters applied, {len(positions)} records remaining"
                 )
 
-            # Apply sorting if specified
-            if sort_by and hasattr(MasterSheetRecord, sort_by):
-                reverse_order = sort_order.lower() == "desc"
-                try:
-                    all_records.sort(
-                        key=lambda x: (
-                            str(getattr(x, sort_by) or "").lower()
-                            if getattr(x, sort_by)
-                            else ""
-                        ),
-                        reverse=reverse_order,
-                    )
-                    logger.info(f"Records sorted by {sort_by} ({sort_order})")
-                except Exception as e:
-                    logger.warning(f"Failed to sort by {sort_by}: {str(e)}")
-
-            total_count = len(all_records)
-            total_pages = (total_count + page_size - 1) // page_size
+            page_positions, total_count, total_pages = paginate(
+                positions, page, page_size
+            )
 
-            # Apply pagination
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            paginated_records = all_records[start_idx:end_idx]
+            # Only the returned rows become records
+            paginated_records = [
+                self._convert_row_to_record(
+                    dict(zip(headers, numericise_all(data_rows[i]))), i + 2
+                )  # +2 because row 1 is headers, and we're 0-indexed
+                for i in page_positions
+            ]
 
             logger.info(f"Returning page {page} with {len(paginated_records)} records")
 
@@ -286,6 +314,7 @@ class MISHelpers:
         filter_by: Optional[Dict[str, List[str]]] = None,
         sort_by: Optional[str] = None,
         sort_order: str = "asc",
+        cursor: Optional[PageCursor] = None,
     ) -> MasterSheetResponse:
         """
         Get paginated data from specific quarterly Google sheet
@@ -297,9 +326,13 @@ class MISHelpers:
             page_size: Number of records per page
             search: Search term to filter records
             filter_by: Dictionary of field:value filters
+            cursor: Next-page cursor of a previous response; replaces ``page``
 
         Returns:
             MasterSheetResponse with records, pagination info, and metadata
+
+        Raises:
+            InvalidCursorError: If the cursor was issued for a different query
         """
         try:
             if not self.sheets_client.client:
@@ -319,12 +352,33 @@ class MISHelpers:
             # Use quarterly_sheets_manager to get data from specific quarterly sheet
             from utils.quarterly_sheets_manager import quarterly_manager
 
-            # Get all records from the quarterly sheet
-            quarterly_records = quarterly_manager.get_all_records_from_quarter_sheet(
+            # Served from the shared snapshot; row 1 = headers, row 2 = template
+            snapshot = await quarterly_manager.aget_quarter_sheet_snapshot(
                 quarter, year
             )
+            if snapshot is None:
+                logger.warning(f"Quarterly sheet {sheet_name} does not exist")
+                return MasterSheetResponse(
+                    records=[],
+                    total_count=0,
+                    page=page,
+                    page_size=page_size,
+                    total_pages=0,
+                )
+
+            # Columns, search text and sort orders are reused until the
+            # snapshot changes
+            table = sheet_table_cache.get(
+                sheet_name,
+                snapshot.token,
+                lambda previous: quarter_sheet_table(
+                    sheet_name, snapshot.values, previous
+                ),
+            )
+            headers = table.headers
+            data_rows = table.rows
 
-            if not quarterly_records:
+            if not data_rows:
                 logger.warning(f"No data found in quarterly sheet: {sheet_name}")
                 return MasterSheetResponse(
                     records=[],
@@ -334,118 +388,45 @@ class MISHelpers:
                     total_pages=0,
                 )
 
-            # Convert to record objects (similar to master sheet processing)
-            all_records = []
-            for record_dict in quarterly_records:
-                try:
-                    # Convert all values to strings to match MasterSheetRecord schema expectations
-                    converted_record = {}
-                    for key, value in record_dict.items():
-                        # Convert all values to strings, handling None values
-                        if value is None:
-                            converted_record[key] = ""
-                        elif isinstance(value, (int, float)):
-                            converted_record[key] = str(value)
-                        else:
-                            converted_record[key] = str(value) if value else ""
-
-                    # Log field names for debugging
-                    if len(all_records) == 0:  # Log only for first record to avoid spam
-                        logger.info(
-                            f"Debug: Available fields in {sheet_name}: {list(converted_record.keys())}"
-                        )
-
-                    # Convert to MasterSheetRecord with string values
-                    record_obj = MasterSheetRecord(**converted_record)
-                    all_records.append(record_obj)
-                except Exception as e:
-                    logger.warning(f"Skipping invalid record in {sheet_name}: {e}")
-                    # Log the first few characters of problematic record for debugging
-                    if len(all_records) < 3:  # Only log first few failed records
-                        sample_fields = {
-                            k: v
-                            for i, (k, v) in enumerate(record_dict.items())
-                            if i < 5
-                        }
-                        logger.debug(f"Failed record sample: {sample_fields}")
-                    continue
-
-            # Apply search filter if provided
+            # Sorted once per query and snapshot, then sliced page by page
+            signature, positions = table.cached_select(
+                search,
+                QUARTER_SEARCH_FIELDS,
+                filter_by,
+                sort_by,
+                sort_order,
+                joined_search=True,
+            )
             if search and search.strip():
-                search_term = search.strip().lower()
-                filtered_records = []
-                for record in all_records:
-                    # Search across key fields
-                    searchable_text = " ".join(
-                        [
-                            str(getattr(record, "policy_number", "") or ""),
-                            str(getattr(record, "agent_code", "") or ""),
-                            str(getattr(record, "customer_name", "") or ""),
-                            str(getattr(record, "insurer_name", "") or ""),
-                            str(getattr(record, "broker_name", "") or ""),
-                            str(getattr(record, "registration_number", "") or ""),
-                        ]
-                    ).lower()
-
-                    if search_term in searchable_text:
-                        filtered_records.append(record)
-
-                all_records = filtered_records
                 logger.info(
-                    f"Search '{search}' filtered to {len(all_records)} records in {sheet_name}"
+                    f"Search '{search}' filtered to {len(positions)} records in {sheet_name}"
                 )
-
-            # Apply field filters if provided (supports multiple values per field)
             if filter_by:
-                for field_name, filter_values in filter_by.items():
-                    if filter_values:  # filter_values is now a list
-                        # Clean the filter values (remove empty/None values)
-                        clean_values = [
-                            v.strip().lower() for v in filter_values if v and v.strip()
-                        ]
-                        if clean_values:
-                            all_records = [
-                                record
-                                for record in all_records
-                                if hasattr(record, field_name)
-                                and getattr(record, field_name)
-                                and any(
-                                    filter_val
-                                    in str(getattr(record, field_name)).lower()
-                                    for filter_val in clean_values
-                                )
-                            ]
                 logger.info(
-                    f"Field filters applied to {sheet_name}, {len(all_records)} records remaining"
+                    f"Field filters applied to {sheet_name}, {len(positions)} records remaining"
                 )
 
-            # Apply sorting if specified
-            if sort_by and hasattr(MasterSheetRecord, sort_by):
-                reverse_order = sort_order.lower() == "desc"
-                try:
-                    all_records.sort(
-                        key=lambda x: (
-                            str(getattr(x, sort_by) or "").lower()
-                            if getattr(x, sort_by)
-                            else ""
-                        ),
-                        reverse=reverse_order,
-                    )
-                    logger.info(
-                        f"Records in {sheet_name} sorted by {sort_by} ({sort_order})"
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to sort {sheet_name} by {sort_by}: {str(e)}"
-                    )
+            start = (page - 1) * page_size
+            if cursor is not None:
+                start = table.resume_offset(
+                    cursor, snapshot.token, signature, positions, sort_by, sort_order
+                )
+                page = start // page_size + 1
+            page_positions, total_count, total_pages = paginate(
+                positions, page, page_size, start
+            )
+            next_cursor = table.cursor_after(
+                snapshot.token,
+                signature,
+                positions,
+                start + len(page_positions),
+                sort_by,
+            )
 
-            total_count = len(all_records)
-            total_pages = (total_count + page_size - 1) // page_size
-
-            # Apply pagination
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            paginated_records = all_records[start_idx:end_idx]
+            # Only the returned rows become records
+            paginated_records = [
+                quarter_row_to_record(headers, data_rows[i]) for i in page_positions
+            ]
 
             logger.info(
                 f"Returning page {page} with {len(paginated_records)} records from {sheet_name}"
@@ -457,8 +438,11 @@ class MISHelpers:
                 page=page,
                 page_size=page_size,
                 total_pages=total_pages,
+                next_cursor=next_cursor.encode() if next_cursor else None,
             )
 
+        except InvalidCursorError:
+            raise
         except Exception as e:
             logger.error(
                 f"Error getting quarterly sheet data for Q{quarter}-{year}: {str(e)}"
@@ -467,7 +451,87 @@ class MISHelpers:
                 records=[], total_count=0, page=page, page_size=page_size, total_pages=0
             )
 
-    async def bulk_update_master_sheet(
+    async def iter_quarterly_export_sheets(
+        self,
+        periods: List[Tuple[int, int]],
+        search: Optional[str] = None,
+        agent_code: Optional[str] = None,
+    ) -> AsyncIterator[ExportSheet]:
+        """
+        Sheets of a quarterly export, read one quarter at a time
+
+        Yields the data sheet of every (quarter, year) in order, then their
+        summary sheets. Data rows are produced lazily from the cached quarter
+        table, and each summary is filled in while its data sheet is written,
+        so the sheets must be consumed in order.
+
+        Args:
+            periods: (quarter, year) pairs to export
+            search: Search term to filter records
+            agent_code: Only export records whose agent code contains this
+
+        Yields:
+            ExportSheet per quarter (empty when the sheet is missing), then
+            one summary ExportSheet per quarter
+        """
+        from utils.quarterly_sheets_manager import quarterly_manager
+
+        filter_by = {"agent_code": [agent_code]} if agent_code else None
+        summaries = []
+
+        for quarter, year in periods:
+            sheet_name = f"Q{quarter}-{year}"
+            summary = QuarterSummary(sheet_name, agent_code)
+            summaries.append(summary)
+
+            snapshot = None
+            if not self.sheets_client.client:
+                logger.error("Google Sheets client not initialized")
+            else:
+                try:
+                    snapshot = await quarterly_manager.aget_quarter_sheet_snapshot(
+                        quarter, year
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Could not retrieve data for {sheet_name}: {str(e)}"
+                    )
+            if snapshot is None:
+                yield ExportSheet(sheet_name, EXPORT_HEADERS, [])
+                continue
+
+            table = sheet_table_cache.get(
+                sheet_name,
+                snapshot.token,
+                lambda previous: quarter_sheet_table(
+                    sheet_name, snapshot.values, previous
+                ),
+            )
+            _, positions = table.cached_select(
+                search,
+                QUARTER_SEARCH_FIELDS,
+                filter_by,
+                None,
+                "asc",
+                joined_search=True,
+            )
+            logger.info(f"Exporting {len(positions)} records from {sheet_name}")
+            yield ExportSheet(
+                sheet_name,
+                EXPORT_HEADERS,
+                summary.track(export_rows(table, positions)),
+            )
+
+        for summary in summaries:
+            yield ExportSheet(
+                f"{summary.sheet_name}_Summary",
+                SUMMARY_HEADERS,
+                summary.rows(),
+                summary=True,
+            )
+
+    @off_event_loop
+    def bulk_update_master_sheet(
         self, updates: List[BulkUpdateField], admin_user_id: str
     ) -> Dict[str, Any]:
         """
@@ -530,7 +594,7 @@ class MISHelpers:
             for record_id, record_updates in updates_by_record.items():
                 try:
                     # Find the row for this record
-                    row_number = await self._find_record_row(master_sheet, record_id)
+                    row_number = self._find_record_row(master_sheet, record_id)
 
                     if not row_number:
                         # Record not found
@@ -663,7 +727,8 @@ class MISHelpers:
                 "processing_time_seconds": processing_time,
             }
 
-    async def bulk_update_quarterly_sheet(
+    @off_event_loop
+    def bulk_update_quarterly_sheet(
         self,
         updates: List[BulkUpdateField],
         quarter: int,
@@ -725,23 +790,6 @@ class MISHelpers:
             headers = quarterly_sheet.row_values(1)
             logger.info(f"Quarterly sheet {sheet_name} headers: {headers}")
 
-            # Get all data (skipping header row and dummy row)
-            all_data = quarterly_sheet.get_all_values()
-
-            if len(all_data) <= 2:  # Only header and dummy row, no actual data
-                logger.warning(f"No data rows found in quarterly sheet {sheet_name}")
-                return {
-                    "message": f"No data rows found in quarterly sheet {sheet_name}",
-                    "total_updates": len(updates),
-                    "successful_updates": 0,
-                    "failed_updates": len(updates),
-                    "results": [],
-                    "processing_time_seconds": time.time() - start_time,
-                }
-
-            # Skip header row (index 0) and dummy row (index 1), start from actual data (index 2)
-            data_rows = all_data[2:]  # Start from row 3 (index 2)
-
             # Find the Policy Number column index
             policy_number_col_index = None
             for idx, header in enumerate(headers):
@@ -773,25 +821,12 @@ class MISHelpers:
             # Process each record (using policy number as record_id)
             for policy_number, record_updates in updates_by_record.items():
                 try:
-                    # Find the row for this policy number
-                    row_found = False
-                    row_index = -1
-                    row_number = -1
-
-                    for idx, row in enumerate(data_rows):
-                        if idx < len(data_rows) and policy_number_col_index < len(row):
-                            if (
-                                str(row[policy_number_col_index]).strip()
-                                == str(policy_number).strip()
-                            ):
-                                row_index = idx
-                                row_number = (
-                                    idx + 3
-                                )  # Actual row number in sheet (1-based, +3 because we skip header and dummy row)
-                                row_found = True
-                                break
-
-                    if not row_found:
+                    # Find the row for this policy number via the policy row index
+                    found = quarterly_manager.find_row_by_policy_number(
+                        quarterly_sheet, policy_number
+                    )
+
+                    if found is None:
                         logger.error(
                             f"Policy number {policy_number} not found in quarterly sheet {sheet_name}"
                         )
@@ -809,7 +844,8 @@ class MISHelpers:
                             failed_updates += 1
                         continue
 
-                    current_row = data_rows[row_index][:]  # Copy the row
+                    row_number = found["row_number"]
+                    current_row = found["values"][:]  # Copy the row
 
                     # Ensure the row has enough columns
                     while len(current_row) < len(headers):
@@ -878,6 +914,12 @@ class MISHelpers:
                             [updated_row],
                             value_input_option="USER_ENTERED",
                         )
+                        quarterly_manager._record_row_write(
+                            quarterly_sheet,
+                            row_number,
+                            updated_row,
+                            policy_number=policy_number,
+                        )
                         logger.info(
                             f"Updated row {row_number} for policy {policy_number} in quarterly sheet {sheet_name}"
                         )
@@ -939,7 +981,7 @@ class MISHelpers:
             from utils.quarterly_sheets_manager import quarterly_manager
 
             # Get the Summary sheet
-            summary_sheet = quarterly_manager.get_summary_sheet()
+            summary_sheet = await run_in_threadpool(quarterly_manager.get_summary_sheet)
 
             if not summary_sheet:
                 logger.error("Summary sheet not found")
@@ -948,7 +990,7 @@ class MISHelpers:
             logger.info("Successfully accessed Summary sheet")
 
             # Get all data from the Summary sheet
-            all_values = summary_sheet.get_all_values()
+            all_values = await quarterly_manager.aget_sheet_values(summary_sheet.title)
 
             if not all_values or len(all_values) < 2:
                 logger.warning("No data found in Summary sheet")
@@ -994,7 +1036,8 @@ class MISHelpers:
             logger.error(f"Error accessing Summary sheet: {str(e)}")
             return {"error": f"Failed to access Summary sheet: {str(e)}"}
 
-    async def get_broker_sheet_data(self) -> Dict[str, Any]:
+    @off_event_loop
+    def get_broker_sheet_data(self) -> Dict[str, Any]:
         """Get complete data from Broker sheet"""
         try:
             if not self.sheets_client.client:
@@ -1078,7 +1121,7 @@ class MISHelpers:
         # Create the record using field aliases
         return MasterSheetRecord(**record_data)
 
-    async def _find_record_row(self, worksheet, record_id: str) -> Optional[int]:
+    def _find_record_row(self, worksheet, record_id: str) -> Optional[int]:
         """Find the row number for a record with given ID"""
         try:
             # Get the ID column (first column)
@@ -1097,7 +1140,8 @@ class MISHelpers:
             logger.error(f"Error finding record row for ID {record_id}: {str(e)}")
             return None
 
-    async def get_agent_mis_data(
+    @off_event_loop
+    def get_agent_mis_data(
         self, agent_code: str, page: int = 1, page_size: int = 50
     ) -> Dict[str, Any]:
         """
@@ -1351,7 +1395,8 @@ class MISHelpers:
             logger.error(f"Error converting record to agent MIS record: {str(e)}")
             return None
 
-    async def get_quarterly_sheet_agent_data(
+    @off_event_loop
+    def get_quarterly_sheet_agent_data(
         self,
         agent_code: str,
         quarter: int,
@@ -1437,7 +1482,8 @@ class MISHelpers:
                 "total_pages": 0,
             }
 
-    async def get_agent_summary_data(self, agent_code: str) -> Dict[str, Any]:
+    @off_event_loop
+    def get_agent_summary_data(self, agent_code: str) -> Dict[str, Any]:
         """
         Get agent summary data from Summary sheet
 
@@ -1490,7 +1536,8 @@ class MISHelpers:
             logger.error(f"Error fetching agent summary data: {str(e)}")
             return {}
 
-    async def get_quarterly_sheet_agent_filtered_data(
+    @off_event_loop
+    def get_quarterly_sheet_agent_filtered_data(
         self,
         agent_code: str,
         quarter: int,
@@ -1536,7 +1583,9 @@ class MISHelpers:
             # Get all data from the quarterly sheet as dictionaries
             try:
                 # Use manual approach to handle duplicate/problematic headers
-                all_values = quarterly_sheet.get_all_values()
+                all_values = quarterly_manager.get_worksheet_snapshot(
+                    quarterly_sheet
+                ).values
                 if not all_values or len(all_values) < 2:
                     logger.warning(
                         f"No data found in quarterly sheet Q{quarter}-{year}"
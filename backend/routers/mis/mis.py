@@ -50,12 +50,11 @@ Integration Points:
 - Analytics Platform: Advanced data analysis
 """
 
-import csv
-import io
 import logging
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer
 from sqlalchemy import select
@@ -68,8 +67,11 @@ from dependencies.rbac import (
     require_permission,
 )
 from routers.auth.auth import get_current_user
+from utils.sheets_scheduler import Priority, use_sheets_priority
 
 from .helpers import MISHelpers
+from .sheet_export import stream_csv_zip, stream_xlsx
+from .sheet_query import InvalidCursorError, PageCursor
 from .schemas import (
     AgentMISRecord,
     AgentMISResponse,
@@ -101,6 +103,10 @@ mis_helpers = MISHelpers()
 async def get_quarter_sheet_data(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor of the previous page (quarterly sheets only); replaces page",
+    ),
     quarter: Optional[int] = Query(
         None,
         ge=1,
@@ -224,6 +230,13 @@ async def get_quarter_sheet_data(
     - **sort_by**: Field to sort by (any field from the data)
     - **sort_order**: Sort order - 'asc' for ascending (default), 'desc' for descending
 
+    **Cursor Pagination (quarterly sheets):**
+    - Each response carries **next_cursor**; pass it back as **cursor** with the
+      same search, filters and sorting to get the following page
+    - Pages continue after the last returned row (found again by its policy
+      number) even if the sheet changed in between, so rows are neither
+      repeated nor skipped by shifting
+
     **Returns:**
     - Complete record data with all sheet fields
     - Pagination metadata
@@ -241,6 +254,20 @@ async def get_quarter_sheet_data(
                 detail="Both quarter and year must be provided together, or neither should be provided",
             )
 
+        page_cursor = None
+        if cursor:
+            if quarter is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor pagination is only available for quarterly sheets",
+                )
+            try:
+                page_cursor = PageCursor.decode(cursor)
+            except InvalidCursorError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+                )
+
         # Determine sheet name and data source
         if quarter is not None and year is not None:
             sheet_name = f"Q{quarter}-{year}"
@@ -300,6 +327,7 @@ async def get_quarter_sheet_data(
                 filter_by=filters if filters else None,
                 sort_by=sort_params.get("sort_by"),
                 sort_order=sort_params.get("sort_order", "asc"),
+                cursor=page_cursor,
             )
 
             logger.info(
@@ -345,6 +373,8 @@ async def get_quarter_sheet_data(
 
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         data_source_text = (
             f"quarterly sheet Q{quarter}-{year}" if quarter and year else "master sheet"
@@ -695,7 +725,9 @@ async def get_master_sheet_fields(
             sheet_name = f"Q{quarter}-{year}"
             from utils.quarterly_sheets_manager import quarterly_manager
 
-            quarterly_sheet = quarterly_manager.get_quarterly_sheet(quarter, year)
+            quarterly_sheet = await run_in_threadpool(
+                quarterly_manager.get_quarterly_sheet, quarter, year
+            )
             if not quarterly_sheet:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -703,7 +735,7 @@ async def get_master_sheet_fields(
                 )
 
             # Get headers from the actual quarterly sheet
-            headers = quarterly_sheet.row_values(1)
+            headers = await run_in_threadpool(quarterly_sheet.row_values, 1)
             sheet_type = "Quarterly Sheet"
 
             logger.info(
@@ -714,7 +746,9 @@ async def get_master_sheet_fields(
             # Get quarterly sheet headers from quarterly manager (current standard headers)
             from utils.quarterly_sheets_manager import quarterly_manager
 
-            headers = quarterly_manager.create_quarterly_sheet_headers()
+            headers = await run_in_threadpool(
+                quarterly_manager.create_quarterly_sheet_headers
+            )
             sheet_name = "Current Quarterly Sheet Standard"
             sheet_type = "Quarterly Sheet Standard Headers"
 
@@ -800,7 +834,9 @@ async def export_quarterly_sheet_data(
     - Multiple quarters: quarters=1,2&years=2025,2025 (Q1-2025 and Q2-2025 data + summaries)
     - Cross-year: quarters=4,1&years=2024,2025 (Q4-2024 and Q1-2025 data + summaries)
 
-    **Note:** Large datasets are automatically handled. XLSX format recommended for multiple quarters.
+    **Note:** CSV and XLSX exports are streamed while they are written, so downloads start
+    immediately and large datasets do not need to fit in memory. XLSX format recommended
+    for multiple quarters.
     All exports include the complete 70+ field quarterly sheet structure with newly added fields.
     """
 
@@ -840,196 +876,25 @@ async def export_quarterly_sheet_data(
             f"Exporting quarterly data for quarters: {quarter_list}, years: {year_list}, format: {format}"
         )
 
-        # Collect data for all requested quarters
-        all_quarterly_data = {}
-        all_summary_data = {}
-
-        filters = {}
-        if agent_code:
-            filters["agent_code"] = agent_code
-
-        for quarter, year in zip(quarter_list, year_list):
-            sheet_name = f"Q{quarter}-{year}"
-
-            try:
-                # Get quarterly sheet data
-                quarterly_result = await mis_helpers.get_quarterly_sheet_data(
-                    quarter=quarter,
-                    year=year,
-                    page=1,
-                    page_size=1000000,  # Large number to get all records
-                    search=search,
-                    filter_by=filters if filters else None,
-                )
-
-                # Convert records to dict format for export
-                quarterly_records = []
-                if hasattr(quarterly_result, "records") and quarterly_result.records:
-                    for record in quarterly_result.records:
-                        if hasattr(record, "dict"):
-                            # Pydantic model - convert to dict
-                            quarterly_records.append(record.dict(by_alias=True))
-                        elif isinstance(record, dict):
-                            # Already a dict
-                            quarterly_records.append(record)
-                        else:
-                            # Try to convert to dict using vars()
-                            quarterly_records.append(
-                                vars(record)
-                                if hasattr(record, "__dict__")
-                                else str(record)
-                            )
-                elif isinstance(quarterly_result, dict) and quarterly_result.get(
-                    "records"
-                ):
-                    quarterly_records = quarterly_result["records"]
-
-                # Get summary data for this quarter
-                try:
-                    summary_result = await mis_helpers.get_quarterly_summary_data(
-                        quarter=quarter, year=year, agent_code=agent_code
-                    )
-                except AttributeError:
-                    # Fallback if method doesn't exist - create basic summary from quarterly data
-                    logger.info(
-                        "get_quarterly_summary_data not available, creating basic summary from quarterly data"
-                    )
-                    summary_result = []
-
-                    # Create basic summary from quarterly records if we have data
-                    if quarterly_records:
-                        # Calculate basic statistics for the quarter
-                        total_policies = len(quarterly_records)
-                        total_gross_premium = 0.0
-                        total_net_premium = 0.0
-                        total_running_balance = 0.0
-                        total_commissionable_premium = 0.0
-
-                        agents_summary = {}
-
-                        for record in quarterly_records:
-                            # Skip if agent_code filter is applied and doesn't match
-                            record_agent_code = record.get("Agent Code", "")
-                            if agent_code and record_agent_code != agent_code:
-                                continue
-
-                            # Initialize agent summary if not exists
-                            if record_agent_code not in agents_summary:
-                                agents_summary[record_agent_code] = {
-                                    "Agent Code": record_agent_code,
-                                    "Total Policies": 0,
-                                    "Total Gross Premium": 0.0,
-                                    "Total Net Premium": 0.0,
-                                    "Total Running Balance": 0.0,
-                                    "Total Commissionable Premium": 0.0,
-                                    "Quarter": f"Q{quarter}-{year}",
-                                }
-
-                            # Add to agent summary
-                            agent_summary = agents_summary[record_agent_code]
-                            agent_summary["Total Policies"] += 1
-
-                            # Safely convert and add financial values
-                            try:
-                                gross_premium = (
-                                    float(
-                                        str(record.get("Gross premium", "0"))
-                                        .replace(",", "")
-                                        .replace("₹", "")
-                                    )
-                                    if record.get("Gross premium")
-                                    else 0.0
-                                )
-                                net_premium = (
-                                    float(
-                                        str(record.get("Net premium", "0"))
-                                        .replace(",", "")
-                                        .replace("₹", "")
-                                    )
-                                    if record.get("Net premium")
-                                    else 0.0
-                                )
-                                running_balance = (
-                                    float(
-                                        str(record.get("Running Bal", "0"))
-                                        .replace(",", "")
-                                        .replace("₹", "")
-                                    )
-                                    if record.get("Running Bal")
-                                    else 0.0
-                                )
-                                commissionable_premium = (
-                                    float(
-                                        str(record.get("Commissionable Premium", "0"))
-                                        .replace(",", "")
-                                        .replace("₹", "")
-                                    )
-                                    if record.get("Commissionable Premium")
-                                    else 0.0
-                                )
-
-                                agent_summary["Total Gross Premium"] += gross_premium
-                                agent_summary["Total Net Premium"] += net_premium
-                                agent_summary[
-                                    "Total Running Balance"
-                                ] += running_balance
-                                agent_summary[
-                                    "Total Commissionable Premium"
-                                ] += commissionable_premium
-
-                                total_gross_premium += gross_premium
-                                total_net_premium += net_premium
-                                total_running_balance += running_balance
-                                total_commissionable_premium += commissionable_premium
-
-                            except (ValueError, TypeError) as e:
-                                logger.debug(
-                                    f"Error converting financial values for record: {e}"
-                                )
-                                continue
-
-                        # Convert agents summary to list
-                        summary_result = list(agents_summary.values())
-
-                        # Add overall summary if no agent filter
-                        if not agent_code and summary_result:
-                            summary_result.append(
-                                {
-                                    "Agent Code": "TOTAL",
-                                    "Total Policies": total_policies,
-                                    "Total Gross Premium": total_gross_premium,
-                                    "Total Net Premium": total_net_premium,
-                                    "Total Running Balance": total_running_balance,
-                                    "Total Commissionable Premium": total_commissionable_premium,
-                                    "Quarter": f"Q{quarter}-{year}",
-                                }
-                            )
-
-                        logger.info(
-                            f"Created basic summary for {len(summary_result)} agents in {sheet_name}"
-                        )
-                    else:
-                        logger.info(
-                            f"No quarterly records found to create summary for {sheet_name}"
-                        )
-                        summary_result = []
-
-                all_quarterly_data[sheet_name] = quarterly_records
-                all_summary_data[f"{sheet_name}_Summary"] = (
-                    summary_result if summary_result else []
-                )
-
-                logger.info(
-                    f"Retrieved {len(quarterly_records)} records from {sheet_name}"
-                )
-
-            except Exception as e:
-                logger.warning(f"Could not retrieve data for {sheet_name}: {str(e)}")
-                all_quarterly_data[sheet_name] = []
-                all_summary_data[f"{sheet_name}_Summary"] = []
+        periods = list(zip(quarter_list, year_list))
+        filters = {"agent_code": agent_code} if agent_code else {}
+        filename = f"quarterly_export_Q{'-'.join(map(str, quarter_list))}_{'-'.join(map(str, year_list))}"
+        sheets = mis_helpers.iter_quarterly_export_sheets(
+            periods, search=search, agent_code=agent_code
+        )
 
         # Handle different export formats
         if format == "json":
+            all_quarterly_data = {}
+            all_summary_data = {}
+            async for sheet in sheets:
+                records = [dict(zip(sheet.headers, values)) for values in sheet.rows]
+                if sheet.summary:
+                    all_summary_data[sheet.name] = records
+                else:
+                    all_quarterly_data[sheet.name] = records
+                    logger.info(f"Retrieved {len(records)} records from {sheet.name}")
+
             return JSONResponse(
                 content={
                     "quarterly_data": all_quarterly_data,
@@ -1044,223 +909,38 @@ async def export_quarterly_sheet_data(
                     },
                 },
                 headers={
-                    "Content-Disposition": f"attachment; filename=quarterly_export_Q{'-'.join(map(str, quarter_list))}_{'-'.join(map(str, year_list))}.json"
+                    "Content-Disposition": f"attachment; filename={filename}.json"
                 },
             )
 
-        elif format == "csv":
-            import tempfile
-            import zipfile
-
-            # Create a temporary zip file with CSV files for each sheet
-            temp_dir = tempfile.mkdtemp()
-            zip_path = f"{temp_dir}/quarterly_export.zip"
-
-            with zipfile.ZipFile(zip_path, "w") as zip_file:
-                # Add quarterly data CSV files
-                for sheet_name, records in all_quarterly_data.items():
-                    if records:
-                        csv_content = io.StringIO()
-                        headers = (
-                            list(records[0].keys())
-                            if isinstance(records[0], dict)
-                            else [f"col_{i}" for i in range(len(records[0]))]
-                        )
-                        writer = csv.DictWriter(csv_content, fieldnames=headers)
-                        writer.writeheader()
-                        for record in records:
-                            writer.writerow(
-                                record
-                                if isinstance(record, dict)
-                                else dict(zip(headers, record))
-                            )
-
-                        zip_file.writestr(
-                            f"{sheet_name}_quarterly_data.csv", csv_content.getvalue()
-                        )
-
-                # Add summary data CSV files
-                for summary_name, summary_records in all_summary_data.items():
-                    if summary_records:
-                        csv_content = io.StringIO()
-                        headers = (
-                            list(summary_records[0].keys())
-                            if isinstance(summary_records[0], dict)
-                            else [f"col_{i}" for i in range(len(summary_records[0]))]
-                        )
-                        writer = csv.DictWriter(csv_content, fieldnames=headers)
-                        writer.writeheader()
-                        for record in summary_records:
-                            writer.writerow(
-                                record
-                                if isinstance(record, dict)
-                                else dict(zip(headers, record))
-                            )
-
-                        zip_file.writestr(f"{summary_name}.csv", csv_content.getvalue())
-
-            # Return the zip file
-            def zip_generator():
-                with open(zip_path, "rb") as f:
-                    while True:
-                        chunk = f.read(8192)
-                        if not chunk:
-                            break
-                        yield chunk
-
-            return StreamingResponse(
-                zip_generator(),
-                media_type="application/zip",
-                headers={
-                    "Content-Disposition": f"attachment; filename=quarterly_export_Q{'-'.join(map(str, quarter_list))}_{'-'.join(map(str, year_list))}.zip"
-                },
+        # CSV (zipped) and XLSX are written while they are sent
+        if format == "csv":
+            chunks = stream_csv_zip(sheets)
+            media_type = "application/zip"
+            extension = "zip"
+        else:
+            chunks = stream_xlsx(sheets)
+            media_type = (
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
+            extension = "xlsx"
 
-        elif format == "xlsx":
+        async def logged_chunks():
             try:
-                import tempfile
-                import pandas as pd
-                # Create temporary Excel file
-                temp_dir = tempfile.mkdtemp()
-                excel_path = f"{temp_dir}/quarterly_export.xlsx"
-
-                with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
-                    # Add quarterly data sheets
-                    for sheet_name, records in all_quarterly_data.items():
-                        if records:
-                            df = pd.DataFrame(records)
-                            # Truncate sheet name if too long (Excel limit is 31 characters)
-                            safe_sheet_name = (
-                                sheet_name[:28] + "..."
-                                if len(sheet_name) > 31
-                                else sheet_name
-                            )
-                            df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
-
-                    # Add summary data sheets
-                    for summary_name, summary_records in all_summary_data.items():
-                        if summary_records:
-                            df = pd.DataFrame(summary_records)
-                            # Truncate sheet name if too long
-                            safe_sheet_name = (
-                                summary_name[:28] + "..."
-                                if len(summary_name) > 31
-                                else summary_name
-                            )
-                            df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
-
-                # Return the Excel file
-                def excel_generator():
-                    with open(excel_path, "rb") as f:
-                        while True:
-                            chunk = f.read(8192)
-                            if not chunk:
-                                break
-                            yield chunk
-
-                return StreamingResponse(
-                    excel_generator(),
-                    media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    headers={
-                        "Content-Disposition": f"attachment; filename=quarterly_export_Q{'-'.join(map(str, quarter_list))}_{'-'.join(map(str, year_list))}.xlsx"
-                    },
-                )
-
-            except ImportError as e:
-                logger.warning(
-                    f"Pandas/openpyxl not available for XLSX export: {str(e)}"
-                )
-                # Fallback to simple XLSX using openpyxl directly
-                try:
-                    import tempfile
-
-                    from openpyxl import Workbook
-
-                    # Create temporary Excel file using openpyxl directly
-                    temp_dir = tempfile.mkdtemp()
-                    excel_path = f"{temp_dir}/quarterly_export.xlsx"
-
-                    wb = Workbook()
-                    # Remove default sheet
-                    wb.remove(wb.active)
-
-                    # Add quarterly data sheets
-                    for sheet_name, records in all_quarterly_data.items():
-                        if records:
-                            safe_sheet_name = (
-                                sheet_name[:28] + "..."
-                                if len(sheet_name) > 31
-                                else sheet_name
-                            )
-                            ws = wb.create_sheet(title=safe_sheet_name)
-
-                            # Add headers
-                            headers = list(records[0].keys()) if records else []
-                            for col, header in enumerate(headers, 1):
-                                ws.cell(row=1, column=col, value=header)
-
-                            # Add data
-                            for row_idx, record in enumerate(records, 2):
-                                for col_idx, header in enumerate(headers, 1):
-                                    ws.cell(
-                                        row=row_idx,
-                                        column=col_idx,
-                                        value=str(record.get(header, "")),
-                                    )
-
-                    # Add summary data sheets
-                    for summary_name, summary_records in all_summary_data.items():
-                        if summary_records:
-                            safe_sheet_name = (
-                                summary_name[:28] + "..."
-                                if len(summary_name) > 31
-                                else summary_name
-                            )
-                            ws = wb.create_sheet(title=safe_sheet_name)
-
-                            # Add headers
-                            headers = (
-                                list(summary_records[0].keys())
-                                if summary_records
-                                else []
-                            )
-                            for col, header in enumerate(headers, 1):
-                                ws.cell(row=1, column=col, value=header)
-
-                            # Add data
-                            for row_idx, record in enumerate(summary_records, 2):
-                                for col_idx, header in enumerate(headers, 1):
-                                    ws.cell(
-                                        row=row_idx,
-                                        column=col_idx,
-                                        value=str(record.get(header, "")),
-                                    )
-
-                    # Save workbook
-                    wb.save(excel_path)
-
-                    # Return the Excel file
-                    def excel_generator():
-                        with open(excel_path, "rb") as f:
-                            while True:
-                                chunk = f.read(8192)
-                                if not chunk:
-                                    break
-                                yield chunk
-
-                    return StreamingResponse(
-                        excel_generator(),
-                        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        headers={
-                            "Content-Disposition": f"attachment; filename=quarterly_export_Q{'-'.join(map(str, quarter_list))}_{'-'.join(map(str, year_list))}.xlsx"
-                        },
-                    )
-
-                except ImportError:
-                    raise HTTPException(
-                        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                        detail="XLSX export requires pandas and openpyxl packages. Please use CSV or JSON format instead.",
-                    )
+                async for chunk in chunks:
+                    yield chunk
+            except Exception as e:
+                # Headers are already sent; the client sees a truncated file
+                logger.error(f"Error streaming quarterly export {filename}: {str(e)}")
+                raise
+
+        return StreamingResponse(
+            logged_chunks(),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}.{extension}"
+            },
+        )
 
     except HTTPException:
         raise
@@ -1419,6 +1099,9 @@ async def get_my_mis_data(
     - "Agent Total PO Amount" is now included as agent_total_po_amount field
     - "Actual Agent_PO%" is now included as actual_agent_po_percent field
     """
+    # Agent dashboard reads go ahead of queued bulk Sheets work
+    use_sheets_priority(Priority.INTERACTIVE)
+
     try:
         user_id = current_user["user_id"]
 
@@ -1438,7 +1121,9 @@ async def get_my_mis_data(
             try:
                 from utils.quarterly_sheets_manager import quarterly_manager
 
-                oldest_quarter_sheet = quarterly_manager.get_oldest_quarter_sheet_name()
+                oldest_quarter_sheet = await run_in_threadpool(
+                    quarterly_manager.get_oldest_quarter_sheet_name
+                )
             except Exception as e:
                 logger.warning(
                     f"Could not retrieve oldest quarter sheet name: {str(e)}"
@@ -1476,9 +1161,9 @@ async def get_my_mis_data(
             from utils.quarterly_sheets_manager import quarterly_manager
 
             # Get Summary sheet data for stats
-            summary_sheet = quarterly_manager.get_summary_sheet()
+            summary_sheet = await run_in_threadpool(quarterly_manager.get_summary_sheet)
             if summary_sheet:
-                summary_records = summary_sheet.get_all_records()
+                summary_records = await run_in_threadpool(summary_sheet.get_all_records)
                 logger.info(
                     f"Retrieved {len(summary_records)} records from Summary sheet for stats"
                 )
@@ -1513,7 +1198,9 @@ async def get_my_mis_data(
             try:
                 from utils.quarterly_sheets_manager import quarterly_manager
 
-                oldest_quarter_sheet = quarterly_manager.get_oldest_quarter_sheet_name()
+                oldest_quarter_sheet = await run_in_threadpool(
+                    quarterly_manager.get_oldest_quarter_sheet_name
+                )
             except Exception as e:
                 logger.warning(
                     f"Could not retrieve oldest quarter sheet name: {str(e)}"
@@ -1636,7 +1323,9 @@ async def get_my_mis_data(
         try:
             from utils.quarterly_sheets_manager import quarterly_manager
 
-            oldest_quarter_sheet = quarterly_manager.get_oldest_quarter_sheet_name()
+            oldest_quarter_sheet = await run_in_threadpool(
+                quarterly_manager.get_oldest_quarter_sheet_name
+            )
         except Exception as e:
             logger.warning(f"Could not retrieve oldest quarter sheet name: {str(e)}")
 
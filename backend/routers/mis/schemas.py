@@ -144,6 +144,10 @@ class MasterSheetResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `cursor` to fetch the next page (quarterly sheets only); null on the last page",
+    )
 
 
 class BulkUpdateField(BaseModel):
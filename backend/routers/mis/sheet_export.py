@@ -0,0 +1,359 @@
+"""
+Streaming exports of quarter sheets
+
+``/mis/quarterly-sheet/export`` used to load every quarter as one huge page
+of records, write each CSV into memory, keep the ZIP in a temporary
+directory that was never removed and build XLSX files in memory before the
+first byte went out.
+
+Here rows go from the cached ``SheetTable`` of each quarter straight into the
+writer of the requested format. The writer's output lands in a ``_ChunkSink``
+that the response generator drains every ``STREAM_CHUNK_BYTES``, so memory
+stays flat and the client receives data while later quarters are still
+being read.
+
+An XLSX file is itself a ZIP archive. openpyxl's write-only mode still
+spools each worksheet to a temporary file and emits the archive only on
+``save()``, so the worksheet XML is written directly into the streamed
+archive instead.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+from xml.sax.saxutils import escape, quoteattr
+
+from .sheet_query import RECORD_FIELD_HEADERS, SheetTable
+
+# Columns of an exported quarter, in MasterSheetRecord field order
+EXPORT_HEADERS: List[str] = list(RECORD_FIELD_HEADERS.values())
+
+SUMMARY_HEADERS = [
+    "Agent Code",
+    "Total Policies",
+    "Total Gross Premium",
+    "Total Net Premium",
+    "Total Running Balance",
+    "Total Commissionable Premium",
+    "Quarter",
+]
+
+# Record columns summed per agent, and the summary column each one feeds
+SUMMARY_AMOUNTS = {
+    "Gross premium": "Total Gross Premium",
+    "Net premium": "Total Net Premium",
+    "Running Bal": "Total Running Balance",
+    "Commissionable Premium": "Total Commissionable Premium",
+}
+
+# Output buffered before it is handed to the response
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Excel's limit on worksheet names
+MAX_SHEET_NAME_LENGTH = 31
+
+# Characters XML 1.0 does not allow in cell text
+_ILLEGAL_XML_CHARACTERS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+@dataclass
+class ExportSheet:
+    """One sheet (or CSV file) of an export"""
+
+    name: str
+    headers: List[str]
+    # Consumed once, while the sheet is written
+    rows: Iterable[Sequence[Any]]
+    summary: bool = False
+
+
+def export_rows(table: SheetTable, positions: List[int]) -> Iterator[List[Any]]:
+    """
+    Values of the selected rows in ``EXPORT_HEADERS`` order
+
+    Columns the sheet lacks are None, cells past the end of a row are "".
+    """
+    indexes = [table.columns.get(name) for name in RECORD_FIELD_HEADERS]
+    rows = table.rows
+    for position in positions:
+        row = rows[position]
+        yield [
+            None if index is None else row[index] if index < len(row) else ""
+            for index in indexes
+        ]
+
+
+class QuarterSummary:
+    """Per-agent totals of a quarter, accumulated while its rows stream by"""
+
+    def __init__(self, sheet_name: str, agent_code: Optional[str] = None):
+        self.sheet_name = sheet_name
+        self.agent_code = agent_code
+        self.total_policies = 0
+        self.totals = dict.fromkeys(SUMMARY_AMOUNTS.values(), 0.0)
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self._agent_index = EXPORT_HEADERS.index("Agent Code")
+        self._amount_indexes = {
+            EXPORT_HEADERS.index(header): column
+            for header, column in SUMMARY_AMOUNTS.items()
+        }
+
+    @staticmethod
+    def _amount(value: Any) -> float:
+        if not value:
+            return 0.0
+        return float(str(value).replace(",", "").replace("₹", ""))
+
+    def add(self, values: Sequence[Any]) -> None:
+        self.total_policies += 1
+        record_agent_code = values[self._agent_index] or ""
+        if self.agent_code and record_agent_code != self.agent_code:
+            return
+
+        agent_summary = self.agents.get(record_agent_code)
+        if agent_summary is None:
+            agent_summary = self.agents[record_agent_code] = {
+                "Agent Code": record_agent_code,
+                "Total Policies": 0,
+                **dict.fromkeys(SUMMARY_AMOUNTS.values(), 0.0),
+                "Quarter": self.sheet_name,
+            }
+        agent_summary["Total Policies"] += 1
+
+        try:
+            amounts = {
+                column: self._amount(values[index])
+                for index, column in self._amount_indexes.items()
+            }
+        except (ValueError, TypeError):
+            # The policy still counts, its amounts do not
+            return
+        for column, amount in amounts.items():
+            agent_summary[column] += amount
+            self.totals[column] += amount
+
+    def track(self, rows: Iterable[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+        """Pass rows through, adding each one to the summary"""
+        for values in rows:
+            self.add(values)
+            yield values
+
+    def rows(self) -> List[List[Any]]:
+        """Summary rows: one per agent, then the overall total when unfiltered"""
+        summaries = list(self.agents.values())
+        if not self.agent_code and summaries:
+            summaries.append(
+                {
+                    "Agent Code": "TOTAL",
+                    "Total Policies": self.total_policies,
+                    **self.totals,
+                    "Quarter": self.sheet_name,
+                }
+            )
+        return [
+            [summary[column] for column in SUMMARY_HEADERS] for summary in summaries
+        ]
+
+
+class _ChunkSink:
+    """
+    Write-only stream whose output is drained in chunks
+
+    It has no ``tell()``, so ``zipfile`` writes entries for an unseekable
+    stream (sizes follow each entry's data instead of being patched back in).
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.size = 0
+
+    def flush(self) -> None:
+        pass
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def _peek_rows(rows: Iterable[Sequence[Any]]) -> Optional[Iterator[Sequence[Any]]]:
+    """Iterator over ``rows``, None if there are none"""
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None:
+        return None
+
+    def chained() -> Iterator[Sequence[Any]]:
+        yield first
+        yield from iterator
+
+    return chained()
+
+
+async def stream_csv_zip(sheets: AsyncIterable[ExportSheet]) -> AsyncIterator[bytes]:
+    """
+    ZIP of one CSV file per non-empty sheet, yielded as it is written
+
+    Args:
+        sheets: Sheets to export; data sheets are named
+            ``{name}_quarterly_data.csv``, summary sheets ``{name}.csv``
+
+    Yields:
+        Chunks of the ZIP archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        async for sheet in sheets:
+            rows = _peek_rows(sheet.rows)
+            if rows is None:
+                continue
+            filename = (
+                f"{sheet.name}.csv"
+                if sheet.summary
+                else f"{sheet.name}_quarterly_data.csv"
+            )
+            with archive.open(filename, "w") as entry:
+                text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+                writer = csv.writer(text)
+                writer.writerow(sheet.headers)
+                for values in rows:
+                    writer.writerow(values)
+                    if sink.size >= STREAM_CHUNK_BYTES:
+                        yield sink.drain()
+                text.flush()
+                text.detach()
+            if sink.size:
+                yield sink.drain()
+    yield sink.drain()
+
+
+def _sheet_title(name: str) -> str:
+    if len(name) > MAX_SHEET_NAME_LENGTH:
+        return name[: MAX_SHEET_NAME_LENGTH - 3] + "..."
+    return name
+
+
+def _xlsx_cell(value: Any) -> str:
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value!r}</v></c>"
+    text = escape(_ILLEGAL_XML_CHARACTERS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values: Sequence[Any]) -> str:
+    return "<row>" + "".join(_xlsx_cell(value) for value in values) + "</row>"
+
+
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_XLSX_SHEET_END = "</sheetData></worksheet>"
+
+
+def _xlsx_package_parts(titles: List[str]) -> Dict[str, str]:
+    """Workbook, relationship and content type parts for the written sheets"""
+    sheet_numbers = range(1, len(titles) + 1)
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.'
+        'spreadsheetml.worksheet+xml"/>'
+        for number in sheet_numbers
+    )
+    sheets = "".join(
+        f'<sheet name={quoteattr(title)} sheetId="{number}" r:id="rId{number}"/>'
+        for number, title in zip(sheet_numbers, titles)
+    )
+    relationships = "".join(
+        f'<Relationship Id="rId{number}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        f'relationships/worksheet" Target="worksheets/sheet{number}.xml"/>'
+        for number in sheet_numbers
+    )
+    header = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    return {
+        "[Content_Types].xml": header
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-'
+        'package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        + overrides
+        + "</Types>",
+        "_rels/.rels": header
+        + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        "openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+        '" Target="xl/workbook.xml"/></Relationships>',
+        "xl/workbook.xml": header
+        + '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/'
+        'main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships"><sheets>' + sheets + "</sheets></workbook>",
+        "xl/_rels/workbook.xml.rels": header
+        + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships">' + relationships + "</Relationships>",
+    }
+
+
+async def stream_xlsx(sheets: AsyncIterable[ExportSheet]) -> AsyncIterator[bytes]:
+    """
+    XLSX workbook with one worksheet per non-empty sheet, yielded as written
+
+    Args:
+        sheets: Sheets to export, in worksheet order
+
+    Yields:
+        Chunks of the XLSX file
+    """
+    sink = _ChunkSink()
+    titles: List[str] = []
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        async for sheet in sheets:
+            rows = _peek_rows(sheet.rows)
+            if rows is None:
+                continue
+            titles.append(_sheet_title(sheet.name))
+            with archive.open(f"xl/worksheets/sheet{len(titles)}.xml", "w") as entry:
+                entry.write(_XLSX_SHEET_START.encode("utf-8"))
+                entry.write(_xlsx_row(sheet.headers).encode("utf-8"))
+                for values in rows:
+                    entry.write(_xlsx_row(values).encode("utf-8"))
+                    if sink.size >= STREAM_CHUNK_BYTES:
+                        yield sink.drain()
+                entry.write(_XLSX_SHEET_END.encode("utf-8"))
+            if sink.size:
+                yield sink.drain()
+
+        if not titles:
+            # A workbook needs at least one worksheet
+            titles.append("No data")
+            archive.writestr(
+                "xl/worksheets/sheet1.xml", _XLSX_SHEET_START + _XLSX_SHEET_END
+            )
+        for name, content in _xlsx_package_parts(titles).items():
+            archive.writestr(name, content)
+    yield sink.drain()
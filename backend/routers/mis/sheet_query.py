@@ -0,0 +1,687 @@
+"""
+Columnar query engine for MIS sheet listings
+
+``/mis/quarter-sheet`` searches, filters and sorts a whole quarter on every
+request. Lowercasing the searched cells, scanning every row per filter value
+and recomputing sort keys each time made a filtered, sorted page over a large
+quarter take seconds.
+
+``SheetTable`` holds a sheet's data rows and prepares, on first use, what the
+queries need:
+
+- the lowercased column of every filtered or sorted field
+- the lowercased search text of each row (the search fields joined together)
+- the distinct values of each filtered column, so a substring filter tests
+  every distinct value once and then selects rows by set membership
+- ascending and descending sort permutations of each sorted column, so a
+  sorted result is a single pass over the permutation
+
+Quarter tables are cached per sheet by ``sheet_table_cache`` along with the
+snapshot token they were built from. A new snapshot (a reload after the TTL,
+or a row patched by a write) has a new token, so the next request builds a
+new table.
+
+Quarter tables also answer searches through a ``TrigramIndex`` over the
+search text: a term of three or more characters only checks the rows found
+in the posting lists of its trigrams. Building an index takes seconds on a
+large quarter, so it happens on a background thread and searches scan the
+search text until it is ready. A new table inherits the index of the
+sheet's previous table; rows whose content changed are tracked as dirty and
+always checked directly, until enough rows changed to warrant a rebuild.
+
+Each table also keeps the result of its most recent queries, so paging
+through one query sorts and filters once. A ``PageCursor`` names the
+snapshot and the query (including its sheet) a page came from plus the sort
+key and policy number of its last row. On the same snapshot the next page is
+a slice of the cached result. After the sheet changed, a sorted query
+resumes after that (sort key, policy number) pair, which sorted results are
+ordered by, and an unsorted one after the row that now holds that policy
+number, instead of at a row count or position that may have shifted.
+"""
+
+import base64
+import bisect
+import hashlib
+import json
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .schemas import MasterSheetRecord
+
+logger = logging.getLogger(__name__)
+
+# Sheet header (alias) of each MasterSheetRecord field
+RECORD_FIELD_HEADERS: Dict[str, str] = {
+    name: field.alias or name for name, field in MasterSheetRecord.model_fields.items()
+}
+
+# Separates fields in the search text when each field is searched on its own
+_FIELD_SEPARATOR = "\x00"
+
+# Below this share of the table, sorting the selected rows beats a full pass
+# over the sort permutation
+_SMALL_SELECTION_RATIO = 8
+
+# Posting lists intersected per search; the remaining candidates are verified
+# with a substring check anyway
+MAX_INTERSECTED_POSTINGS = 4
+
+# Query results kept per table for paging through them
+MAX_CACHED_RESULTS = 16
+
+# An inherited trigram index is rebuilt once this many rows changed (at least
+# MIN_DIRTY_ROWS, or DIRTY_ROW_RATIO of the table)
+MIN_DIRTY_ROWS = 1000
+DIRTY_ROW_RATIO = 0.05
+
+
+# Builds trigram indexes off the event loop, one at a time
+_index_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trigram-index")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Trigram posting lists over a text column
+
+    ``dirty`` holds positions whose text changed (or that were added) after
+    the posting lists were built; they are always returned as candidates.
+    """
+
+    def __init__(self, postings: Dict[str, array], dirty: Set[int]):
+        self.postings = postings
+        self.dirty = dirty
+
+    @classmethod
+    def build(cls, text: Sequence[str]) -> "TrigramIndex":
+        postings: Dict[str, array] = {}
+        for position, row_text in enumerate(text):
+            for trigram in _trigrams(row_text):
+                posting = postings.get(trigram)
+                if posting is None:
+                    posting = postings[trigram] = array("I")
+                posting.append(position)
+        return cls(postings, set())
+
+    def derive(
+        self, old_rows: Sequence[Sequence[str]], new_rows: Sequence[Sequence[str]]
+    ) -> Optional["TrigramIndex"]:
+        """
+        Index of a newer version of the same sheet, sharing these posting lists
+
+        Rows that differ from ``old_rows`` at the same position, and rows past
+        the end, become dirty. Returns None when a rebuild is cheaper.
+        """
+        if len(new_rows) < len(old_rows):
+            return None
+        limit = max(MIN_DIRTY_ROWS, int(len(new_rows) * DIRTY_ROW_RATIO))
+        dirty = set(self.dirty)
+        dirty.update(range(len(old_rows), len(new_rows)))
+        for position, (old, new) in enumerate(zip(old_rows, new_rows)):
+            if old is not new and old != new:
+                dirty.add(position)
+                if len(dirty) > limit:
+                    return None
+        if len(dirty) > limit:
+            return None
+        return TrigramIndex(self.postings, dirty)
+
+    def candidates(self, term: str) -> Optional[Iterable[int]]:
+        """
+        Positions that may contain ``term``, in ascending order
+
+        Returns None for terms shorter than a trigram (the caller scans).
+        """
+        trigrams = _trigrams(term)
+        if not trigrams:
+            return None
+        postings = sorted(
+            (self.postings.get(trigram, ()) for trigram in trigrams), key=len
+        )
+        found = set(postings[0])
+        for posting in postings[1:MAX_INTERSECTED_POSTINGS]:
+            if not found:
+                break
+            found.intersection_update(posting)
+        found.update(self.dirty)
+        return sorted(found)
+
+
+class InvalidCursorError(ValueError):
+    """A page cursor that is malformed or belongs to a different query"""
+
+
+@dataclass
+class PageCursor:
+    """Where the next page of a query starts"""
+
+    # Token of the snapshot the previous page was read from
+    version: str
+    # query_signature() of the query being paged, including its sheet
+    query: str
+    # Rows returned so far
+    offset: int
+    # Position, lowercase sort key and row key (normalized policy number) of
+    # the last returned row; the position is only used when the key is gone
+    position: int
+    sort_key: Optional[str] = None
+    row_key: Optional[str] = None
+
+    def encode(self) -> str:
+        payload = json.dumps(asdict(self), separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            cursor = cls(**json.loads(base64.urlsafe_b64decode(padded)))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {e}") from e
+        if (
+            not isinstance(cursor.version, str)
+            or not isinstance(cursor.query, str)
+            or not isinstance(cursor.offset, int)
+            or not isinstance(cursor.position, int)
+            or not isinstance(cursor.sort_key, (str, type(None)))
+            or not isinstance(cursor.row_key, (str, type(None)))
+            or cursor.offset < 1
+        ):
+            raise InvalidCursorError("Invalid cursor: unexpected field values")
+        return cursor
+
+
+def query_signature(
+    search: Optional[str],
+    search_fields: Sequence[str],
+    filter_by: Optional[Dict[str, List[str]]],
+    sort_by: Optional[str],
+    sort_order: str,
+    joined_search: bool = False,
+    sheet_name: str = "",
+) -> str:
+    """
+    Stable digest of a query, equal for queries that select the same rows
+
+    The sheet name is part of the digest, so a cursor issued for one
+    quarter is rejected on another.
+    """
+    filters = {}
+    for field_name, filter_values in (filter_by or {}).items():
+        clean_values = sorted(
+            {v.strip().lower() for v in filter_values or [] if v and v.strip()}
+        )
+        if clean_values:
+            filters[field_name] = clean_values
+    query = [
+        sheet_name,
+        (search or "").strip().lower(),
+        list(search_fields),
+        joined_search,
+        sorted(filters.items()),
+        sort_by if sort_by in RECORD_FIELD_HEADERS else None,
+        sort_order.lower() == "desc",
+    ]
+    encoded = json.dumps(query, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=12).hexdigest()
+
+
+class SheetTable:
+    """
+    Data rows of a sheet with lazily prepared lowercase columns
+
+    Rows stay raw value lists; queries return row positions into ``rows``, so
+    records are only built for the rows of the returned page.
+    """
+
+    def __init__(
+        self,
+        headers: List[str],
+        rows: Sequence[Sequence[str]],
+        convert: Optional[Callable[[str], Any]] = None,
+        index_search: bool = False,
+        name: str = "",
+    ):
+        # Sheet the rows come from, part of every query signature
+        self.name = name
+        self.headers = headers
+        self.rows = rows
+        # Optional per-cell conversion applied before a value is compared
+        self.convert = convert
+        # Answer searches from trigram indexes (worth it for cached tables)
+        self.index_search = index_search
+        self._search_indexes: Dict[Tuple[Tuple[str, ...], str], TrigramIndex] = {}
+        # Keys whose index is being built in the background
+        self._pending_indexes: Set[Tuple[Tuple[str, ...], str]] = set()
+        self._index_lock = threading.Lock()
+        # Later duplicates win, as when the row is turned into a dict
+        by_header = {header: index for index, header in enumerate(headers)}
+        self.columns: Dict[str, int] = {
+            name: by_header[header]
+            for name, header in RECORD_FIELD_HEADERS.items()
+            if header in by_header
+        }
+        self._lower: Dict[str, List[str]] = {}
+        self._distinct: Dict[str, Set[str]] = {}
+        self._orders: Dict[Tuple[str, bool], List[int]] = {}
+        self._sort_keys: Dict[str, List[Tuple[str, str]]] = {}
+        self._row_keys: Optional[List[str]] = None
+        self._positions_by_key: Optional[Dict[str, List[int]]] = None
+        self._search_text: Dict[Tuple[Tuple[str, ...], str], List[str]] = {}
+        self._results: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _text_column(self, field_name: str) -> Optional[List[str]]:
+        index = self.columns.get(field_name)
+        if index is None:
+            return None
+        convert = self.convert
+        return [
+            (row[index] if convert is None else str(convert(row[index])))
+            if index < len(row)
+            else ""
+            for row in self.rows
+        ]
+
+    def lower_column(self, field_name: str) -> Optional[List[str]]:
+        """Lowercased values of a field, None if the sheet lacks the column"""
+        column = self._lower.get(field_name)
+        if column is None:
+            text = self._text_column(field_name)
+            if text is None:
+                return None
+            column = [value.lower() for value in text]
+            self._lower[field_name] = column
+        return column
+
+    def search_text(self, fields: Sequence[str], joined: bool) -> List[str]:
+        """
+        Lowercased search text of every row
+
+        With ``joined`` the fields are joined by spaces, so a term may span
+        two fields; otherwise a separator no search term contains keeps each
+        field on its own.
+        """
+        key = (tuple(fields), " " if joined else _FIELD_SEPARATOR)
+        text = self._search_text.get(key)
+        if text is None:
+            empty = [""] * len(self.rows)
+            columns = [self.lower_column(field) or empty for field in fields]
+            text = [key[1].join(values) for values in zip(*columns)] or empty
+            self._search_text[key] = text
+        return text
+
+    def search_index(
+        self, fields: Sequence[str], joined: bool
+    ) -> Optional[TrigramIndex]:
+        """
+        Trigram index over ``search_text``, None while it is being built
+
+        The first call starts the build on a background thread, so a search
+        never waits for it; callers scan the search text in the meantime.
+        """
+        key = (tuple(fields), " " if joined else _FIELD_SEPARATOR)
+        index = self._search_indexes.get(key)
+        if index is not None:
+            return index
+        with self._index_lock:
+            if key in self._pending_indexes or key in self._search_indexes:
+                return self._search_indexes.get(key)
+            self._pending_indexes.add(key)
+        text = self.search_text(fields, joined)
+        _index_builder.submit(self._build_search_index, key, text)
+        return None
+
+    def _build_search_index(
+        self, key: Tuple[Tuple[str, ...], str], text: List[str]
+    ) -> None:
+        try:
+            index = TrigramIndex.build(text)
+            with self._index_lock:
+                self._search_indexes[key] = index
+        except Exception as e:
+            logger.error(f"Building the trigram search index failed: {str(e)}")
+        finally:
+            with self._index_lock:
+                self._pending_indexes.discard(key)
+
+    def inherit_search_indexes(self, previous: "SheetTable") -> None:
+        """Reuse the trigram indexes of the sheet's previous table"""
+        if previous.headers != self.headers:
+            return
+        with previous._index_lock:
+            indexes = list(previous._search_indexes.items())
+        for key, index in indexes:
+            derived = index.derive(previous.rows, self.rows)
+            if derived is not None:
+                self._search_indexes[key] = derived
+
+    def matching_values(self, field_name: str, terms: List[str]) -> Set[str]:
+        """Distinct non-empty lowercase values of a field containing any term"""
+        distinct = self._distinct.get(field_name)
+        if distinct is None:
+            distinct = set(self.lower_column(field_name) or ())
+            self._distinct[field_name] = distinct
+        return {
+            value for value in distinct if value and any(t in value for t in terms)
+        }
+
+    def row_keys(self) -> List[str]:
+        """
+        Normalized policy number of every row ("" if missing)
+
+        Unlike a row position it does not change when rows above are inserted
+        or deleted, so it breaks sort ties and anchors page cursors.
+        """
+        if self._row_keys is None:
+            column = self.lower_column("policy_number")
+            if column is None:
+                self._row_keys = [""] * len(self.rows)
+            else:
+                self._row_keys = [value.strip().lstrip("'") for value in column]
+        return self._row_keys
+
+    def positions_of(self, row_key: str) -> List[int]:
+        """Positions of the rows with a row key, in sheet order"""
+        if self._positions_by_key is None:
+            positions: Dict[str, List[int]] = {}
+            for position, key in enumerate(self.row_keys()):
+                if key:
+                    positions.setdefault(key, []).append(position)
+            self._positions_by_key = positions
+        return self._positions_by_key.get(row_key, [])
+
+    def sort_keys(self, field_name: str) -> List[Tuple[str, str]]:
+        """(lowercase value, row key) of every row, what sorted results order by"""
+        keys = self._sort_keys.get(field_name)
+        if keys is None:
+            keys = list(zip(self.lower_column(field_name), self.row_keys()))
+            self._sort_keys[field_name] = keys
+        return keys
+
+    def sort_permutation(self, field_name: str, descending: bool) -> List[int]:
+        """Row positions ordered by ``sort_keys`` (stable for ties)"""
+        key = (field_name, descending)
+        order = self._orders.get(key)
+        if order is None:
+            keys = self.sort_keys(field_name)
+            order = sorted(
+                range(len(self.rows)), key=keys.__getitem__, reverse=descending
+            )
+            self._orders[key] = order
+        return order
+
+    def select(
+        self,
+        search: Optional[str],
+        search_fields: Sequence[str],
+        filter_by: Optional[Dict[str, List[str]]],
+        sort_by: Optional[str],
+        sort_order: str,
+        joined_search: bool = False,
+    ) -> List[int]:
+        """
+        Positions of the rows matching search and filters, in sort order
+
+        Args:
+            search: Case-insensitive substring searched in ``search_fields``
+            search_fields: Fields the search looks at
+            filter_by: Field -> values; a row matches if the field contains any value
+            sort_by: Field to sort by (ignored unless it is a record field)
+            sort_order: 'asc' or 'desc'
+            joined_search: Match the search against the fields joined by spaces
+                instead of each field on its own
+
+        Returns:
+            Row positions into ``rows``
+        """
+        # None selects every row
+        selected: Optional[List[int]] = None
+
+        if search and search.strip():
+            term = search.strip().lower()
+            text = self.search_text(search_fields, joined_search)
+            candidates = None
+            if self.index_search:
+                index = self.search_index(search_fields, joined_search)
+                if index is not None:
+                    candidates = index.candidates(term)
+            if candidates is None:
+                selected = [i for i, row_text in enumerate(text) if term in row_text]
+            else:
+                selected = [i for i in candidates if term in text[i]]
+
+        for field_name, filter_values in (filter_by or {}).items():
+            clean_values = [
+                v.strip().lower() for v in filter_values or [] if v and v.strip()
+            ]
+            if not clean_values:
+                continue
+            column = self.lower_column(field_name)
+            if column is None:
+                # Records without the field never match a filter on it
+                return []
+            hits = self.matching_values(field_name, clean_values)
+            if selected is None:
+                selected = [i for i, value in enumerate(column) if value in hits]
+            else:
+                selected = [i for i in selected if column[i] in hits]
+
+        if sort_by and sort_by in RECORD_FIELD_HEADERS:
+            column = self.lower_column(sort_by)
+            if column is not None:
+                descending = sort_order.lower() == "desc"
+                if (
+                    selected is not None
+                    and len(selected) * _SMALL_SELECTION_RATIO < len(self.rows)
+                ):
+                    keys = self.sort_keys(sort_by)
+                    selected.sort(key=keys.__getitem__, reverse=descending)
+                    return selected
+                order = self.sort_permutation(sort_by, descending)
+                if selected is None:
+                    return list(order)
+                keep = bytearray(len(self.rows))
+                for i in selected:
+                    keep[i] = 1
+                return [i for i in order if keep[i]]
+
+        return list(range(len(self.rows))) if selected is None else selected
+
+    def cached_select(
+        self,
+        search: Optional[str],
+        search_fields: Sequence[str],
+        filter_by: Optional[Dict[str, List[str]]],
+        sort_by: Optional[str],
+        sort_order: str,
+        joined_search: bool = False,
+    ) -> Tuple[str, List[int]]:
+        """
+        ``select`` memoized per query
+
+        Returns:
+            The query signature and the row positions (shared, do not modify)
+        """
+        signature = query_signature(
+            search,
+            search_fields,
+            filter_by,
+            sort_by,
+            sort_order,
+            joined_search,
+            sheet_name=self.name,
+        )
+        positions = self._results.get(signature)
+        if positions is None:
+            positions = self.select(
+                search, search_fields, filter_by, sort_by, sort_order, joined_search
+            )
+            self._results[signature] = positions
+            while len(self._results) > MAX_CACHED_RESULTS:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(signature)
+        return signature, positions
+
+    def sort_field(self, sort_by: Optional[str]) -> Optional[str]:
+        """Field ``select`` actually sorts by, None for sheet order"""
+        if sort_by and sort_by in RECORD_FIELD_HEADERS:
+            if self.lower_column(sort_by) is not None:
+                return sort_by
+        return None
+
+    def cursor_after(
+        self,
+        version: str,
+        signature: str,
+        positions: List[int],
+        end: int,
+        sort_by: Optional[str],
+    ) -> Optional[PageCursor]:
+        """Cursor for the page starting at ``positions[end]``, None at the end"""
+        if end <= 0 or end >= len(positions):
+            return None
+        position = positions[end - 1]
+        field_name = self.sort_field(sort_by)
+        return PageCursor(
+            version=version,
+            query=signature,
+            offset=end,
+            position=position,
+            sort_key=self.lower_column(field_name)[position] if field_name else None,
+            row_key=self.row_keys()[position],
+        )
+
+    def resume_offset(
+        self,
+        cursor: PageCursor,
+        version: str,
+        signature: str,
+        positions: List[int],
+        sort_by: Optional[str],
+        sort_order: str,
+    ) -> int:
+        """
+        Index into ``positions`` where the page after ``cursor`` starts
+
+        On the cursor's own snapshot that is the cursor offset. Otherwise:
+
+        - a sorted result is ordered by (sort key, row key), so a binary
+          search finds the first row after the cursor's last row
+        - an unsorted result is in sheet order, so it continues after the row
+          that now holds the cursor row's policy number; if that row is gone,
+          at the cursor row's old position, which the next row moved into
+
+        Rows sharing a row key (or without one) fall back to their position.
+
+        Raises:
+            InvalidCursorError: If the cursor belongs to another query
+        """
+        if cursor.query != signature:
+            raise InvalidCursorError("Cursor does not match the query parameters")
+        if (
+            cursor.version == version
+            and cursor.offset <= len(positions)
+            and positions[cursor.offset - 1] == cursor.position
+        ):
+            return cursor.offset
+
+        row_key = cursor.row_key or ""
+        field_name = self.sort_field(sort_by)
+        if field_name is None:
+            anchors = self.positions_of(row_key) if row_key else []
+            if not anchors:
+                return bisect.bisect_left(positions, cursor.position)
+            anchor = min(anchors, key=lambda position: abs(position - cursor.position))
+            return bisect.bisect_right(positions, anchor)
+
+        keys = self.sort_keys(field_name)
+        descending = sort_order.lower() == "desc"
+        last_key = (cursor.sort_key or "", row_key)
+        unique_key = len(self.positions_of(row_key)) == 1 if row_key else False
+
+        def after_cursor(position: int) -> bool:
+            if keys[position] != last_key:
+                return (keys[position] < last_key) == descending
+            # Same sort key and policy number: the cursor row itself, unless
+            # the policy number is shared and only the position tells them apart
+            return not unique_key and position > cursor.position
+
+        low, high = 0, len(positions)
+        while low < high:
+            middle = (low + high) // 2
+            if after_cursor(positions[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+
+class SheetTableCache:
+    """Thread-safe LRU of the latest SheetTable of each sheet."""
+
+    def __init__(self, max_tables: int = 8):
+        self.max_tables = max_tables
+        self._tables: "OrderedDict[str, Tuple[str, SheetTable]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        sheet_name: str,
+        token: str,
+        build: Callable[[Optional[SheetTable]], SheetTable],
+    ) -> SheetTable:
+        """
+        Return the sheet's table for a snapshot token, building it on a miss
+
+        Args:
+            sheet_name: Sheet the table belongs to
+            token: Token of the snapshot the table must reflect
+            build: Called with the sheet's previous table (or None)
+
+        Returns:
+            The cached or newly built table
+        """
+        with self._lock:
+            cached = self._tables.get(sheet_name)
+            if cached is not None:
+                self._tables.move_to_end(sheet_name)
+                if cached[0] == token:
+                    return cached[1]
+
+        table = build(cached[1] if cached is not None else None)
+        with self._lock:
+            self._tables[sheet_name] = (token, table)
+            self._tables.move_to_end(sheet_name)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        return table
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+
+# Global instance shared by MIS requests
+sheet_table_cache = SheetTableCache()
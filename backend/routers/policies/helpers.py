@@ -878,7 +878,7 @@ class PolicyHelpers:
 
     @staticmethod
     async def create_simplified_policy(
-        db: AsyncSession, essential_data: Dict[str, Any]
+        db: AsyncSession, essential_data: Dict[str, Any], commit: bool = True
     ) -> Policy:
         """
         Create a simplified policy record with only essential fields
@@ -886,6 +886,8 @@ class PolicyHelpers:
         Args:
             db: Database session
             essential_data: Dictionary containing only essential policy fields
+            commit: Commit immediately; when False the row is only flushed so
+                the caller can add more writes to the same transaction
 
         Returns:
             Created Policy instance
@@ -904,8 +906,11 @@ class PolicyHelpers:
             )
 
             db.add(policy)
-            await db.commit()
-            await db.refresh(policy)
+            if commit:
+                await db.commit()
+                await db.refresh(policy)
+            else:
+                await db.flush()
 
             logger.info(f"Created simplified policy: {policy.policy_number}")
             return policy
@@ -87,6 +87,7 @@ from routers.policies.schemas import (
     PolicyUploadResponse,
 )
 from utils.s3_utils import build_cloudfront_url, build_key, generate_presigned_put_url
+from utils.sheet_outbox import enqueue_sheet_sync, sheet_sync_worker
 
 # FastAPI Router Configuration for Policy Management
 # Handles all policy-related endpoints with /policies prefix
@@ -357,22 +358,21 @@ async def submit_policy(
             "policy_end_date": policy_data.end_date,
         }
 
-        # Save to database with only essential fields
+        # Save to database with only essential fields; committed together
+        # with the Google Sheets outbox entry below
         policy = await PolicyHelpers.create_simplified_policy(
-            db=db, essential_data=essential_fields
+            db=db, essential_data=essential_fields, commit=False
         )
 
-        logger.info(f"Created policy {policy.id} with essential fields in database")
+        from routers.policies.helpers import (
+            prepare_complete_policy_sheets_data,
+            validate_and_resolve_codes_with_names,
+        )
+        from utils.quarterly_sheets_manager import quarterly_manager
 
-        # Save full data to Google Sheets using our helper function
+        # Resolve broker and insurer names from codes
+        broker_name, insurer_name = "", ""
         try:
-            from routers.policies.helpers import (
-                prepare_complete_policy_sheets_data,
-                validate_and_resolve_codes_with_names,
-            )
-            from utils.quarterly_sheets_manager import quarterly_manager
-
-            # Resolve broker and insurer names from codes
             broker_id, insurer_id, broker_name, insurer_name = (
                 await validate_and_resolve_codes_with_names(
                     db=db,
@@ -380,43 +380,44 @@ async def submit_policy(
                     insurer_code=policy_data.insurer_code,
                 )
             )
-
             logger.info(
                 f"Resolved broker: {broker_name} (ID: {broker_id}), insurer: {insurer_name} (ID: {insurer_id})"
             )
+        except HTTPException as e:
+            # Don't fail the main operation over names used only in Google Sheets
+            logger.error(f"Code resolution failed for policy {policy.id}: {e.detail}")
 
-            # Prepare complete data for Google Sheets using our helper function
-            complete_sheets_data = prepare_complete_policy_sheets_data(
-                policy_data=policy_data,
-                policy_db_record=policy,
-                broker_name=broker_name or "",
-                insurer_name=insurer_name or "",
-            )
-
-            logger.info(
-                f"Prepared {len(complete_sheets_data)} fields for quarterly Google Sheets"
-            )
-
-            # Route to current quarterly sheet
-            quarterly_result = await run_in_threadpool(
-                quarterly_manager.route_new_record_to_current_quarter,
-                complete_sheets_data,
-            )
-
-            if quarterly_result and quarterly_result.get("success"):
-                logger.info(
-                    f"Policy {policy.id} successfully routed to quarterly sheet: {quarterly_result.get('sheet_name')}"
+        # Queue the record for the current quarterly sheet in the same
+        # transaction. The savepoint keeps a failure here from losing the policy.
+        try:
+            async with db.begin_nested():
+                complete_sheets_data = prepare_complete_policy_sheets_data(
+                    policy_data=policy_data,
+                    policy_db_record=policy,
+                    broker_name=broker_name or "",
+                    insurer_name=insurer_name or "",
                 )
-            else:
-                logger.error(
-                    f"Failed to route policy {policy.id} to quarterly sheet: {quarterly_result.get('error') if quarterly_result else 'No result'}"
+                _, quarter, year = quarterly_manager.get_current_quarter_info()
+                enqueue_sheet_sync(
+                    db,
+                    source="policy",
+                    source_id=policy.id,
+                    operation="CREATE",
+                    policy_number=policy.policy_number,
+                    record_data=complete_sheets_data,
+                    quarter=quarter,
+                    year=year,
                 )
-
         except Exception as sync_error:
             logger.error(
-                f"Failed to route policy {policy.id} to quarterly sheet: {str(sync_error)}"
+                f"Queueing Google Sheets sync failed for policy {policy.id}, but database changes are saved: {str(sync_error)}"
             )
-            # Don't fail the main operation if Google Sheets sync fails
+        await db.commit()
+        sheet_sync_worker.notify()
+
+        logger.info(
+            f"Created policy {policy.id} with essential fields in database; quarterly sheet sync queued"
+        )
 
         return PolicyCreateResponse(
             id=policy.id,
@@ -660,7 +661,9 @@ async def get_policy_transaction_by_policy_number(
             from utils.quarterly_sheets_manager import quarterly_manager
 
             # Get the specific quarter sheet by name
-            target_sheet = quarterly_manager.get_quarterly_sheet(quarter, year)
+            target_sheet = await run_in_threadpool(
+                quarterly_manager.get_quarterly_sheet, quarter, year
+            )
 
             if not target_sheet:
                 logger.warning(
@@ -676,7 +679,7 @@ async def get_policy_transaction_by_policy_number(
                 sheet_found = True
 
                 # Get all data from the specific sheet
-                all_values = target_sheet.get_all_values()
+                all_values = await run_in_threadpool(target_sheet.get_all_values)
                 if not all_values:
                     sheets_data = {"error": "No data found in quarter sheet"}
                 else:
@@ -809,7 +812,7 @@ async def update_policy_transaction_by_policy_number(
 
     try:
         logger.info(
-            f"Step 1: Beginning database update for policy '{policy_number}' in quarter '{quarter_sheet_name}' (selective fields only)."
+            f"Beginning database update for policy '{policy_number}' in quarter '{quarter_sheet_name}' (selective fields only)."
         )
         async with db.begin():
             # Get the existing record by policy number
@@ -895,101 +898,62 @@ async def update_policy_transaction_by_policy_number(
                         f"Field '{field}' not found on Policy model - skipping"
                     )
 
-        # Refresh to get committed data
-        await db.refresh(policy)
-        logger.info(
-            f"Step 1 SUCCESS: Successfully updated policy '{policy_number}' (Policy ID {policy.id}) with selective fields."
-        )
-
-    except Exception as e:
-        logger.critical(
-            f"Step 1 FAILED: Database update failed for policy '{policy_number}'. Error: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=500, detail=f"Failed to update Policy in the database: {str(e)}"
-        )
+            await db.flush()
 
-    # Google Sheets sync with complete data to specific quarterly sheet
-    sync_results = None
-    try:
-        logger.info(
-            f"Step 2: Starting quarterly Google Sheets sync for policy '{policy_number}' in '{quarter_sheet_name}' with ALL fields."
-        )
-        from routers.policies.helpers import (
-            prepare_complete_policy_sheets_data_for_update,
-            validate_and_resolve_codes_with_names,
-        )
-        from utils.quarterly_sheets_manager import quarterly_manager
-
-        # Resolve broker and insurer names from codes if provided in update data
-        broker_id, insurer_id, broker_name, insurer_name = (
-            await validate_and_resolve_codes_with_names(
-                db=db,
-                broker_code=getattr(policy_data, "broker_code", None),
-                insurer_code=getattr(policy_data, "insurer_code", None),
+            # Queue the complete record for the quarterly sheet in the same
+            # transaction. The sheet row is looked up by the (possibly
+            # updated) policy number.
+            from routers.policies.helpers import (
+                prepare_complete_policy_sheets_data_for_update,
+                validate_and_resolve_codes_with_names,
             )
-        )
-
-        logger.info(
-            f"Final names for quarterly Google Sheets - Broker: '{broker_name or ''}', Insurer: '{insurer_name or ''}'"
-        )
-
-        # Prepare complete data for Google Sheets (all fields from request)
-        complete_sheets_data = prepare_complete_policy_sheets_data_for_update(
-            policy_data, policy, broker_name or "", insurer_name or ""
-        )
 
-        logger.info(
-            f"Syncing {len(complete_sheets_data)} fields to quarterly sheet '{quarter_sheet_name}': {list(complete_sheets_data.keys())}"
-        )
-
-        # Use the update method that targets specific quarterly sheet by policy number
-        target_policy_number = (
-            updated_policy_number if updated_policy_number else policy_number
-        )
-        logger.info(
-            f"🔍 QUARTERLY SHEETS UPDATE DEBUG for policy '{target_policy_number}' in '{quarter_sheet_name}':"
-        )
-        logger.info(f"   - Original policy number: '{policy_number}'")
-        logger.info(f"   - Updated policy number: '{updated_policy_number}'")
-        logger.info(f"   - Target policy number: '{target_policy_number}'")
-        logger.info(f"   - Quarter: {quarter}, Year: {year}")
-
-        # Update the specific quarterly sheet with quarter and year parameters
-        quarterly_result = await run_in_threadpool(
-            quarterly_manager.update_existing_record_by_policy_number,
-            complete_sheets_data,
-            target_policy_number,
-            quarter,  # Specify quarter
-            year,  # Specify year
-        )
-
-        sync_results = {"policy": quarterly_result}
-        logger.info(
-            f"Step 2 SUCCESS: Quarterly Google Sheets sync finished for policy '{target_policy_number}' in '{quarter_sheet_name}': {quarterly_result.get('operation', 'UPDATE')}"
-        )
-
-    except Exception as e:
-        logger.critical(
-            f"Step 2 FAILED: Quarterly Google Sheets sync failed for policy '{policy_number}', but database changes are saved. Error: {str(e)}"
-        )
-        from routers.policies.helpers import database_policy_response
-
-        return database_policy_response(policy)
-
-    if not sync_results:
-        logger.warning("Step 3 SKIPPED: No sync results to update flags.")
-        from routers.policies.helpers import database_policy_response
+            # Resolve broker and insurer names from codes if provided in update data
+            broker_name, insurer_name = "", ""
+            try:
+                _, _, broker_name, insurer_name = (
+                    await validate_and_resolve_codes_with_names(
+                        db=db,
+                        broker_code=getattr(policy_data, "broker_code", None),
+                        insurer_code=getattr(policy_data, "insurer_code", None),
+                    )
+                )
+            except HTTPException as e:
+                # Names are only used in Google Sheets; don't fail the update
+                logger.error(f"Code resolution failed for policy '{policy_number}': {e.detail}")
 
-        return database_policy_response(policy)
+            try:
+                async with db.begin_nested():
+                    complete_sheets_data = (
+                        prepare_complete_policy_sheets_data_for_update(
+                            policy_data, policy, broker_name or "", insurer_name or ""
+                        )
+                    )
+                    target_policy_number = (
+                        updated_policy_number
+                        if updated_policy_number
+                        else policy_number
+                    )
+                    enqueue_sheet_sync(
+                        db,
+                        source="policy",
+                        source_id=policy.id,
+                        operation="UPDATE",
+                        policy_number=target_policy_number,
+                        record_data=complete_sheets_data,
+                        quarter=quarter,
+                        year=year,
+                    )
+            except Exception as sync_error:
+                logger.error(
+                    f"Queueing quarterly Google Sheets sync failed for policy '{policy_number}', but database changes are saved: {str(sync_error)}"
+                )
 
-    # Policy updates don't have sync flags like CutPay, so we just return the updated policy
-    try:
-        logger.info(
-            f"Step 3 SUCCESS: Successfully updated policy '{policy_number}' (Policy ID {policy.id})."
-        )
+        # Refresh to get committed data
+        await db.refresh(policy)
+        sheet_sync_worker.notify()
         logger.info(
-            f"--- Update for policy '{policy_number}' in '{quarter_sheet_name}' finished successfully. ---"
+            f"Successfully updated policy '{policy_number}' (Policy ID {policy.id}) with selective fields; sync to '{quarter_sheet_name}' queued."
         )
         from routers.policies.helpers import database_policy_response
 
@@ -997,11 +961,11 @@ async def update_policy_transaction_by_policy_number(
 
     except Exception as e:
         logger.critical(
-            f"Step 3 FAILED: Finalizing update failed for policy '{policy_number}' (Policy ID {policy.id}). Error: {str(e)}"
+            f"Database update failed for policy '{policy_number}'. Error: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Failed to update Policy in the database: {str(e)}"
         )
-        from routers.policies.helpers import database_policy_response
-
-        return database_policy_response(policy)
 
 
 @router.delete("/policy-delete")
@@ -1096,7 +1060,9 @@ async def delete_policy_transaction_by_policy_number(
         from utils.quarterly_sheets_manager import quarterly_manager
 
         # Get the specific quarter sheet
-        target_sheet = quarterly_manager.get_quarterly_sheet(quarter, year)
+        target_sheet = await run_in_threadpool(
+            quarterly_manager.get_quarterly_sheet, quarter, year
+        )
 
         if not target_sheet:
             logger.warning(
@@ -1108,56 +1074,24 @@ async def delete_policy_transaction_by_policy_number(
                 f"Found quarter sheet '{quarter_sheet_name}', searching for policy to delete..."
             )
 
-            # Get all data from the sheet to find the policy row
-            all_values = target_sheet.get_all_values()
-            if not all_values:
-                sheets_deletion_message = (
-                    f"No data found in quarter sheet '{quarter_sheet_name}'"
+            # Find the policy row through the policy number index and delete it
+            found_row_index = await run_in_threadpool(
+                quarterly_manager.delete_row_by_policy_number,
+                target_sheet,
+                policy_number,
+            )
+
+            if found_row_index is None:
+                sheets_deletion_message = f"Policy '{policy_number}' not found in quarter sheet '{quarter_sheet_name}'"
+                logger.info(
+                    f"Policy '{policy_number}' not found in quarter sheet '{quarter_sheet_name}'"
                 )
             else:
-                headers = all_values[0] if all_values else []
-
-                # Find policy number column
-                policy_col_index = -1
-                for i, header in enumerate(headers):
-                    if header.lower().strip() in ["policy number", "policy_number"]:
-                        policy_col_index = i
-                        logger.info(
-                            f"Found policy number column at index {i}: '{header}'"
-                        )
-                        break
-
-                if policy_col_index == -1:
-                    sheets_deletion_message = f"Policy number column not found in quarter sheet '{quarter_sheet_name}'"
-                    logger.warning("Policy number column not found in sheet headers")
-                else:
-                    # Find the row with matching policy number
-                    found_row_index = -1
-
-                    # Skip header (row 1) and dummy/formula row (row 2)
-                    for row_index, row_data in enumerate(all_values[2:], start=3):
-                        if policy_col_index < len(row_data):
-                            cell_value = row_data[policy_col_index].strip()
-                            if cell_value == policy_number.strip():
-                                found_row_index = row_index
-                                logger.info(
-                                    f"Found policy '{policy_number}' at row {row_index}"
-                                )
-                                break
-
-                    if found_row_index == -1:
-                        sheets_deletion_message = f"Policy '{policy_number}' not found in quarter sheet '{quarter_sheet_name}'"
-                        logger.info(
-                            f"Policy '{policy_number}' not found in {len(all_values)-1} data rows"
-                        )
-                    else:
-                        # Delete the row from Google Sheets
-                        target_sheet.delete_rows(found_row_index)
-                        sheets_deletion_success = True
-                        sheets_deletion_message = f"Successfully deleted policy '{policy_number}' from quarter sheet '{quarter_sheet_name}' at row {found_row_index}"
-                        logger.info(
-                            f"Step 2 SUCCESS: Deleted policy '{policy_number}' from quarter sheet row {found_row_index}"
-                        )
+                sheets_deletion_success = True
+                sheets_deletion_message = f"Successfully deleted policy '{policy_number}' from quarter sheet '{quarter_sheet_name}' at row {found_row_index}"
+                logger.info(
+                    f"Step 2 SUCCESS: Deleted policy '{policy_number}' from quarter sheet row {found_row_index}"
+                )
 
     except Exception as sheets_error:
         logger.error(
@@ -85,16 +85,35 @@ sources while maintaining the highest standards of data quality, integrity,
 and operational efficiency.
 """
 
+import codecs
 import csv
+import hashlib
 import io
+import json
 import logging
 import os
 import re
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import chain, islice
+from typing import (
+    Any,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import ReconciliationReport
@@ -110,6 +129,55 @@ from .schemas import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class DateFormat:
+    """A date layout found in insurer statements"""
+
+    name: str
+    pattern: re.Pattern
+    # Order of the captured groups: "DMY", "YMD" or "DMY2" (two-digit year)
+    order: str
+
+
+# Common date patterns from different insurers. The patterns are mutually
+# exclusive, so a value matching one of them has exactly one reading.
+DATE_FORMATS = [
+    DateFormat(
+        "DD/MM/YYYY", re.compile(r"^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$"), "DMY"
+    ),  # DD/MM/YYYY or DD-MM-YYYY
+    DateFormat(
+        "DD/MM/YYYY HH:MM",
+        re.compile(r"^(\d{1,2})[/-](\d{1,2})[/-](\d{4})\s+\d{1,2}:\d{2}$"),
+        "DMY",
+    ),  # DD-MM-YYYY HH:MM
+    DateFormat(
+        "YYYY-MM-DD", re.compile(r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$"), "YMD"
+    ),  # YYYY-MM-DD or YYYY/MM/DD
+    DateFormat(
+        "YYYY-MM-DD HH:MM",
+        re.compile(r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})\s+\d{1,2}:\d{2}$"),
+        "YMD",
+    ),  # YYYY-MM-DD HH:MM
+    DateFormat(
+        "DD/MM/YY", re.compile(r"^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$"), "DMY2"
+    ),  # DD/MM/YY or DD-MM-YY
+]
+
+# Number of non-empty values sampled to infer a column's date format
+DATE_FORMAT_SAMPLE_SIZE = 200
+
+
+def _format_date_match(match: re.Match, order: str) -> str:
+    if order == "YMD":
+        year, month, day = match.groups()
+    else:
+        day, month, year = match.groups()
+        if order == "DMY2":
+            # Assume 20xx for years 00-30, 19xx for years 31-99
+            year = "20" + year if int(year) <= 30 else "19" + year
+    return f"{day.zfill(2)}/{month.zfill(2)}/{year}"
+
+
 def parse_date_field(date_string: str) -> str:
     """
     Parse various date formats and standardize them for Google Sheets
@@ -121,6 +189,9 @@ def parse_date_field(date_string: str) -> str:
     - DD/MM/YY
     - MM/DD/YYYY
 
+    Results are cached, so re-normalizing already parsed dates during
+    comparison costs a dictionary lookup.
+
     Returns: Standardized date string in DD/MM/YYYY format or empty string if invalid
     """
     if not date_string or not isinstance(date_string, str):
@@ -130,36 +201,16 @@ def parse_date_field(date_string: str) -> str:
     if not date_string:
         return ""
 
-    try:
-        # Common date patterns
-        patterns = [
-            (r"^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$", "DMY"),  # DD/MM/YYYY or DD-MM-YYYY
-            (
-                r"^(\d{1,2})[/-](\d{1,2})[/-](\d{4})\s+\d{1,2}:\d{2}$",
-                "DMY",
-            ),  # DD-MM-YYYY HH:MM
-            (r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$", "YMD"),  # YYYY-MM-DD or YYYY/MM/DD
-            (
-                r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})\s+\d{1,2}:\d{2}$",
-                "YMD",
-            ),  # YYYY-MM-DD HH:MM
-            (r"^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$", "DMY2"),  # DD/MM/YY or DD-MM-YY
-        ]
+    return _parse_date_string(date_string)
+
 
-        for pattern, format_type in patterns:
-            match = re.match(pattern, date_string)
+@lru_cache(maxsize=65536)
+def _parse_date_string(date_string: str) -> str:
+    try:
+        for date_format in DATE_FORMATS:
+            match = date_format.pattern.match(date_string)
             if match:
-                if format_type == "DMY":
-                    day, month, year = match.groups()
-                    return f"{day.zfill(2)}/{month.zfill(2)}/{year}"
-                elif format_type == "YMD":
-                    year, month, day = match.groups()
-                    return f"{day.zfill(2)}/{month.zfill(2)}/{year}"
-                elif format_type == "DMY2":
-                    day, month, year = match.groups()
-                    # Assume 20xx for years 00-30, 19xx for years 31-99
-                    full_year = "20" + year if int(year) <= 30 else "19" + year
-                    return f"{day.zfill(2)}/{month.zfill(2)}/{full_year}"
+                return _format_date_match(match, date_format.order)
 
         # If no pattern matches, try to parse with datetime (including time formats)
         for format_str in [
@@ -185,6 +236,134 @@ def parse_date_field(date_string: str) -> str:
         return ""
 
 
+def infer_date_format(values: Iterable[Any]) -> Optional[DateFormat]:
+    """
+    Pick the date format of a column from a sample of its values
+
+    Args:
+        values: Column values (non-strings and blanks are ignored)
+
+    Returns:
+        The format matching most sampled values, or None if none matches
+    """
+    counts = [0] * len(DATE_FORMATS)
+    sampled = 0
+    for value in values:
+        if not value or not isinstance(value, str):
+            continue
+        value = value.strip()
+        if not value:
+            continue
+        for i, date_format in enumerate(DATE_FORMATS):
+            if date_format.pattern.match(value):
+                counts[i] += 1
+                break
+        sampled += 1
+        if sampled >= DATE_FORMAT_SAMPLE_SIZE:
+            break
+
+    best = max(range(len(DATE_FORMATS)), key=lambda i: counts[i])
+    return DATE_FORMATS[best] if counts[best] else None
+
+
+def parse_date_with_format(
+    date_string: str, date_format: Optional[DateFormat]
+) -> str:
+    """
+    Parse a date with its column's inferred format, falling back to
+    ``parse_date_field`` for values in another format
+
+    Returns the same result as ``parse_date_field``.
+    """
+    if date_format is None or not date_string or not isinstance(date_string, str):
+        return parse_date_field(date_string)
+
+    match = date_format.pattern.match(date_string.strip())
+    if match:
+        return _format_date_match(match, date_format.order)
+    return parse_date_field(date_string)
+
+
+def _record_completeness(record: Dict[str, Any]) -> int:
+    """Number of non-empty fields in a record"""
+    return sum(1 for value in record.values() if value and str(value).strip())
+
+
+def fold_records_by_policy_number(
+    records: Iterable[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int], int]:
+    """
+    Deduplicate a stream of records by policy number in a single pass
+
+    Only the best record seen so far is kept per policy, so the input can be a
+    generator over a statement of any size.
+
+    Args:
+        records: Iterable of mapped records
+
+    Returns:
+        - Deduplicated list of records, in order of first appearance
+        - Dictionary showing duplicate counts per policy number
+        - Number of records read
+    """
+    # policy number -> [best record, its completeness (computed on the first duplicate), count]
+    policies: Dict[str, List[Any]] = {}
+    total_read = 0
+
+    for record in records:
+        total_read += 1
+        policy_number = (record.get("Policy number") or "").strip()
+        if not policy_number:
+            continue
+
+        state = policies.get(policy_number)
+        if state is None:
+            policies[policy_number] = [record, None, 1]
+            continue
+
+        best_record, max_completeness, count = state
+        if max_completeness is None:
+            max_completeness = _record_completeness(best_record)
+        state[2] = count + 1
+
+        # Choose the most complete record (one with most non-empty fields)
+        completeness = _record_completeness(record)
+        if completeness > max_completeness:
+            state[0], state[1] = record, completeness
+        elif completeness == max_completeness:
+            # If equal completeness, merge the records to get the most complete data
+            merged_record = best_record.copy()
+            for key, value in record.items():
+                if (
+                    value
+                    and str(value).strip()
+                    and (
+                        not merged_record.get(key)
+                        or not str(merged_record.get(key)).strip()
+                    )
+                ):
+                    merged_record[key] = value
+            state[0], state[1] = merged_record, max_completeness
+        else:
+            state[1] = max_completeness
+
+    deduplicated_records = []
+    duplicate_counts = {}
+    for policy_number, (best_record, max_completeness, count) in policies.items():
+        if count > 1:
+            duplicate_counts[policy_number] = count
+            logger.info(f"Found {count} duplicates for policy {policy_number}")
+            logger.info(
+                f"Selected best record for policy {policy_number} with completeness score {max_completeness}"
+            )
+        deduplicated_records.append(best_record)
+
+    logger.info(
+        f"Deduplicated {total_read} records to {len(deduplicated_records)} unique policies"
+    )
+    return deduplicated_records, duplicate_counts, total_read
+
+
 def deduplicate_records_by_policy_number(
     records: List[Dict[str, Any]],
 ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
@@ -198,69 +377,152 @@ def deduplicate_records_by_policy_number(
         - Deduplicated list of records
         - Dictionary showing duplicate counts per policy number
     """
-    policy_groups = {}
-    duplicate_counts = {}
+    deduplicated_records, duplicate_counts, _ = fold_records_by_policy_number(records)
+    return deduplicated_records, duplicate_counts
 
-    for record in records:
-        policy_number = record.get("Policy number", "").strip()
-        if not policy_number:
-            continue
 
-        if policy_number not in policy_groups:
-            policy_groups[policy_number] = []
+FIELD_KIND_TEXT = "text"
+FIELD_KIND_NUMBER = "number"
+FIELD_KIND_DATE = "date"
 
-        policy_groups[policy_number].append(record)
 
-    deduplicated_records = []
+@lru_cache(maxsize=1024)
+def field_kind(field_name: str) -> str:
+    """How a field's values are normalized before comparison"""
+    lowered = field_name.lower()
+    if "premium" in lowered or "amount" in lowered:
+        return FIELD_KIND_NUMBER
+    if "date" in lowered:
+        return FIELD_KIND_DATE
+    return FIELD_KIND_TEXT
 
-    for policy_number, policy_records in policy_groups.items():
-        if len(policy_records) > 1:
-            duplicate_counts[policy_number] = len(policy_records)
-            logger.info(
-                f"Found {len(policy_records)} duplicates for policy {policy_number}"
-            )
 
-            # Choose the most complete record (one with most non-empty fields)
-            best_record = None
-            max_completeness = 0
+def _normalize_number(value: str) -> str:
+    try:
+        return f"{float(value.replace(',', '')):.2f}"
+    except ValueError:
+        return value
 
-            for record in policy_records:
-                # Calculate completeness score
-                completeness = sum(
-                    1 for value in record.values() if value and str(value).strip()
-                )
 
-                if completeness > max_completeness:
-                    max_completeness = completeness
-                    best_record = record
-                elif completeness == max_completeness and best_record:
-                    # If equal completeness, merge the records to get the most complete data
-                    merged_record = best_record.copy()
-                    for key, value in record.items():
-                        if (
-                            value
-                            and str(value).strip()
-                            and (
-                                not merged_record.get(key)
-                                or not str(merged_record.get(key)).strip()
-                            )
-                        ):
-                            merged_record[key] = value
-                    best_record = merged_record
+def _normalize_column(values: List[str], kind: str) -> List[str]:
+    """
+    Normalize one column, parsing each distinct value once
 
-            if best_record:
-                deduplicated_records.append(best_record)
-                logger.info(
-                    f"Selected best record for policy {policy_number} with completeness score {max_completeness}"
+    A value that does not parse (``parse_date_field`` returns "") is kept
+    as is, so two different unparseable values still compare as different.
+    """
+    if kind == FIELD_KIND_TEXT:
+        return values
+    normalize = _normalize_number if kind == FIELD_KIND_NUMBER else parse_date_field
+    normalized: Dict[str, str] = {}
+    result = []
+    for value in values:
+        cached = normalized.get(value)
+        if cached is None:
+            cached = (normalize(value) or value) if value else value
+            normalized[value] = cached
+        result.append(cached)
+    return result
+
+
+def _column_strings(records: List[Dict[str, Any]], field: str) -> List[str]:
+    return [
+        str(value).strip() if value is not None else ""
+        for value in (record.get(field, "") for record in records)
+    ]
+
+
+@dataclass
+class FieldComparison:
+    """Per-pair and per-field outcome of ``compare_record_batch``"""
+
+    # Changed field names per record pair, in field order
+    changed_fields: List[List[str]]
+    # (old, new) values of the changed fields per record pair
+    field_changes: List[Dict[str, Tuple[str, str]]]
+    # Number of pairs in which each field changed
+    field_counts: Dict[str, int]
+
+
+def compare_record_batch(
+    existing_records: List[Dict[str, Any]], new_records: List[Dict[str, Any]]
+) -> FieldComparison:
+    """
+    Compare matched sheet records with uploaded records, one column at a time
+
+    Each field is loaded into a pair of string columns and normalized once per
+    distinct value: amounts and premiums as 2-decimal numbers, dates through
+    ``parse_date_field``. A field counts as changed for a pair when the
+    normalized values differ, except that an empty upload value never
+    replaces existing data.
+
+    Args:
+        existing_records: Current records from the quarterly sheet
+        new_records: Uploaded records, aligned with ``existing_records``
+
+    Returns:
+        FieldComparison with changed fields and (old, new) values per pair,
+        and change counts per field
+    """
+    count = len(new_records)
+    changed_fields: List[List[str]] = [[] for _ in range(count)]
+    field_changes: List[Dict[str, Tuple[str, str]]] = [{} for _ in range(count)]
+    field_counts: Dict[str, int] = {}
+
+    fields: Dict[str, None] = {}
+    for record in chain(new_records, existing_records):
+        for field in record:
+            fields.setdefault(field)
+
+    for field in fields:
+        existing_column = _column_strings(existing_records, field)
+        new_column = _column_strings(new_records, field)
+        if field == "Policy number":
+            # Fix policy number formatting issue (remove leading quote)
+            new_column = [v[1:] if v.startswith("'") else v for v in new_column]
+
+        # Rows whose raw values differ; empty upload values preserve existing data
+        candidates = [
+            i
+            for i, (existing_value, new_value) in enumerate(
+                zip(existing_column, new_column)
+            )
+            if existing_value != new_value and (new_value or not existing_value)
+        ]
+        if not candidates:
+            continue
+
+        kind = field_kind(field)
+        if kind != FIELD_KIND_TEXT:
+            existing_normalized = _normalize_column(
+                [existing_column[i] for i in candidates], kind
+            )
+            new_normalized = _normalize_column(
+                [new_column[i] for i in candidates], kind
+            )
+            candidates = [
+                i
+                for i, existing_value, new_value in zip(
+                    candidates, existing_normalized, new_normalized
                 )
-        else:
-            # No duplicates, add the single record
-            deduplicated_records.append(policy_records[0])
+                if existing_value != new_value
+            ]
+            if not candidates:
+                continue
+
+        field_counts[field] = len(candidates)
+        for i in candidates:
+            changed_fields[i].append(field)
+            field_changes[i][field] = (existing_column[i], new_column[i])
 
     logger.info(
-        f"Deduplicated {len(records)} records to {len(deduplicated_records)} unique policies"
+        f"Compared {count} matched records across {len(fields)} fields: {sum(field_counts.values())} field changes"
+    )
+    return FieldComparison(
+        changed_fields=changed_fields,
+        field_changes=field_changes,
+        field_counts=field_counts,
     )
-    return deduplicated_records, duplicate_counts
 
 
 def compare_record_fields(
@@ -270,6 +532,8 @@ def compare_record_fields(
     Compare records and identify fields with actual value changes.
     Always updates the record, but only counts fields with different values as variations.
 
+    Single-pair form of ``compare_record_batch``.
+
     Args:
         existing_record: Current record from quarterly sheet
         new_record: New record from upload
@@ -279,211 +543,174 @@ def compare_record_fields(
         - changed_fields: Only field names where values actually differ
         - field_changes: Only fields with changes mapped to (old_value, new_value) tuples
     """
-    changed_fields = []
-    field_changes = {}
-
-    # List of calculated/formula fields that should not be counted as variations
-    # when the new record has empty values but existing record has calculated values
-    calculated_fields = {
-        "Receivable from Broker",
-        "Extra Amount Receivable from Broker",
-        "Total Receivable from Broker",
-        "Agent_PO_AMT",
-        "Agent_Extra%",
-        "Agent_Extr_Amount",
-        "Agent Total PO Amount",
-        "Running Bal",
-        "Total Receivable from Broker Include 18% GST",
-        "IZ Total PO%",
-        "As per Broker PO AMT",
-        "PO% Diff Broker",
-        "PO AMT Diff Broker",
-        "Actual Agent PO%",
-        "As per Agent Payout Amount",
-        "PO% Diff Agent",
-        "PO AMT Diff Agent",
-        "Formatted Policy number",
-    }
-
-    # Get all unique field names from both records to ensure comprehensive comparison
-    all_fields = set(existing_record.keys()) | set(new_record.keys())
+    comparison = compare_record_batch([existing_record], [new_record])
+    return True, comparison.changed_fields[0], comparison.field_changes[0]
+
+
+# Master sheet header -> ReconciliationReport field name. Each field has a
+# "<field>_variations" column counting the records where that header changed.
+RECONCILIATION_HEADER_FIELDS: Dict[str, str] = {
+    "Reporting Month (mmm'yy)": "reporting_month",
+    "Child ID/ User ID [Provided by Insure Zeal]": "child_id",
+    "Insurer /broker code": "insurer_broker_code",
+    "Policy Start Date": "policy_start_date",
+    "Policy End Date": "policy_end_date",
+    "Booking Date(Click to select Date)": "booking_date",
+    "Broker Name": "broker_name",
+    "Insurer name": "insurer_name",
+    "Major Categorisation( Motor/Life/ Health)": "major_categorisation",
+    "Product (Insurer Report)": "product",
+    "Product Type": "product_type",
+    "Plan type (Comp/STP/SAOD)": "plan_type",
+    "Gross premium": "gross_premium",
+    "GST Amount": "gst_amount",
+    "Net premium": "net_premium",
+    "OD Preimium": "od_premium",
+    "TP Premium": "tp_premium",
+    "Policy number": "policy_number",
+    "Formatted Policy number": "formatted_policy_number",
+    "Registration.no": "registration_no",
+    "Make_Model": "make_model",
+    "Model": "model",
+    "Vehicle_Variant": "vehicle_variant",
+    "GVW": "gvw",
+    "RTO": "rto",
+    "State": "state",
+    "Cluster": "cluster",
+    "Fuel Type": "fuel_type",
+    "CC": "cc",
+    "Age(Year)": "age_year",
+    "NCB (YES/NO)": "ncb",
+    "Discount %": "discount_percentage",
+    "Business Type": "business_type",
+    "Seating Capacity": "seating_capacity",
+    "Veh_Wheels": "veh_wheels",
+    "Customer Name": "customer_name",
+    "Customer Number": "customer_number",
+    "Commissionable Premium": "commissionable_premium",
+    "Incoming Grid %": "incoming_grid_percentage",
+    "Receivable from Broker": "receivable_from_broker",
+    "Extra Grid": "extra_grid",
+    "Extra Amount Receivable from Broker": "extra_amount_receivable",
+    "Total Receivable from Broker": "total_receivable_from_broker",
+    "Claimed By": "claimed_by",
+    "Payment by": "payment_by",
+    "Payment Mode": "payment_mode",
+    "Cut Pay Amount Received From Agent": "cut_pay_amount_received",
+    "Already Given to agent": "already_given_to_agent",
+    "Actual Agent_PO%": "actual_agent_po_percentage",
+    "Agent_PO_AMT": "agent_po_amt",
+    "Agent_Extra%": "agent_extra_percentage",
+    "Agent_Extr_Amount": "agent_extra_amount",
+    "Agent Total PO Amount": "agent_total_po_amount",
+    "Payment By Office": "payment_by_office",
+    "PO Paid To Agent": "po_paid_to_agent",
+    "Running Bal": "running_bal",
+    "Total Receivable from Broker Include 18% GST": "total_receivable_gst",
+    "IZ Total PO%": "iz_total_po_percentage",
+    "As per Broker PO%": "as_per_broker_po_percentage",
+    "As per Broker PO AMT": "as_per_broker_po_amt",
+    "PO% Diff Broker": "po_percentage_diff_broker",
+    "PO AMT Diff Broker": "po_amt_diff_broker",
+    "Actual Agent PO%": "actual_agent_po_percentage_2",
+    "As per Agent Payout%": "as_per_agent_payout_percentage",
+    "As per Agent Payout Amount": "as_per_agent_payout_amount",
+    "PO% Diff Agent": "po_percentage_diff_agent",
+    "PO AMT Diff Agent": "po_amt_diff_agent",
+    "Invoice Status": "invoice_status",
+    "Invoice Number": "invoice_number",
+    "Remarks": "remarks",
+    "Match": "match",
+    "Agent Code": "agent_code",
+}
+
+# Lookup keys accepted for a field: its header (case-insensitive) or field name
+_RECONCILIATION_FIELDS_BY_HEADER = {
+    header.lower(): field_name
+    for header, field_name in RECONCILIATION_HEADER_FIELDS.items()
+}
+_RECONCILIATION_FIELD_NAMES = frozenset(RECONCILIATION_HEADER_FIELDS.values())
+
+
+def _header_to_identifier(header: str) -> str:
+    """Snake-case identifier for a header that has no explicit field name"""
+    identifier = (
+        header.lower()
+        .replace(" ", "_")
+        .replace("(", "")
+        .replace(")", "")
+        .replace("/", "_")
+        .replace("-", "_")
+        .replace(".", "")
+        .replace("'", "")
+        .replace("[", "")
+        .replace("]", "")
+        .replace("%", "_percentage")
+        .replace("&", "_and_")
+        .replace("#", "_number_")
+        .replace("@", "_at_")
+        .replace("  ", "_")
+        .replace("__", "_")
+    )
+    return identifier.strip("_")
 
-    # Compare each field and only count actual value differences
-    for field in all_fields:
-        existing_value = existing_record.get(field, "")
-        new_value = new_record.get(field, "")
 
-        # Convert values to strings for comparison
-        existing_str = str(existing_value).strip() if existing_value is not None else ""
-        new_str = str(new_value).strip() if new_value is not None else ""
+@lru_cache(maxsize=1024)
+def reconciliation_field_name(field: str) -> str:
+    """
+    ReconciliationReport field name for a sheet header or field name
 
-        # Fix policy number formatting issue (remove leading quote)
-        if field == "Policy number" and new_str.startswith("'"):
-            new_str = new_str[1:]
+    Args:
+        field: Master sheet header, in any case, or a report field name
 
-        # Skip ALL fields where new record is empty but existing has values
-        # This treats empty upload values as "no change" rather than variations
-        if new_str == "" and existing_str != "":
-            # Don't count as variation - preserve existing value
-            continue
+    Returns:
+        Field name whose "<field>_variations" column counts changes to it
+    """
+    lowered = str(field).lower()
+    field_name = _RECONCILIATION_FIELDS_BY_HEADER.get(lowered)
+    if field_name:
+        return field_name
+    underscored = lowered.replace(" ", "_")
+    if underscored in _RECONCILIATION_FIELD_NAMES:
+        return underscored
+    return _header_to_identifier(lowered)
 
-        # Only count as changed if values actually differ
-        if existing_str != new_str:
-            changed_fields.append(field)
-            field_changes[field] = (existing_str, new_str)
 
-    # Debug logging for first few comparisons
-    policy_num = new_record.get("Policy number", "Unknown")
-    logger.info(
-        f"Policy {policy_num}: {len(changed_fields)} out of {len(all_fields)} fields actually changed"
-    )
+def variation_column(field: str) -> str:
+    """ReconciliationReport column counting variations of a header or field"""
+    return f"{reconciliation_field_name(field)}_variations"
 
-    # Log field names being compared (first time only for each upload)
-    if not hasattr(compare_record_fields, "_logged_fields"):
-        logger.info(f"All fields being compared: {sorted(all_fields)}")
-        compare_record_fields._logged_fields = True
 
-    # For identical data uploads, log ALL changes to debug why fields are showing as different
-    if len(changed_fields) > 0:
-        logger.info(f"Policy {policy_num} - ALL changed fields: {changed_fields}")
-        for field in changed_fields:  # Show ALL changes, not just first 3
-            old_val, new_val = field_changes[field]
-            logger.info(
-                f"  CHANGE: {field}: '{old_val}' (len={len(str(old_val))}) -> '{new_val}' (len={len(str(new_val))})"
-            )
-    else:
-        logger.info(
-            f"Policy {policy_num} - No field changes detected (this is correct for identical data)"
-        )
+@lru_cache(maxsize=1)
+def _master_variation_fields() -> Tuple[str, ...]:
+    from utils.quarterly_sheets_manager import quarterly_manager
 
-    return True, changed_fields, field_changes
+    return tuple(
+        reconciliation_field_name(header)
+        for header in quarterly_manager._get_default_headers()
+    )
 
 
 def calculate_field_variations(
     processed_records: List[Dict[str, Any]],
+    field_counts: Optional[Dict[str, int]] = None,
 ) -> Dict[str, int]:
     """
     Calculate field variations for all 72 master sheet headers based on processed records.
 
     Args:
         processed_records: List of processed records with change details
+        field_counts: Change counts per sheet header, as aggregated by
+            ``compare_record_batch``; added to the counts from processed_records
 
     Returns:
         Dictionary mapping field names to variation counts
     """
-    from utils.quarterly_sheets_manager import quarterly_manager
-
-    # Get master headers from quarterly sheets manager
-    master_headers = quarterly_manager._get_default_headers()
-
-    # Create a mapping from master headers to actual model field names
-    # This maps the 72 master headers to the exact field names in the ReconciliationReport model
-    header_to_field_map = {
-        "Reporting Month (mmm'yy)": "reporting_month",
-        "Child ID/ User ID [Provided by Insure Zeal]": "child_id",
-        "Insurer /broker code": "insurer_broker_code",
-        "Policy Start Date": "policy_start_date",
-        "Policy End Date": "policy_end_date",
-        "Booking Date(Click to select Date)": "booking_date",
-        "Broker Name": "broker_name",
-        "Insurer name": "insurer_name",
-        "Major Categorisation( Motor/Life/ Health)": "major_categorisation",
-        "Product (Insurer Report)": "product",
-        "Product Type": "product_type",
-        "Plan type (Comp/STP/SAOD)": "plan_type",
-        "Gross premium": "gross_premium",
-        "GST Amount": "gst_amount",
-        "Net premium": "net_premium",
-        "OD Preimium": "od_premium",
-        "TP Premium": "tp_premium",
-        "Policy number": "policy_number",
-        "Formatted Policy number": "formatted_policy_number",
-        "Registration.no": "registration_no",
-        "Make_Model": "make_model",
-        "Model": "model",
-        "Vehicle_Variant": "vehicle_variant",
-        "GVW": "gvw",
-        "RTO": "rto",
-        "State": "state",
-        "Cluster": "cluster",
-        "Fuel Type": "fuel_type",
-        "CC": "cc",
-        "Age(Year)": "age_year",
-        "NCB (YES/NO)": "ncb",
-        "Discount %": "discount_percentage",
-        "Business Type": "business_type",
-        "Seating Capacity": "seating_capacity",
-        "Veh_Wheels": "veh_wheels",
-        "Customer Name": "customer_name",
-        "Customer Number": "customer_number",
-        "Commissionable Premium": "commissionable_premium",
-        "Incoming Grid %": "incoming_grid_percentage",
-        "Receivable from Broker": "receivable_from_broker",
-        "Extra Grid": "extra_grid",
-        "Extra Amount Receivable from Broker": "extra_amount_receivable",
-        "Total Receivable from Broker": "total_receivable_from_broker",
-        "Claimed By": "claimed_by",
-        "Payment by": "payment_by",
-        "Payment Mode": "payment_mode",
-        "Cut Pay Amount Received From Agent": "cut_pay_amount_received",
-        "Already Given to agent": "already_given_to_agent",
-        "Actual Agent_PO%": "actual_agent_po_percentage",
-        "Agent_PO_AMT": "agent_po_amt",
-        "Agent_Extra%": "agent_extra_percentage",
-        "Agent_Extr_Amount": "agent_extra_amount",
-        "Agent Total PO Amount": "agent_total_po_amount",
-        "Payment By Office": "payment_by_office",
-        "PO Paid To Agent": "po_paid_to_agent",
-        "Running Bal": "running_bal",
-        "Total Receivable from Broker Include 18% GST": "total_receivable_gst",
-        "IZ Total PO%": "iz_total_po_percentage",
-        "As per Broker PO%": "as_per_broker_po_percentage",
-        "As per Broker PO AMT": "as_per_broker_po_amt",
-        "PO% Diff Broker": "po_percentage_diff_broker",
-        "PO AMT Diff Broker": "po_amt_diff_broker",
-        "Actual Agent PO%": "actual_agent_po_percentage_2",
-        "As per Agent Payout%": "as_per_agent_payout_percentage",
-        "As per Agent Payout Amount": "as_per_agent_payout_amount",
-        "PO% Diff Agent": "po_percentage_diff_agent",
-        "PO AMT Diff Agent": "po_amt_diff_agent",
-        "Invoice Status": "invoice_status",
-        "Invoice Number": "invoice_number",
-        "Remarks": "remarks",
-        "Match": "match",
-        "Agent Code": "agent_code",
-    }
-
     # Initialize variation counts for all headers
-    field_variations = {}
-    for header in master_headers:
-        field_name = header_to_field_map.get(header)
-        if field_name:
-            field_variations[field_name] = 0
-        else:
-            # Fallback to automatic conversion for any unmapped headers
-            field_name = (
-                header.lower()
-                .replace(" ", "_")
-                .replace("(", "")
-                .replace(")", "")
-                .replace("/", "_")
-                .replace("-", "_")
-                .replace(".", "")
-                .replace("'", "")
-                .replace("[", "")
-                .replace("]", "")
-                .replace("%", "_percentage")
-                .replace("&", "_and_")
-                .replace("#", "_number_")
-                .replace("@", "_at_")
-                .replace("  ", "_")
-                .replace("__", "_")
-            )
-            field_name = field_name.strip("_")
-            field_variations[field_name] = 0
+    field_variations = dict.fromkeys(_master_variation_fields(), 0)
 
-    # Count variations for each field based on processed records
-    unmapped_fields = set()
+    # Count changes per distinct field, then map each field name once
+    changes_by_field: Dict[str, int] = dict(field_counts or {})
     for record in processed_records:
         changed_fields = record.get("changed_fields", [])
         if isinstance(changed_fields, dict):
@@ -491,46 +718,19 @@ def calculate_field_variations(
             changed_fields = list(changed_fields.keys())
 
         for field in changed_fields:
-            # First try to find direct mapping from master headers
-            mapped_field = None
-            for header, field_name in header_to_field_map.items():
-                if (
-                    field.lower() == header.lower()
-                    or field.lower().replace(" ", "_") == field_name
-                ):
-                    mapped_field = field_name
-                    break
+            changes_by_field[field] = changes_by_field.get(field, 0) + 1
 
-            # If no direct mapping found, use automatic conversion
-            if not mapped_field:
-                mapped_field = (
-                    str(field)
-                    .lower()
-                    .replace(" ", "_")
-                    .replace("(", "")
-                    .replace(")", "")
-                    .replace("/", "_")
-                    .replace("-", "_")
-                    .replace(".", "")
-                    .replace("'", "")
-                    .replace("[", "")
-                    .replace("]", "")
-                    .replace("%", "_percentage")
-                    .replace("&", "_and_")
-                    .replace("#", "_number_")
-                    .replace("@", "_at_")
-                    .replace("  ", "_")
-                    .replace("__", "_")
-                )
-                mapped_field = mapped_field.strip("_")
-                unmapped_fields.add(f"{field} -> {mapped_field}")
-
-            if mapped_field in field_variations:
-                field_variations[mapped_field] += 1
+    ignored_fields = set()
+    for field, count in changes_by_field.items():
+        field_name = reconciliation_field_name(field)
+        if field_name in field_variations:
+            field_variations[field_name] += count
+        else:
+            ignored_fields.add(f"{field} -> {field_name}")
 
-    # Log unmapped fields for debugging
-    if unmapped_fields:
-        logger.info(f"Fields using automatic conversion: {sorted(unmapped_fields)}")
+    # Log fields that have no variation column for debugging
+    if ignored_fields:
+        logger.info(f"Fields without a variation column: {sorted(ignored_fields)}")
 
     return field_variations
 
@@ -538,6 +738,155 @@ def calculate_field_variations(
 # Master insurer mappings loaded from CSV configuration
 INSURER_MAPPINGS: Dict[str, Dict[str, str]] = {}
 
+# Target headers whose values are normalized with parse_date_field
+MAPPED_DATE_FIELDS = frozenset(
+    {
+        "Policy Start Date",
+        "Policy End Date",
+        "Booking Date(Click to select Date)",
+    }
+)
+
+
+def clean_csv_header(header: Optional[str]) -> str:
+    """Remove BOM (\\ufeff) and other invisible characters from a CSV header"""
+    return (header or "").replace("\ufeff", "").replace("\ufffe", "").strip()
+
+
+@dataclass
+class BoundMappingPlan:
+    """An insurer mapping resolved against one file's header row."""
+
+    # (column index, target header, parse as date) in output order
+    columns: List[Tuple[int, str, bool]]
+    # (component header, column index) of the GST formula present in the file
+    gst_columns: List[Tuple[str, int]]
+    computes_gst: bool
+    # Inferred format per date column index (None: parse each cell)
+    date_formats: Dict[int, Optional[DateFormat]]
+
+    def infer_date_formats(self, rows: List[List[str]]) -> None:
+        """Sample each date column once and remember its format"""
+        for index, target, is_date in self.columns:
+            if not is_date:
+                continue
+            date_format = infer_date_format(
+                row[index] for row in rows if index < len(row)
+            )
+            self.date_formats[index] = date_format
+            logger.info(
+                f"Date format for '{target}': {date_format.name if date_format else 'per value'}"
+            )
+
+    def project(self, row: List[str]) -> Dict[str, Any]:
+        """Map one CSV row to a record keyed by master sheet headers"""
+        width = len(row)
+        mapped_row: Dict[str, Any] = {}
+        for index, target, is_date in self.columns:
+            # Short rows leave missing columns as None, like csv.DictReader
+            value = row[index] if index < width else None
+            if is_date:
+                value = parse_date_with_format(value, self.date_formats.get(index))
+            mapped_row[target] = value
+
+        if self.computes_gst:
+            total_gst = 0.0
+            for component, index in self.gst_columns:
+                component_value_str = str(row[index] if index < width else None).strip()
+                if component_value_str in ("", "0", "0.0"):
+                    continue
+                try:
+                    total_gst += float(component_value_str.replace(",", ""))
+                except (ValueError, TypeError) as e:
+                    logger.warning(
+                        f"Could not parse GST component '{component}' with value '{component_value_str}': {e}"
+                    )
+            mapped_row["GST Amount"] = str(total_gst)
+
+        return mapped_row
+
+
+@dataclass
+class InsurerMappingPlan:
+    """
+    An insurer mapping compiled once for fast CSV projection
+
+    Date targets and the GST formula (e.g. "IGST+CGST+SGST+UTGST+CESS") are
+    resolved when the mappings are loaded. ``bind`` then turns the plan into
+    column-index arrays for one file's header row.
+    """
+
+    mapping: Dict[str, str]
+    # Source headers whose target is a date field
+    date_sources: frozenset
+    # Components of the GST formula mapping, empty if the insurer has none
+    gst_components: Tuple[str, ...]
+
+    def bind(self, headers: List[str]) -> BoundMappingPlan:
+        positions: Dict[str, int] = {}
+        for index, header in enumerate(headers):
+            if header:
+                # Later duplicate columns win, as with csv.DictReader
+                positions[header] = index
+
+        columns = [
+            (index, self.mapping.get(header, header), header in self.date_sources)
+            for header, index in positions.items()
+        ]
+        gst_columns = [
+            (component, positions[component])
+            for component in self.gst_components
+            if component in positions
+        ]
+        return BoundMappingPlan(
+            columns=columns,
+            gst_columns=gst_columns,
+            computes_gst=bool(self.gst_components),
+            date_formats={},
+        )
+
+
+def compile_mapping_plan(mapping: Dict[str, str]) -> InsurerMappingPlan:
+    """Compile an insurer header mapping into an InsurerMappingPlan"""
+    gst_components: Tuple[str, ...] = ()
+    for original_mapping, master_header in mapping.items():
+        if master_header == "GST Amount" and "+" in original_mapping:
+            gst_components = tuple(
+                component.strip() for component in original_mapping.split("+")
+            )
+            break
+
+    return InsurerMappingPlan(
+        mapping=mapping,
+        date_sources=frozenset(
+            source
+            for source, target in mapping.items()
+            if target in MAPPED_DATE_FIELDS
+        ),
+        gst_components=gst_components,
+    )
+
+
+# Compiled plans for INSURER_MAPPINGS, rebuilt whenever the mappings load
+INSURER_MAPPING_PLANS: Dict[str, InsurerMappingPlan] = {}
+
+
+def _compile_mapping_plans() -> None:
+    global INSURER_MAPPING_PLANS
+
+    INSURER_MAPPING_PLANS = {
+        insurer_name: compile_mapping_plan(mapping)
+        for insurer_name, mapping in INSURER_MAPPINGS.items()
+    }
+
+
+def get_mapping_plan(insurer_mapping: Dict[str, str]) -> InsurerMappingPlan:
+    """Return the compiled plan of a loaded mapping (compiling ad-hoc mappings)"""
+    for plan in INSURER_MAPPING_PLANS.values():
+        if plan.mapping is insurer_mapping:
+            return plan
+    return compile_mapping_plan(insurer_mapping)
+
 
 async def load_insurer_mappings() -> None:
     """Load insurer mappings from configuration CSV"""
@@ -589,6 +938,7 @@ def _load_mappings_from_csv() -> None:
                 if mapping:
                     INSURER_MAPPINGS[insurer_name] = mapping
 
+        _compile_mapping_plans()
         logger.info(f"Loaded {len(INSURER_MAPPINGS)} insurer mappings from CSV")
 
     except Exception as e:
@@ -633,6 +983,7 @@ def _load_fallback_mappings() -> None:
         },
     }
 
+    _compile_mapping_plans()
     logger.info(f"Loaded {len(INSURER_MAPPINGS)} fallback insurer mappings")
 
 
@@ -646,214 +997,305 @@ def get_insurer_mapping(insurer_name: str) -> Optional[Dict[str, str]]:
     return INSURER_MAPPINGS.get(insurer_name)
 
 
-def parse_csv_with_mapping(
-    csv_content: str, insurer_mapping: Dict[str, str]
-) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
-    """
-    Parse CSV content and apply insurer-specific header mapping
+# =============================================================================
+# STREAMING STATEMENT INGESTION
+# =============================================================================
 
-    Returns:
-        - List of mapped records
-        - List of original headers
-        - List of unmapped headers
-    """
-    try:
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-        original_headers = csv_reader.fieldnames or []
+# Bytes read from an uploaded statement at a time
+STATEMENT_CHUNK_SIZE = 1024 * 1024
 
-        # Clean headers by removing BOM and other unwanted characters
-        cleaned_headers = []
-        for header in original_headers:
-            # Remove BOM (\ufeff) and other invisible characters
-            cleaned_header = header.replace("\ufeff", "").replace("\ufffe", "").strip()
-            cleaned_headers.append(cleaned_header)
-
-        # Update the CSV reader with cleaned headers
-        csv_reader.fieldnames = cleaned_headers
-
-        # Debug: Log the mapping and headers
-        logger.info(f"Original CSV headers: {original_headers}")
-        logger.info(f"Cleaned CSV headers: {cleaned_headers}")
-        logger.info(f"Insurer mapping: {insurer_mapping}")
+# File types accepted for insurer statements
+STATEMENT_FILE_EXTENSIONS = (".csv", ".xlsx")
 
-        # Create reverse mapping for headers not in mapping
-        unmapped_headers = [h for h in cleaned_headers if h not in insurer_mapping]
-
-        mapped_records = []
-        for row_data in csv_reader:
-            # Clean the row data keys to remove BOM
-            row = {}
-            for key, value in row_data.items():
-                if key:  # Skip None keys
-                    cleaned_key = (
-                        key.replace("\ufeff", "").replace("\ufffe", "").strip()
-                    )
-                    row[cleaned_key] = value
-
-            mapped_row = {}
-
-            # Debug: Log the first row to see what fields are available
-            if len(mapped_records) == 0:
-                logger.info(f"First row data (cleaned keys): {dict(row)}")
-
-            # Apply mapping to known headers
-            for original_header, value in row.items():
-                if original_header in insurer_mapping:
-                    mapped_header = insurer_mapping[original_header]
-
-                    # Apply date parsing for date fields
-                    if mapped_header in [
-                        "Policy Start Date",
-                        "Policy End Date",
-                        "Booking Date(Click to select Date)",
-                    ]:
-                        value = parse_date_field(value)
-
-                    mapped_row[mapped_header] = value
-                    # Debug policy number mapping
-                    if mapped_header == "Policy Number":
-                        logger.info(
-                            f"Policy Number mapped: '{original_header}' = '{value}' -> '{mapped_header}'"
-                        )
-                else:
-                    # Keep unmapped headers as-is
-                    mapped_row[original_header] = value
-
-            # Handle special GST calculation mappings for Go Digit and other insurers
-            # Check if any mapping contains formula-like expressions for GST
-            for original_mapping, master_header in insurer_mapping.items():
-                if master_header == "GST Amount" and "+" in original_mapping:
-                    # This is a formula mapping like "IGST+CGST+SGST+UTGST+CESS"
-                    gst_components = [
-                        comp.strip() for comp in original_mapping.split("+")
-                    ]
-                    total_gst = 0.0
-                    found_components = []
-
-                    # Find the policy number field for this insurer
-                    policy_number_field = None
-                    for orig_field, mapped_field in insurer_mapping.items():
-                        if mapped_field == "Policy number":
-                            policy_number_field = orig_field
-                            break
+# Encodings tried, in order, for CSV statements
+STATEMENT_ENCODINGS = ["utf-8", "utf-8-sig", "windows-1252", "iso-8859-1", "cp1252"]
 
-                    policy_value = (
-                        row.get(policy_number_field, "Unknown")
-                        if policy_number_field
-                        else "Unknown"
-                    )
 
-                    logger.info(
-                        f"Calculating GST from components: {gst_components} for row with policy: {policy_value}"
-                    )
+def _iter_chunks(fileobj: BinaryIO) -> Iterator[bytes]:
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(STATEMENT_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
 
-                    for component in gst_components:
-                        if component in row:
-                            component_value_str = str(row[component]).strip()
-                            if (
-                                component_value_str
-                                and component_value_str != "0"
-                                and component_value_str != "0.0"
-                            ):
-                                try:
-                                    component_value = float(
-                                        component_value_str.replace(",", "")
-                                    )
-                                    total_gst += component_value
-                                    found_components.append(
-                                        f"{component}={component_value}"
-                                    )
-                                    logger.debug(
-                                        f"GST component '{component}': {component_value}"
-                                    )
-                                except (ValueError, TypeError) as e:
-                                    logger.warning(
-                                        f"Could not parse GST component '{component}' with value '{row[component]}': {e}"
-                                    )
-                            else:
-                                logger.debug(
-                                    f"GST component '{component}' is zero or empty: '{component_value_str}'"
-                                )
-                        else:
-                            logger.debug(
-                                f"GST component '{component}' not found in row"
-                            )
 
-                    mapped_row["GST Amount"] = str(total_gst)
-                    logger.info(
-                        f"Calculated total GST Amount: {total_gst} from components: {found_components} for policy: {policy_value}"
-                    )
-                    break
+def statement_is_blank(fileobj: BinaryIO) -> bool:
+    """True if the file holds nothing but whitespace"""
+    return not any(chunk.strip() for chunk in _iter_chunks(fileobj))
 
-            mapped_records.append(mapped_row)
 
-        return mapped_records, cleaned_headers, unmapped_headers
+def detect_statement_encoding(fileobj: BinaryIO) -> Optional[str]:
+    """Return the first encoding that decodes the whole file, checked chunk by chunk"""
+    for encoding in STATEMENT_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            for chunk in _iter_chunks(fileobj):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return None
 
-    except Exception as e:
-        logger.error(f"Error parsing CSV with mapping: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to parse CSV: {str(e)}",
-        )
 
+def iter_csv_rows(fileobj: BinaryIO, encoding: str) -> Iterator[List[str]]:
+    """Yield CSV rows, decoding the file incrementally"""
+    fileobj.seek(0)
+    text = io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        # Leave the upload's file open for its owner
+        text.detach()
 
-def preview_csv_with_mapping(
-    csv_content: str, insurer_name: str, preview_rows: int = 5
-) -> CSVPreviewResponse:
-    """Generate preview of CSV with applied insurer mapping"""
 
-    insurer_mapping = get_insurer_mapping(insurer_name)
-    if not insurer_mapping:
+def _xlsx_cell_to_text(value: Any) -> str:
+    """Render an XLSX cell the way it would appear in a CSV export"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, datetime):
+        if value.hour or value.minute:
+            return value.strftime("%d/%m/%Y %H:%M")
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, date):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores every number as a float; keep policy numbers integral
+        return str(int(value))
+    return str(value)
+
+
+def iter_xlsx_rows(fileobj: BinaryIO) -> Iterator[List[str]]:
+    """Yield the rows of the workbook's active sheet with a read-only streaming reader"""
+    from openpyxl import load_workbook
+
+    fileobj.seek(0)
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            cells = [_xlsx_cell_to_text(value) for value in row]
+            # Fully empty rows are skipped like blank CSV lines
+            if any(cells):
+                yield cells
+    finally:
+        workbook.close()
+
+
+def open_statement_rows(fileobj: BinaryIO, filename: str) -> Iterator[List[str]]:
+    """
+    Open an uploaded CSV or XLSX statement as a lazy row iterator
+
+    Args:
+        fileobj: Seekable binary file (the upload's spooled temp file)
+        filename: Original file name, used to pick the reader
+
+    Returns:
+        Iterator over rows (header row first)
+
+    Raises:
+        HTTPException: 400 if the file is empty or cannot be decoded
+    """
+    if filename.lower().endswith(".xlsx"):
+        return iter_xlsx_rows(fileobj)
+
+    if statement_is_blank(fileobj):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file is empty"
+        )
+
+    encoding = detect_statement_encoding(fileobj)
+    if encoding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No mapping found for insurer: {insurer_name}",
+            detail="Unable to decode CSV file. Please ensure the file is in UTF-8, Windows-1252, or ISO-8859-1 encoding.",
         )
+    logger.info(f"Successfully decoded file with {encoding} encoding")
+    return iter_csv_rows(fileobj, encoding)
 
-    mapped_records, original_headers, unmapped_headers = parse_csv_with_mapping(
-        csv_content, insurer_mapping
-    )
 
-    # Get mapped headers
-    mapped_headers = []
-    for header in original_headers:
-        if header in insurer_mapping:
-            mapped_headers.append(insurer_mapping[header])
-        else:
-            mapped_headers.append(header)
+def statement_fingerprint(
+    fileobj: BinaryIO,
+    insurer_name: str,
+    insurer_mapping: Dict[str, str],
+    targets: List[Tuple[int, int]],
+) -> str:
+    """
+    Fingerprint of an upload: file content, insurer mapping and target quarters
 
-    # Get preview data
-    preview_data = mapped_records[:preview_rows]
+    Two uploads with the same fingerprint reconcile to the same sheet changes.
 
-    return CSVPreviewResponse(
-        insurer_name=insurer_name,
-        original_headers=original_headers,
-        mapped_headers=mapped_headers,
-        preview_data=preview_data,
-        unmapped_headers=unmapped_headers,
-        total_rows=len(mapped_records),
+    Args:
+        fileobj: Seekable binary file (the upload's spooled temp file)
+        insurer_name: Insurer the statement belongs to
+        insurer_mapping: Header mapping the statement is read with
+        targets: (quarter, year) pairs the statement is reconciled into
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for chunk in _iter_chunks(fileobj):
+        digest.update(chunk)
+    context = json.dumps(
+        [insurer_name, insurer_mapping, sorted(targets)], sort_keys=True, default=str
     )
+    digest.update(context.encode("utf-8"))
+    fileobj.seek(0)
+    return digest.hexdigest()
 
 
-async def process_universal_record_csv(
-    db: AsyncSession,
-    csv_content: str,
-    insurer_name: str,
-    admin_user_id: Union[str, uuid.UUID],
-) -> UniversalRecordProcessingReport:
+class MappedRecordStream:
     """
-    Process universal record CSV with insurer-specific mapping
+    Statement rows mapped to master sheet headers, produced one at a time
 
-    This function:
-    1. Applies insurer mapping to CSV data
-    2. Gets existing records from Google master sheet for the insurer
-    3. Compares and updates/adds records in Google master sheet only
-    4. Sets MATCH to TRUE for all updated/added records (requires BOTH Policy Number AND Child ID match)
+    Only the header row and the sample used to infer date formats are held in
+    memory. Iterate once.
     """
 
-    start_time = datetime.now()
-    stats = UniversalRecordProcessingStats()
-    change_details = []
-
+    def __init__(self, rows: Iterable[List[str]], insurer_mapping: Dict[str, str]):
+        self._rows = iter(rows)
+        self.original_headers = next(self._rows, [])
+        # Clean headers by removing BOM and other unwanted characters
+        self.cleaned_headers = [
+            clean_csv_header(header) for header in self.original_headers
+        ]
+        self.unmapped_headers = [
+            h for h in self.cleaned_headers if h not in insurer_mapping
+        ]
+        self.records_read = 0
+        self._buffered = 0
+        self._plan = get_mapping_plan(insurer_mapping).bind(self.cleaned_headers)
+
+        logger.info(f"Original CSV headers: {self.original_headers}")
+        logger.info(f"Cleaned CSV headers: {self.cleaned_headers}")
+        logger.info(f"Insurer mapping: {insurer_mapping}")
+        if self._plan.computes_gst:
+            logger.info(
+                f"Calculating GST Amount from components: {[component for component, _ in self._plan.gst_columns]}"
+            )
+
+    def mapped_headers(self, insurer_mapping: Dict[str, str]) -> List[str]:
+        return [insurer_mapping.get(header, header) for header in self.cleaned_headers]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Blank lines are skipped, as csv.DictReader does
+        rows = (row for row in self._rows if row)
+        sample = list(islice(rows, DATE_FORMAT_SAMPLE_SIZE))
+        self._buffered = len(sample)
+        self._plan.infer_date_formats(sample)
+
+        for row in chain(sample, rows):
+            self.records_read += 1
+            yield self._plan.project(row)
+
+    def count_remaining_rows(self) -> int:
+        """Count the rows not yet read, without mapping them"""
+        unread_sample = max(self._buffered - self.records_read, 0)
+        return unread_sample + sum(1 for row in self._rows if row)
+
+
+def parse_csv_with_mapping(
+    csv_content: str, insurer_mapping: Dict[str, str]
+) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Parse CSV content and apply insurer-specific header mapping
+
+    The insurer's compiled plan is bound to the header row once, and each row
+    is then projected by column index.
+
+    Returns:
+        - List of mapped records
+        - List of original headers
+        - List of unmapped headers
+    """
+    try:
+        stream = MappedRecordStream(
+            csv.reader(io.StringIO(csv_content)), insurer_mapping
+        )
+        mapped_records = list(stream)
+
+        if mapped_records:
+            logger.info(f"First mapped row: {mapped_records[0]}")
+
+        return mapped_records, stream.cleaned_headers, stream.unmapped_headers
+
+    except Exception as e:
+        logger.error(f"Error parsing CSV with mapping: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to parse CSV: {str(e)}",
+        )
+
+
+def preview_statement_with_mapping(
+    rows: Iterable[List[str]], insurer_name: str, preview_rows: int = 5
+) -> CSVPreviewResponse:
+    """
+    Generate preview of a statement with applied insurer mapping
+
+    Only the first ``preview_rows`` rows are mapped; the rest are just counted.
+    """
+
+    insurer_mapping = get_insurer_mapping(insurer_name)
+    if not insurer_mapping:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No mapping found for insurer: {insurer_name}",
+        )
+
+    try:
+        stream = MappedRecordStream(rows, insurer_mapping)
+        preview_data = list(islice(stream, max(preview_rows, 0)))
+        total_rows = stream.records_read + stream.count_remaining_rows()
+    except Exception as e:
+        logger.error(f"Error parsing CSV with mapping: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to parse CSV: {str(e)}",
+        )
+
+    return CSVPreviewResponse(
+        insurer_name=insurer_name,
+        original_headers=stream.cleaned_headers,
+        mapped_headers=stream.mapped_headers(insurer_mapping),
+        preview_data=preview_data,
+        unmapped_headers=stream.unmapped_headers,
+        total_rows=total_rows,
+    )
+
+
+def preview_csv_with_mapping(
+    csv_content: str, insurer_name: str, preview_rows: int = 5
+) -> CSVPreviewResponse:
+    """Generate preview of CSV with applied insurer mapping"""
+    return preview_statement_with_mapping(
+        csv.reader(io.StringIO(csv_content)), insurer_name, preview_rows
+    )
+
+
+async def process_universal_record_csv(
+    db: AsyncSession,
+    csv_content: str,
+    insurer_name: str,
+    admin_user_id: Union[str, uuid.UUID],
+) -> UniversalRecordProcessingReport:
+    """
+    Process universal record CSV with insurer-specific mapping
+
+    This function:
+    1. Applies insurer mapping to CSV data
+    2. Gets existing records from Google master sheet for the insurer
+    3. Compares and updates/adds records in Google master sheet only
+    4. Sets MATCH to TRUE for all updated/added records (requires BOTH Policy Number AND Child ID match)
+    """
+
+    start_time = datetime.now()
+    stats = UniversalRecordProcessingStats()
+    change_details = []
+
     try:
         # Get insurer mapping
         insurer_mapping = get_insurer_mapping(insurer_name)
@@ -1301,7 +1743,7 @@ async def process_universal_record_csv(
                 ),
                 # Set field variation counts using the calculated variations
                 **{
-                    f"{field}_variations": count
+                    variation_column(field): count
                     for field, count in field_variations.items()
                 },
             )
@@ -1329,9 +1771,421 @@ async def process_universal_record_csv(
         )
 
 
+def prepare_universal_record_statement(
+    statement_rows: Iterable[List[str]], insurer_mapping: Dict[str, str]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Map and deduplicate a statement in one pass
+
+    Args:
+        statement_rows: Row iterator from ``open_statement_rows`` (header row first)
+        insurer_mapping: Insurer header mapping
+
+    Returns:
+        - Deduplicated mapped records
+        - File info for the processing report (headers, record and duplicate counts)
+    """
+    stream = MappedRecordStream(statement_rows, insurer_mapping)
+    deduplicated_records, duplicate_counts, total_read = fold_records_by_policy_number(
+        stream
+    )
+
+    logger.info(
+        f"Original records: {total_read}, After deduplication: {len(deduplicated_records)}"
+    )
+    if duplicate_counts:
+        logger.info(f"Found duplicates: {duplicate_counts}")
+
+    file_info = {
+        "original_headers": stream.cleaned_headers,
+        "unmapped_headers": stream.unmapped_headers,
+        "total_records": total_read,
+        "unique_records_after_deduplication": len(deduplicated_records),
+        "duplicate_counts": duplicate_counts,
+    }
+    return deduplicated_records, file_info
+
+
+def statement_row_hash(record: Dict[str, Any], insurer_name: str) -> bytes:
+    """16-byte digest of a mapped statement record as written to the sheet"""
+    payload = json.dumps([insurer_name, record], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+def new_quarter_checkpoint(quarter: int, year: int) -> Dict[str, Any]:
+    """Empty result of ``reconcile_quarter_sheet`` for one quarter sheet"""
+    return {
+        "quarter": f"Q{quarter}-{year}",
+        "processed": 0,
+        "matched": 0,
+        "updated": 0,
+        "added": 0,
+        "skipped": 0,
+        "errors": 0,
+        "field_changes": {},
+        "error_details": [],
+        "change_details": [],
+    }
+
+
+async def reconcile_quarter_sheet(
+    quarter: int,
+    year: int,
+    deduplicated_records: List[Dict[str, Any]],
+    insurer_name: str,
+    on_planned: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Reconcile deduplicated statement records against one quarterly sheet
+
+    Updates and additions are planned against one sheet snapshot and written
+    afterwards in one batched commit for the whole quarter. Re-running a
+    quarter is safe: rows added by an interrupted run are matched and updated.
+
+    Args:
+        quarter: Target quarter (1-4)
+        year: Target year
+        deduplicated_records: Mapped records, one per policy number
+        insurer_name: Insurer the statement belongs to
+        on_planned: Awaited with the planned counts before the sheet is written
+
+    Returns:
+        JSON-serializable quarter checkpoint with counters, field changes,
+        error details and change details
+    """
+    from utils.quarterly_sheets_manager import quarterly_manager
+
+    quarter_name = f"Q{quarter}-{year}"
+    logger.info(f"Processing records for quarter sheet: {quarter_name}")
+
+    checkpoint = new_quarter_checkpoint(quarter, year)
+
+    # Get all records from the specific quarterly sheet. A failed read is
+    # raised: treating the sheet as empty would append every record again.
+    try:
+        snapshot = await quarterly_manager.aget_quarter_sheet_snapshot(quarter, year)
+        if snapshot is None:
+            logger.warning(f"Quarter sheet {quarter_name} does not exist")
+            quarterly_records = []
+        else:
+            quarterly_records = quarterly_manager._records_from_values(
+                snapshot.values, quarter_name
+            )
+        logger.info(
+            f"Retrieved {len(quarterly_records)} existing records from {quarter_name}"
+        )
+
+        # Log some sample policy numbers for debugging
+        if quarterly_records:
+            sample_policies = []
+            for qr in quarterly_records[:5]:  # Show first 5 policy numbers
+                policy_num = qr.get("Policy number", "N/A")
+                normalized = normalize_policy_number(policy_num)
+                sample_policies.append(f"'{policy_num}' -> '{normalized}'")
+            logger.info(
+                f"Sample existing policy numbers in {quarter_name}: {sample_policies}"
+            )
+
+    except Exception as e:
+        logger.error(f"Failed to get records from {quarter_name}: {str(e)}")
+        raise
+
+    # Index existing rows once by normalized policy number; the first
+    # row wins for duplicates, as the sheet lookup does
+    existing_by_policy: Dict[str, Dict[str, Any]] = {}
+    for qr in quarterly_records:
+        existing_normalized = normalize_policy_number(
+            qr.get("Policy number", "").strip()
+        )
+        if existing_normalized:
+            existing_by_policy.setdefault(existing_normalized, qr)
+
+    # Match every record first, then compare all matched pairs column by column
+    planned: List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+
+    for i, record in enumerate(deduplicated_records):
+        try:
+            checkpoint["processed"] += 1
+
+            policy_number = record.get("Policy number", "").strip()
+            # Remove any leading/trailing quotes from policy number
+            policy_number = policy_number.strip("'\"")
+
+            if not policy_number:
+                logger.warning(f"Skipping record {i+1}: No policy number found")
+                checkpoint["skipped"] += 1
+                continue
+
+            logger.debug(
+                f"Processing record {i+1}/{len(deduplicated_records)}: Policy '{policy_number}' for {quarter_name}"
+            )
+
+            # Transform record to quarterly sheet headers format
+            quarterly_record = transform_to_quarterly_headers(record, insurer_name)
+
+            # Find existing record in quarterly sheet by policy number (normalized comparison)
+            normalized_policy_number = normalize_policy_number(policy_number)
+            existing_record = existing_by_policy.get(normalized_policy_number)
+
+            if existing_record:
+                checkpoint["matched"] += 1
+                logger.debug(
+                    f"Found existing record for policy '{policy_number}' (normalized: '{normalized_policy_number}') matching existing '{existing_record.get('Policy number', '')}'"
+                )
+            else:
+                logger.debug(
+                    f"No existing record found for policy '{policy_number}' (normalized: '{normalized_policy_number}') in {quarter_name}. Will add as new record."
+                )
+            planned.append((policy_number, quarterly_record, existing_record))
+
+        except Exception as e:
+            checkpoint["errors"] += 1
+            checkpoint["error_details"].append(
+                f"Error processing {policy_number} for {quarter_name}: {str(e)}"
+            )
+            logger.error(
+                f"Error processing record {policy_number} for {quarter_name}: {str(e)}"
+            )
+
+    matched = [entry for entry in planned if entry[2] is not None]
+    comparison = compare_record_batch(
+        [existing_record for _, _, existing_record in matched],
+        [quarterly_record for _, quarterly_record, _ in matched],
+    )
+    compared = iter(zip(comparison.changed_fields, comparison.field_changes))
+
+    batch_entries = []
+    planned_changes = []
+    for policy_number, quarterly_record, existing_record in planned:
+        if existing_record is not None:
+            # Matched records are always updated; changed fields are the variations
+            changed_fields, field_changes = next(compared)
+            batch_entries.append(
+                {
+                    "policy_number": policy_number,
+                    "record_data": quarterly_record,
+                    "operation": "UPDATE",
+                    # Only changed cells are written; empty upload
+                    # values keep the sheet's data
+                    "fields": changed_fields,
+                }
+            )
+            planned_changes.append(
+                (policy_number, quarterly_record, changed_fields, field_changes)
+            )
+        else:
+            batch_entries.append(
+                {
+                    "policy_number": policy_number,
+                    "record_data": quarterly_record,
+                    "operation": "CREATE",
+                }
+            )
+            planned_changes.append((policy_number, quarterly_record, None, None))
+
+    if on_planned is not None:
+        await on_planned(
+            {
+                "processed": checkpoint["processed"],
+                "matched": checkpoint["matched"],
+                "errors": checkpoint["errors"],
+            }
+        )
+
+    # Commit the quarter: chunked batchUpdate writes of data rows plus
+    # template formulas for appended rows. A failed request is raised, so the
+    # upload job retries the quarter from its checkpoint instead of recording
+    # the quarter as done with errors; the retry matches rows already written.
+    if batch_entries:
+        logger.info(
+            f"Writing {len(batch_entries)} changed records to {quarter_name} in batches"
+        )
+        batch_results = await run_in_threadpool(
+            quarterly_manager.sync_records_batch,
+            quarter,
+            year,
+            batch_entries,
+        )
+    else:
+        batch_results = []
+
+    for (
+        policy_number,
+        quarterly_record,
+        changed_fields,
+        field_changes,
+    ), result in zip(planned_changes, batch_results):
+        is_update = changed_fields is not None
+        if not result.get("success"):
+            checkpoint["errors"] += 1
+            action = "update" if is_update else "add"
+            preposition = "in" if is_update else "to"
+            error_msg = f"Failed to {action} {policy_number} {preposition} {quarter_name}: {result.get('error', 'Unknown error')}"
+            checkpoint["error_details"].append(error_msg)
+            logger.error(error_msg)
+        elif is_update:
+            checkpoint["updated"] += 1
+
+            # Track field changes
+            for field in changed_fields:
+                checkpoint["field_changes"][field] = (
+                    checkpoint["field_changes"].get(field, 0) + 1
+                )
+
+            detail = RecordChangeDetail(
+                policy_number=policy_number,
+                record_type="quarterly_sheet",
+                action="updated",
+                changed_fields={
+                    field: f"Updated: {old_val} -> {new_val}"
+                    for field, (old_val, new_val) in field_changes.items()
+                },
+                previous_values={
+                    field: old_val for field, (old_val, new_val) in field_changes.items()
+                },
+                new_values={
+                    field: new_val for field, (old_val, new_val) in field_changes.items()
+                },
+            )
+            checkpoint["change_details"].append(detail.model_dump(mode="json"))
+        else:
+            checkpoint["added"] += 1
+
+            detail = RecordChangeDetail(
+                policy_number=policy_number,
+                record_type="quarterly_sheet",
+                action="added",
+                changed_fields={},  # Empty - new records don't count as variations
+                previous_values={},
+                new_values=quarterly_record,
+            )
+            checkpoint["change_details"].append(detail.model_dump(mode="json"))
+
+    logger.info(
+        f"Completed {quarter_name}: {checkpoint['updated']} updates, {checkpoint['added']} additions, {checkpoint['errors']} errors"
+    )
+    return checkpoint
+
+
+def build_quarterly_processing_report(
+    file_info: Dict[str, Any],
+    checkpoints: List[Dict[str, Any]],
+    insurer_name: str,
+    admin_user_id: Union[str, uuid.UUID],
+    quarter_list: List[int],
+    year_list: List[int],
+    processing_time_seconds: float,
+) -> UniversalRecordProcessingReport:
+    """
+    Combine per-quarter checkpoints into the upload's processing report
+
+    Args:
+        file_info: File info from ``prepare_universal_record_statement``
+        checkpoints: Results of ``reconcile_quarter_sheet``, in quarter order
+        insurer_name: Insurer the statement belongs to
+        admin_user_id: Admin who uploaded the statement
+        quarter_list: Target quarters
+        year_list: Years matching ``quarter_list``
+        processing_time_seconds: Wall-clock processing time
+
+    Returns:
+        UniversalRecordProcessingReport
+    """
+    stats = UniversalRecordProcessingStats()
+    change_details = []
+    quarter_processing_details = []
+
+    for checkpoint in checkpoints:
+        stats.total_records_processed += checkpoint["processed"]
+        stats.total_records_updated += checkpoint["updated"]
+        stats.total_records_added += checkpoint["added"]
+        stats.total_records_skipped += checkpoint["skipped"]
+        stats.total_errors += checkpoint["errors"]
+        for field, count in checkpoint["field_changes"].items():
+            stats.field_changes[field] = stats.field_changes.get(field, 0) + count
+        stats.error_details.extend(checkpoint["error_details"])
+        change_details.extend(
+            RecordChangeDetail(**detail) for detail in checkpoint["change_details"]
+        )
+        quarter_processing_details.append(
+            {
+                "quarter": checkpoint["quarter"],
+                "updates": checkpoint["updated"],
+                "additions": checkpoint["added"],
+                "errors": checkpoint["errors"],
+            }
+        )
+
+    stats.processing_time_seconds = processing_time_seconds
+
+    return UniversalRecordProcessingReport(
+        stats=stats,
+        change_details=change_details,
+        insurer_name=insurer_name,
+        file_info={
+            **file_info,
+            "target_quarters": [f"Q{q}-{y}" for q, y in zip(quarter_list, year_list)],
+            "quarter_processing_details": quarter_processing_details,
+        },
+        processed_by_user_id=str(admin_user_id),  # Convert UUID to string
+    )
+
+
+def build_reconciliation_report_row(
+    report: UniversalRecordProcessingReport,
+    insurer_mapping: Dict[str, str],
+    admin_user_id: Union[str, uuid.UUID],
+) -> ReconciliationReport:
+    """
+    Build the ReconciliationReport row persisted for a processed upload
+
+    The caller adds it to its session and commits.
+    """
+    stats = report.stats
+    insurer_name = report.insurer_name
+
+    # Calculate variance and coverage percentages
+    variance_percentage = (
+        (stats.total_errors / stats.total_records_processed * 100)
+        if stats.total_records_processed > 0
+        else 0.0
+    )
+
+    logger.info(
+        f"Stats summary - Processed: {stats.total_records_processed}, Updated: {stats.total_records_updated}, Added: {stats.total_records_added}"
+    )
+
+    # Field variations from the per-field change counts of the batch comparison
+    field_variations = calculate_field_variations([], stats.field_changes)
+
+    logger.info(
+        f"Creating quarterly ReconciliationReport with {len(field_variations)} field variations"
+    )
+    logger.info(
+        f"Non-zero variations: {[(k, v) for k, v in field_variations.items() if v > 0]}"
+    )
+
+    db_report = ReconciliationReport(
+        insurer_name=insurer_name,
+        insurer_code=(insurer_mapping.get("insurer_code") if insurer_mapping else None),
+        total_records_processed=stats.total_records_processed,
+        total_records_updated=stats.total_records_updated,
+        new_records_added=stats.total_records_added,  # Map to new field name
+        data_variance_percentage=round(variance_percentage, 2),
+        processed_by=(
+            uuid.UUID(admin_user_id) if isinstance(admin_user_id, str) else admin_user_id
+        ),
+        # Set field variation counts using the calculated variations
+        **{variation_column(field): count for field, count in field_variations.items()},
+    )
+
+    logger.info(f"ReconciliationReport created successfully for insurer: {insurer_name}")
+    return db_report
+
+
 async def process_universal_record_csv_to_quarterly_sheets(
     db: AsyncSession,
-    csv_content: str,
+    statement_rows: Iterable[List[str]],
     insurer_name: str,
     admin_user_id: Union[str, uuid.UUID],
     quarter_list: List[int],
@@ -1340,19 +2194,23 @@ async def process_universal_record_csv_to_quarterly_sheets(
     """
     Process universal record CSV with insurer-specific mapping to target quarterly sheets
 
+    ``statement_rows`` is the lazy row iterator from ``open_statement_rows``
+    (header row first); rows are mapped and deduplicated as they are read.
+    Uploads through the API run the same steps in a background job (see
+    ``upload_jobs``); this function processes a statement inline.
+
     This function:
     1. Applies insurer mapping to CSV data
     2. For each quarter/year combination:
        - Gets existing records from specific quarterly Google Sheet
-       - Compares and updates/adds records in quarterly sheet
+       - Compares records and plans updates/additions against one sheet snapshot
+       - Commits the quarter's changes with a few chunked batchUpdate calls
        - Uses quarterly sheet headers format
        - Sets MATCH to TRUE for all updated/added records
     3. Routes data to quarterly sheets instead of master sheet
     """
 
     start_time = datetime.now()
-    stats = UniversalRecordProcessingStats()
-    change_details = []
 
     try:
         # Get insurer mapping
@@ -1363,14 +2221,14 @@ async def process_universal_record_csv_to_quarterly_sheets(
                 detail=f"No mapping found for insurer: {insurer_name}",
             )
 
-        # Parse CSV with mapping
-        mapped_records, original_headers, unmapped_headers = parse_csv_with_mapping(
-            csv_content, insurer_mapping
+        # Map and deduplicate the statement in one pass, off the event loop
+        deduplicated_records, file_info = await run_in_threadpool(
+            prepare_universal_record_statement, statement_rows, insurer_mapping
         )
 
-        if not mapped_records:
+        if not file_info["total_records"]:
             logger.warning("No valid records found in CSV after mapping")
-            stats.total_records_processed = 0
+            stats = UniversalRecordProcessingStats()
             stats.processing_time_seconds = (
                 datetime.now() - start_time
             ).total_seconds()
@@ -1380,256 +2238,34 @@ async def process_universal_record_csv_to_quarterly_sheets(
                 change_details=[],
                 insurer_name=insurer_name,
                 file_info={
-                    "original_headers": original_headers,
-                    "unmapped_headers": unmapped_headers,
+                    "original_headers": file_info["original_headers"],
+                    "unmapped_headers": file_info["unmapped_headers"],
                     "total_records": 0,
                 },
                 processed_by_user_id=str(admin_user_id),  # Convert UUID to string
             )
 
-        # Deduplicate records within the CSV by policy number
-        deduplicated_records, duplicate_counts = deduplicate_records_by_policy_number(
-            mapped_records
-        )
-        logger.info(
-            f"Original records: {len(mapped_records)}, After deduplication: {len(deduplicated_records)}"
-        )
-        if duplicate_counts:
-            logger.info(f"Found duplicates: {duplicate_counts}")
-
         logger.info(
             f"Processing {len(deduplicated_records)} unique records for insurer {insurer_name} to quarterly sheets"
         )
 
-        # Import quarterly manager
-        from utils.quarterly_sheets_manager import quarterly_manager
-
-        # Process each quarter/year combination
-        total_records_across_quarters = 0
-        total_updates_across_quarters = 0
-        total_additions_across_quarters = 0
-        quarter_processing_details = []
-
+        checkpoints = []
         for quarter, year in zip(quarter_list, year_list):
-            quarter_name = f"Q{quarter}-{year}"
-            logger.info(f"Processing records for quarter sheet: {quarter_name}")
-
-            # Get all records from the specific quarterly sheet
-            try:
-                quarterly_records = (
-                    quarterly_manager.get_all_records_from_quarter_sheet(quarter, year)
+            checkpoints.append(
+                await reconcile_quarter_sheet(
+                    quarter, year, deduplicated_records, insurer_name
                 )
-                logger.info(
-                    f"Retrieved {len(quarterly_records)} existing records from {quarter_name}"
-                )
-
-                # Log some sample policy numbers for debugging
-                if quarterly_records:
-                    sample_policies = []
-                    for qr in quarterly_records[:5]:  # Show first 5 policy numbers
-                        policy_num = qr.get("Policy number", "N/A")
-                        normalized = normalize_policy_number(policy_num)
-                        sample_policies.append(f"'{policy_num}' -> '{normalized}'")
-                    logger.info(
-                        f"Sample existing policy numbers in {quarter_name}: {sample_policies}"
-                    )
-
-            except Exception as e:
-                logger.error(f"Failed to get records from {quarter_name}: {str(e)}")
-                quarterly_records = []
-
-            # Process each unique mapped record for this quarter
-            quarter_updates = 0
-            quarter_additions = 0
-            quarter_errors = 0
-
-            for i, record in enumerate(deduplicated_records):
-                try:
-                    stats.total_records_processed += 1
-                    total_records_across_quarters += 1
-
-                    policy_number = record.get("Policy number", "").strip()
-                    # Remove any leading/trailing quotes from policy number
-                    policy_number = policy_number.strip("'\"")
-
-                    if not policy_number:
-                        logger.warning(f"Skipping record {i+1}: No policy number found")
-                        stats.total_records_skipped += 1
-                        continue
-
-                    logger.info(
-                        f"Processing record {i+1}/{len(deduplicated_records)}: Policy '{policy_number}' for {quarter_name}"
-                    )
-
-                    # Transform record to quarterly sheet headers format
-                    quarterly_record = transform_to_quarterly_headers(
-                        record, insurer_name
-                    )
-
-                    # Find existing record in quarterly sheet by policy number (normalized comparison)
-                    existing_record = None
-                    normalized_policy_number = normalize_policy_number(policy_number)
-
-                    for qr in quarterly_records:
-                        existing_policy = qr.get("Policy number", "").strip()
-                        existing_normalized = normalize_policy_number(existing_policy)
-                        if existing_normalized == normalized_policy_number:
-                            existing_record = qr
-                            logger.info(
-                                f"Found existing record for policy '{policy_number}' (normalized: '{normalized_policy_number}') matching existing '{existing_policy}' (normalized: '{existing_normalized}')"
-                            )
-                            break
-
-                    if not existing_record:
-                        logger.info(
-                            f"No existing record found for policy '{policy_number}' (normalized: '{normalized_policy_number}') in {quarter_name}. Will add as new record."
-                        )
-
-                    if existing_record:
-                        # Compare records using enhanced field comparison
-                        has_changes, changed_fields, field_changes = (
-                            compare_record_fields(existing_record, quarterly_record)
-                        )
-
-                        if has_changes:
-                            logger.info(
-                                f"Policy {policy_number}: Found changes in fields: {changed_fields}"
-                            )
-
-                            # Update existing record in quarterly sheet
-                            update_result = quarterly_manager.update_existing_record_by_policy_number(
-                                quarterly_record, policy_number, quarter, year
-                            )
-
-                            if update_result.get("success"):
-                                stats.total_records_updated += 1
-                                quarter_updates += 1
-                                total_updates_across_quarters += 1
-
-                                # Track field changes
-                                for field in changed_fields:
-                                    stats.field_changes[field] = (
-                                        stats.field_changes.get(field, 0) + 1
-                                    )
-
-                                change_details.append(
-                                    RecordChangeDetail(
-                                        policy_number=policy_number,
-                                        record_type="quarterly_sheet",
-                                        action="updated",
-                                        changed_fields={
-                                            field: f"Updated: {old_val} -> {new_val}"
-                                            for field, (
-                                                old_val,
-                                                new_val,
-                                            ) in field_changes.items()
-                                        },
-                                        previous_values={
-                                            field: old_val
-                                            for field, (
-                                                old_val,
-                                                new_val,
-                                            ) in field_changes.items()
-                                        },
-                                        new_values={
-                                            field: new_val
-                                            for field, (
-                                                old_val,
-                                                new_val,
-                                            ) in field_changes.items()
-                                        },
-                                    )
-                                )
-
-                                logger.info(
-                                    f"Successfully updated policy {policy_number} in {quarter_name}"
-                                )
-                            else:
-                                stats.total_errors += 1
-                                quarter_errors += 1
-                                error_msg = f"Failed to update {policy_number} in {quarter_name}: {update_result.get('error', 'Unknown error')}"
-                                stats.error_details.append(error_msg)
-                                logger.error(error_msg)
-                        else:
-                            # No changes needed - record is identical
-                            logger.info(
-                                f"Policy {policy_number}: No changes detected, skipping update"
-                            )
-                            stats.total_records_skipped += 1
-                    else:
-                        # Add new record to quarterly sheet
-                        addition_result = (
-                            quarterly_manager.route_new_record_to_specific_quarter(
-                                quarterly_record, quarter, year, "CREATE"
-                            )
-                        )
-
-                        if addition_result.get("success"):
-                            stats.total_records_added += 1
-                            quarter_additions += 1
-                            total_additions_across_quarters += 1
-
-                            change_details.append(
-                                RecordChangeDetail(
-                                    policy_number=policy_number,
-                                    record_type="quarterly_sheet",
-                                    action="added",
-                                    changed_fields={},  # Empty - new records don't count as variations
-                                    previous_values={},
-                                    new_values=quarterly_record,
-                                )
-                            )
-                        else:
-                            stats.total_errors += 1
-                            quarter_errors += 1
-                            stats.error_details.append(
-                                f"Failed to add {policy_number} to {quarter_name}: {addition_result.get('error', 'Unknown error')}"
-                            )
-
-                except Exception as e:
-                    stats.total_errors += 1
-                    quarter_errors += 1
-                    stats.error_details.append(
-                        f"Error processing {policy_number} for {quarter_name}: {str(e)}"
-                    )
-                    logger.error(
-                        f"Error processing record {policy_number} for {quarter_name}: {str(e)}"
-                    )
-
-            quarter_processing_details.append(
-                {
-                    "quarter": quarter_name,
-                    "updates": quarter_updates,
-                    "additions": quarter_additions,
-                    "errors": quarter_errors,
-                }
             )
 
-            logger.info(
-                f"Completed {quarter_name}: {quarter_updates} updates, {quarter_additions} additions, {quarter_errors} errors"
-            )
-
-        # Calculate processing time
-        end_time = datetime.now()
-        stats.processing_time_seconds = (end_time - start_time).total_seconds()
-
         # Create reconciliation report
-        report = UniversalRecordProcessingReport(
-            stats=stats,
-            change_details=change_details,
-            insurer_name=insurer_name,
-            file_info={
-                "original_headers": original_headers,
-                "unmapped_headers": unmapped_headers,
-                "total_records": len(mapped_records),
-                "unique_records_after_deduplication": len(deduplicated_records),
-                "duplicate_counts": duplicate_counts,
-                "target_quarters": [
-                    f"Q{q}-{y}" for q, y in zip(quarter_list, year_list)
-                ],
-                "quarter_processing_details": quarter_processing_details,
-            },
-            processed_by_user_id=str(admin_user_id),  # Convert UUID to string
+        report = build_quarterly_processing_report(
+            file_info,
+            checkpoints,
+            insurer_name,
+            admin_user_id,
+            quarter_list,
+            year_list,
+            (datetime.now() - start_time).total_seconds(),
         )
 
         # Save reconciliation report to database for persistence
@@ -1637,54 +2273,7 @@ async def process_universal_record_csv_to_quarterly_sheets(
             logger.info(
                 f"Starting to save reconciliation report for insurer: {insurer_name}"
             )
-
-            # Calculate variance and coverage percentages
-            variance_percentage = (
-                (stats.total_errors / stats.total_records_processed * 100)
-                if stats.total_records_processed > 0
-                else 0.0
-            )
-
-            logger.info(
-                f"Stats summary - Processed: {stats.total_records_processed}, Updated: {stats.total_records_updated}, Added: {stats.total_records_added}"
-            )
-
-            # Calculate field variations based on change details
-            processed_records = [detail.dict() for detail in change_details]
-            field_variations = calculate_field_variations(processed_records)
-
-            logger.info(
-                f"Creating quarterly ReconciliationReport with {len(field_variations)} field variations"
-            )
-            logger.info(
-                f"Non-zero variations: {[(k, v) for k, v in field_variations.items() if v > 0]}"
-            )
-
-            db_report = ReconciliationReport(
-                insurer_name=insurer_name,
-                insurer_code=(
-                    insurer_mapping.get("insurer_code") if insurer_mapping else None
-                ),
-                total_records_processed=stats.total_records_processed,
-                total_records_updated=stats.total_records_updated,
-                new_records_added=stats.total_records_added,  # Map to new field name
-                data_variance_percentage=round(variance_percentage, 2),
-                processed_by=(
-                    uuid.UUID(admin_user_id)
-                    if isinstance(admin_user_id, str)
-                    else admin_user_id
-                ),
-                # Set field variation counts using the calculated variations
-                **{
-                    f"{field}_variations": count
-                    for field, count in field_variations.items()
-                },
-            )
-
-            logger.info(
-                f"ReconciliationReport created successfully for insurer: {insurer_name}"
-            )
-            db.add(db_report)
+            db.add(build_reconciliation_report_row(report, insurer_mapping, admin_user_id))
             await db.commit()
             logger.info(
                 f"Successfully saved quarterly reconciliation report to database for insurer '{insurer_name}'"
@@ -1872,17 +2461,13 @@ def normalize_field_value(field_name: str, value: Any) -> str:
     # Convert to string and strip whitespace
     normalized = str(value).strip()
 
+    kind = field_kind(field_name)
     # For numeric fields, try to normalize format
-    if "premium" in field_name.lower() or "amount" in field_name.lower():
-        try:
-            # Try to parse as float and format consistently
-            float_val = float(normalized.replace(",", ""))
-            return f"{float_val:.2f}"
-        except:
-            pass
+    if kind == FIELD_KIND_NUMBER:
+        return _normalize_number(normalized)
 
     # For date fields - use standardized date parsing
-    if "date" in field_name.lower():
+    if kind == FIELD_KIND_DATE:
         return parse_date_field(normalized)
 
     return normalized
@@ -94,6 +94,52 @@ class UniversalRecordUploadResponse(BaseModel):
     success: bool = True
 
 
+class UploadJobProgress(BaseModel):
+    """Progress counters of a universal record upload job"""
+
+    rows_parsed: int = Field(0, description="Rows read from the statement")
+    unique_records: int = Field(0, description="Records left after deduplication")
+    rows_matched: int = Field(0, description="Records found in the quarterly sheets")
+    rows_updated: int = 0
+    rows_added: int = 0
+    errors: int = 0
+    completed_quarters: List[str] = Field(default_factory=list)
+    current_quarter: Optional[str] = None
+
+
+class UniversalRecordUploadJobResponse(BaseModel):
+    """Response for an enqueued universal record upload"""
+
+    job_id: str
+    status: str
+    message: str
+    success: bool = True
+    reused: bool = Field(
+        False, description="An identical upload was already queued or processed"
+    )
+    report: Optional[UniversalRecordProcessingReport] = Field(
+        None, description="Stored report of the identical upload, once completed"
+    )
+
+
+class UniversalRecordUploadJobStatus(BaseModel):
+    """State, progress and (once finished) report of an upload job"""
+
+    job_id: str
+    status: str = Field(..., description="queued, running, completed or failed")
+    insurer_name: str
+    file_name: Optional[str] = None
+    target_quarters: List[str] = Field(default_factory=list)
+    progress: UploadJobProgress
+    attempts: int = 0
+    last_error: Optional[str] = None
+    reconciliation_report_id: Optional[int] = None
+    report: Optional[UniversalRecordProcessingReport] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class InsurerSelectionRequest(BaseModel):
     """Request to select which insurer mapping to use for CSV processing"""
 
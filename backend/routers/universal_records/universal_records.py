@@ -96,9 +96,20 @@ data quality and consistency across the InsureZeal platform.
 import csv
 import io
 import logging
+import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -106,14 +117,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from config import get_db
 from dependencies.rbac import require_admin_read, require_admin_write
 from routers.auth.auth import get_current_user
-from models import ReconciliationReport
+from models import ReconciliationReport, UniversalRecordUploadJob
 
 from . import helpers
 from .schemas import (
     AvailableInsurersResponse,
     CSVPreviewResponse,
     ComprehensiveReconciliationResponse,
-    UniversalRecordUploadResponse,
+    UniversalRecordProcessingReport,
+    UniversalRecordUploadJobResponse,
+    UniversalRecordUploadJobStatus,
+)
+from .upload_jobs import (
+    STATUS_COMPLETED,
+    enqueue_upload_job,
+    find_upload_job_by_fingerprint,
+    upload_job_reusable,
+    upload_job_runner,
+    upload_job_status,
 )
 
 router = APIRouter(prefix="/universal-records", tags=["Universal Records"])
@@ -155,7 +176,7 @@ async def preview_csv_with_insurer_mapping(
     _rbac_check=Depends(require_admin_read),
 ):
     """
-    Preview CSV file with selected insurer mapping applied
+    Preview CSV or XLSX file with selected insurer mapping applied
 
     **Admin only endpoint**
 
@@ -169,16 +190,16 @@ async def preview_csv_with_insurer_mapping(
     - Total row count in the file
 
     **Parameters:**
-    - `file`: CSV file to preview
+    - `file`: CSV or XLSX file to preview (only the preview rows are mapped)
     - `insurer_name`: Name of insurer mapping to apply
     - `preview_rows`: Number of sample rows to show (default: 5)
     """
 
     try:
-        if not file.filename.lower().endswith(".csv"):
+        if not file.filename.lower().endswith(helpers.STATEMENT_FILE_EXTENSIONS):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Only CSV files are allowed",
+                detail="Only CSV and XLSX files are allowed",
             )
 
         if not insurer_name:
@@ -187,43 +208,15 @@ async def preview_csv_with_insurer_mapping(
                 detail="insurer_name parameter is required",
             )
 
-        file_content = await file.read()
-
-        # Try to decode with multiple encodings
-        csv_content = None
-        encodings_to_try = [
-            "utf-8",
-            "utf-8-sig",
-            "windows-1252",
-            "iso-8859-1",
-            "cp1252",
-        ]
-
-        for encoding in encodings_to_try:
-            try:
-                csv_content = file_content.decode(encoding)
-                logger.info(
-                    f"Successfully decoded preview file with {encoding} encoding"
-                )
-                break
-            except UnicodeDecodeError:
-                continue
-
-        if csv_content is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unable to decode CSV file. Please ensure the file is in UTF-8, Windows-1252, or ISO-8859-1 encoding.",
-            )
-
-        if not csv_content.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file is empty"
-            )
-
-        preview_response = helpers.preview_csv_with_mapping(
-            csv_content=csv_content,
-            insurer_name=insurer_name,
-            preview_rows=preview_rows,
+        # Read the spooled upload lazily; only the preview rows are mapped
+        statement_rows = await run_in_threadpool(
+            helpers.open_statement_rows, file.file, file.filename
+        )
+        preview_response = await run_in_threadpool(
+            helpers.preview_statement_with_mapping,
+            statement_rows,
+            insurer_name,
+            preview_rows,
         )
 
         logger.info(
@@ -242,8 +235,13 @@ async def preview_csv_with_insurer_mapping(
         )
 
 
-@router.post("/upload", response_model=UniversalRecordUploadResponse)
+@router.post(
+    "/upload",
+    response_model=UniversalRecordUploadJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def upload_universal_record(
+    response: Response,
     file: UploadFile = File(..., description="Universal record CSV file"),
     insurer_name: str = None,
     quarters: str = Query(
@@ -254,6 +252,10 @@ async def upload_universal_record(
         ...,
         description="Year corresponding to the quarter (e.g., '2025'). Only a single year is permitted.",
     ),
+    force: bool = Query(
+        False,
+        description="Process the statement even if an identical upload was already reconciled",
+    ),
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     _rbac_check=Depends(require_admin_write),
@@ -263,6 +265,10 @@ async def upload_universal_record(
 
     **Admin only endpoint**
 
+    The statement is mapped and deduplicated during the request; the sheet
+    reconciliation runs as a background job. Poll
+    `/universal-records/upload-jobs/{job_id}` for progress and the final report.
+
     This endpoint processes a universal record CSV file from insurance companies
     using insurer-specific header mappings and routes the data to the specified quarterly sheets.
     The universal record is considered the source of truth and will be used to:
@@ -295,23 +301,24 @@ async def upload_universal_record(
     - All 60+ quarterly sheet headers supported via record-mapper.csv
 
     **Parameters:**
-    - `file`: CSV file containing universal records
+    - `file`: CSV or XLSX file containing universal records (read in chunks)
     - `insurer_name`: Name of insurer mapping to use (required)
     - `quarters`: Comma-separated quarters (1-4) to target. Example: "1,2" for Q1 and Q2
     - `years`: Comma-separated years corresponding to quarters. Example: "2025,2025"
+    - `force`: Queue a new job even for a file identical to an earlier upload
 
     **Returns:**
-    - Detailed report showing what was updated/added in each quarterly sheet
-    - Processing statistics and timing per quarter
-    - List of any errors encountered
-    - Insurer-specific mapping information
+    - Job id of the queued reconciliation (HTTP 202)
+    - For a file identical to an earlier upload (same content, insurer and
+      quarters) that is still queued or running, or completed every quarter
+      without errors: that job, with its stored report once completed (HTTP 200)
     """
 
     try:
-        if not file.filename.lower().endswith(".csv"):
+        if not file.filename.lower().endswith(helpers.STATEMENT_FILE_EXTENSIONS):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Only CSV files are allowed",
+                detail="Only CSV and XLSX files are allowed",
             )
 
         if not insurer_name:
@@ -358,72 +365,86 @@ async def upload_universal_record(
                     detail=f"Year must be between 2020 and 2030, got: {year}",
                 )
 
-        file_content = await file.read()
-
-        # Try to decode with multiple encodings
-        csv_content = None
-        encodings_to_try = [
-            "utf-8",
-            "utf-8-sig",
-            "windows-1252",
-            "iso-8859-1",
-            "cp1252",
-        ]
-
-        for encoding in encodings_to_try:
-            try:
-                csv_content = file_content.decode(encoding)
-                logger.info(f"Successfully decoded file with {encoding} encoding")
-                break
-            except UnicodeDecodeError:
-                continue
-
-        if csv_content is None:
+        # Rows are read from the spooled upload as they are mapped
+        statement_rows = await run_in_threadpool(
+            helpers.open_statement_rows, file.file, file.filename
+        )
+
+        insurer_mapping = helpers.get_insurer_mapping(insurer_name)
+        if not insurer_mapping:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unable to decode CSV file. Please ensure the file is in UTF-8, Windows-1252, or ISO-8859-1 encoding.",
+                detail=f"No mapping found for insurer: {insurer_name}",
             )
 
-        if not csv_content.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file is empty"
+        # An identical upload reuses an earlier job that is still working or finished cleanly
+        fingerprint = await run_in_threadpool(
+            helpers.statement_fingerprint,
+            file.file,
+            insurer_name,
+            insurer_mapping,
+            list(zip(quarter_list, year_list)),
+        )
+        previous_job = (
+            None if force else await find_upload_job_by_fingerprint(db, fingerprint)
+        )
+        if previous_job is not None and upload_job_reusable(previous_job):
+            logger.info(
+                f"Upload of {file.filename} for {insurer_name} matches job {previous_job.id} ({previous_job.status})"
+            )
+            if previous_job.status == STATUS_COMPLETED:
+                response.status_code = status.HTTP_200_OK
+            return UniversalRecordUploadJobResponse(
+                job_id=str(previous_job.id),
+                status=previous_job.status,
+                message=f"Identical statement for {insurer_name} was already uploaded "
+                f"(job {previous_job.id}); the quarterly sheets were not read again.",
+                reused=True,
+                report=(
+                    UniversalRecordProcessingReport(**previous_job.report)
+                    if previous_job.report
+                    else None
+                ),
             )
 
-        admin_user_id = current_user["user_id"]
+        # Map and deduplicate now so bad files fail the request, not the job
+        deduplicated_records, file_info = await run_in_threadpool(
+            helpers.prepare_universal_record_statement,
+            statement_rows,
+            insurer_mapping,
+        )
 
-        # Process universal record with insurer mapping and target quarterly sheets
-        report = await helpers.process_universal_record_csv_to_quarterly_sheets(
-            db=db,
-            csv_content=csv_content,
+        admin_user_id = current_user["user_id"]
+        job = enqueue_upload_job(
+            db,
             insurer_name=insurer_name,
-            admin_user_id=admin_user_id,
+            file_name=file.filename,
             quarter_list=quarter_list,
             year_list=year_list,
+            records=deduplicated_records,
+            file_info=file_info,
+            admin_user_id=admin_user_id,
+            fingerprint=fingerprint,
         )
+        await db.commit()
+        upload_job_runner.notify()
 
-        logger.info(f"Universal record processed by admin {admin_user_id}")
-        logger.info(
-            f"Insurer: {insurer_name}, File: {file.filename}, Size: {len(file_content)} bytes"
+        quarters_text = ", ".join(
+            f"Q{q}-{y}" for q, y in zip(quarter_list, year_list)
         )
         logger.info(
-            f"Target quarters: {[f'Q{q}-{y}' for q, y in zip(quarter_list, year_list)]}"
+            f"Universal record upload job {job.id} queued by admin {admin_user_id}"
         )
         logger.info(
-            f"Processed {report.stats.total_records_processed} records in {report.stats.processing_time_seconds:.2f} seconds"
+            f"Insurer: {insurer_name}, File: {file.filename}, Size: {file.size} bytes"
         )
 
-        quarter_names = [f"Q{q}-{y}" for q, y in zip(quarter_list, year_list)]
-        quarters_text = ", ".join(quarter_names)
-
-        return UniversalRecordUploadResponse(
-            message=f"Universal record processed successfully for {insurer_name} to quarterly sheets: {quarters_text}. "
-            f"Processed {report.stats.total_records_processed} records, "
-            f"updated {report.stats.total_records_updated}, "
-            f"added {report.stats.total_records_added} in "
-            f"{report.stats.processing_time_seconds:.2f} seconds. "
-            f"All records marked with MATCH = TRUE/FALSE based on matching status.",
-            report=report,
-            processing_time_seconds=report.stats.processing_time_seconds,
+        return UniversalRecordUploadJobResponse(
+            job_id=str(job.id),
+            status=job.status,
+            message=f"Universal record for {insurer_name} queued for quarterly sheets: {quarters_text}. "
+            f"Parsed {file_info['total_records']} rows "
+            f"({file_info['unique_records_after_deduplication']} unique policies).",
         )
 
     except HTTPException:
@@ -436,6 +457,54 @@ async def upload_universal_record(
         )
 
 
+@router.get(
+    "/upload-jobs/{job_id}", response_model=UniversalRecordUploadJobStatus
+)
+async def get_upload_job_status(
+    job_id: str,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    _rbac_check=Depends(require_admin_read),
+):
+    """
+    Get progress of a universal record upload job
+
+    **Admin only endpoint**
+
+    **Returns:**
+    - Job status: queued, running, completed or failed
+    - Progress: rows parsed, matched, updated, added and errors, plus the
+      quarters already finished and the one in progress
+    - The processing report and reconciliation report id once completed
+    """
+
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid job id"
+        )
+
+    try:
+        job = await db.get(UniversalRecordUploadJob, job_uuid)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Upload job {job_id} not found",
+            )
+
+        return upload_job_status(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching upload job {job_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch upload job",
+        )
+
+
 @router.get("/template")
 async def download_universal_record_template(
     insurer_name: Optional[str] = None,
@@ -0,0 +1,590 @@
+"""
+Background jobs for universal-record uploads
+
+A large insurer statement used to be reconciled inside the upload request,
+which often ran past the proxy timeout while still writing to the quarterly
+sheets, with no way for the client to tell how far it got.
+
+``/universal-records/upload`` now maps and deduplicates the statement, stores
+the records in a ``UniversalRecordUploadJob`` row and returns the job id.
+``UploadJobRunner`` runs in the background of each API process and processes
+one job at a time:
+
+- every target quarter is reconciled with ``helpers.reconcile_quarter_sheet``
+  and its result is saved as a checkpoint on the job, so a retried or resumed
+  job skips the quarters that already finished
+- running jobs refresh ``locked_at`` while they work; a job whose process
+  crashed or was killed is picked up again once that lease expires
+- when every quarter is done, the processing report is stored on the job and
+  the ``ReconciliationReport`` row is written in the same transaction
+
+Progress counters (rows parsed, matched, updated, added, errors) are updated
+as the job moves through its quarters and are served by
+``/universal-records/upload-jobs/{job_id}``.
+
+Operators often re-upload the same statement or overlapping monthly files:
+
+- each job stores a fingerprint of the file content, insurer mapping and
+  target quarters; an identical re-upload is answered with the existing job
+  (and its stored report) without reading the sheets again
+- a hash of every statement row written to a quarter sheet is kept in
+  ``universal_record_row_hashes``; later jobs skip rows whose hash is
+  unchanged and only reconcile new or modified rows
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from config import UPLOAD_JOB_MAX_ATTEMPTS, UPLOAD_JOB_POLL_SECONDS
+from models import UniversalRecordRowHash, UniversalRecordUploadJob
+from utils.sheets_scheduler import Priority, use_sheets_priority
+
+from . import helpers
+from .schemas import (
+    UniversalRecordProcessingReport,
+    UniversalRecordUploadJobStatus,
+    UploadJobProgress,
+)
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+# Running jobs without a heartbeat for this long (crashed worker) are resumed
+RUNNING_LEASE = timedelta(minutes=10)
+
+# How often a running job refreshes its lease
+HEARTBEAT_SECONDS = 60
+
+# Retry delay cap for failed attempts
+MAX_RETRY_DELAY_SECONDS = 15 * 60
+
+# Policy numbers per row hash lookup, and rows per row hash upsert
+ROW_HASH_LOOKUP_CHUNK = 5000
+ROW_HASH_UPSERT_CHUNK = 1000
+
+
+def quarter_sheet_name(quarter: int, year: int) -> str:
+    return f"Q{quarter}-{year}"
+
+
+def enqueue_upload_job(
+    db: AsyncSession,
+    *,
+    insurer_name: str,
+    file_name: Optional[str],
+    quarter_list: List[int],
+    year_list: List[int],
+    records: List[Dict[str, Any]],
+    file_info: Dict[str, Any],
+    admin_user_id: Union[str, uuid.UUID],
+    fingerprint: Optional[str] = None,
+) -> UniversalRecordUploadJob:
+    """
+    Record a universal-record upload job in the caller's open transaction
+
+    Args:
+        db: Session the caller commits
+        insurer_name: Insurer the statement belongs to
+        file_name: Uploaded file name
+        quarter_list: Target quarters
+        year_list: Years matching ``quarter_list``
+        records: Mapped, deduplicated statement records
+        file_info: File info from ``helpers.prepare_universal_record_statement``
+        admin_user_id: Admin who uploaded the statement
+        fingerprint: ``helpers.statement_fingerprint`` of the upload
+
+    Returns:
+        The queued job (its id is set before the commit)
+    """
+    job = UniversalRecordUploadJob(
+        id=uuid.uuid4(),
+        insurer_name=insurer_name,
+        file_name=file_name,
+        fingerprint=fingerprint,
+        targets=[
+            {"quarter": quarter, "year": year}
+            for quarter, year in zip(quarter_list, year_list)
+        ],
+        records=records,
+        file_info=file_info,
+        status=STATUS_QUEUED,
+        attempts=0,
+        rows_parsed=file_info.get("total_records", 0),
+        checkpoints={},
+        processed_by=(
+            uuid.UUID(admin_user_id) if isinstance(admin_user_id, str) else admin_user_id
+        ),
+    )
+    db.add(job)
+    logger.info(
+        f"Queued universal record upload job {job.id} for {insurer_name}: {len(records)} unique records"
+    )
+    return job
+
+
+async def find_upload_job_by_fingerprint(
+    db: AsyncSession, fingerprint: str
+) -> Optional[UniversalRecordUploadJob]:
+    """Latest queued, running or completed job for an identical upload"""
+    result = await db.execute(
+        select(UniversalRecordUploadJob)
+        .where(
+            UniversalRecordUploadJob.fingerprint == fingerprint,
+            UniversalRecordUploadJob.status != STATUS_FAILED,
+        )
+        .order_by(UniversalRecordUploadJob.created_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+def upload_job_reusable(job: UniversalRecordUploadJob) -> bool:
+    """
+    Whether an identical re-upload can be answered with ``job``
+
+    A queued or running job is still working on the same statement. A
+    completed job is reused only when every target quarter was reconciled
+    without errors; otherwise the statement is processed again.
+    """
+    if job.status != STATUS_COMPLETED:
+        return True
+    if not job.report:
+        return False
+    report = UniversalRecordProcessingReport(**job.report)
+    if report.stats.total_errors:
+        return False
+    checkpoints = job.checkpoints or {}
+    return all(
+        quarter_sheet_name(target["quarter"], target["year"]) in checkpoints
+        for target in job.targets
+    )
+
+
+def upload_job_status(job: UniversalRecordUploadJob) -> UniversalRecordUploadJobStatus:
+    """Build the progress response for a job"""
+    return UniversalRecordUploadJobStatus(
+        job_id=str(job.id),
+        status=job.status,
+        insurer_name=job.insurer_name,
+        file_name=job.file_name,
+        target_quarters=[
+            quarter_sheet_name(target["quarter"], target["year"])
+            for target in job.targets
+        ],
+        progress=UploadJobProgress(
+            rows_parsed=job.rows_parsed,
+            unique_records=job.file_info.get("unique_records_after_deduplication", 0),
+            rows_matched=job.rows_matched,
+            rows_updated=job.rows_updated,
+            rows_added=job.rows_added,
+            errors=job.rows_errored,
+            completed_quarters=list(job.checkpoints or {}),
+            current_quarter=job.current_quarter,
+        ),
+        attempts=job.attempts,
+        last_error=job.last_error,
+        reconciliation_report_id=job.reconciliation_report_id,
+        report=(
+            UniversalRecordProcessingReport(**job.report) if job.report else None
+        ),
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _load_row_hashes(
+    quarter: int, year: int, policy_numbers: List[str]
+) -> Dict[str, bytes]:
+    """Row hashes last written to a quarter sheet, by normalized policy number"""
+    stored: Dict[str, bytes] = {}
+    async with config.AsyncSessionLocal() as session:
+        for start in range(0, len(policy_numbers), ROW_HASH_LOOKUP_CHUNK):
+            result = await session.execute(
+                select(
+                    UniversalRecordRowHash.policy_number,
+                    UniversalRecordRowHash.row_hash,
+                ).where(
+                    UniversalRecordRowHash.year == year,
+                    UniversalRecordRowHash.quarter == quarter,
+                    UniversalRecordRowHash.policy_number.in_(
+                        policy_numbers[start : start + ROW_HASH_LOOKUP_CHUNK]
+                    ),
+                )
+            )
+            stored.update((row.policy_number, row.row_hash) for row in result)
+    return stored
+
+
+async def _save_row_hashes(
+    session: AsyncSession, quarter: int, year: int, row_hashes: Dict[str, bytes]
+) -> None:
+    """Upsert the row hashes written to a quarter sheet in the caller's transaction"""
+    rows = [
+        {
+            "year": year,
+            "quarter": quarter,
+            "policy_number": policy_number,
+            "row_hash": row_hash,
+        }
+        for policy_number, row_hash in row_hashes.items()
+    ]
+    for start in range(0, len(rows), ROW_HASH_UPSERT_CHUNK):
+        statement = insert(UniversalRecordRowHash).values(
+            rows[start : start + ROW_HASH_UPSERT_CHUNK]
+        )
+        await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["year", "quarter", "policy_number"],
+                set_={
+                    "row_hash": statement.excluded.row_hash,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+
+def _progress_from_checkpoints(checkpoints: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    return {
+        "rows_matched": sum(c["matched"] for c in checkpoints.values()),
+        "rows_updated": sum(c["updated"] for c in checkpoints.values()),
+        "rows_added": sum(c["added"] for c in checkpoints.values()),
+        "rows_errored": sum(c["errors"] for c in checkpoints.values()),
+    }
+
+
+class UploadJobRunner:
+    """Background task running queued universal-record upload jobs one at a time."""
+
+    def __init__(
+        self,
+        poll_seconds: float = UPLOAD_JOB_POLL_SECONDS,
+        max_attempts: int = UPLOAD_JOB_MAX_ATTEMPTS,
+    ):
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the runner on the running event loop (idempotent)"""
+        if config.AsyncSessionLocal is None:
+            logger.warning("Upload job runner not started: database not configured")
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Upload job runner started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Upload job runner stopped")
+
+    def notify(self) -> None:
+        """Wake the runner after committing a new job"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        # Reconciliation writes yield Sheets quota to interactive dashboard reads
+        use_sheets_priority(Priority.BULK)
+
+        while True:
+            try:
+                job_id = await self._claim_job()
+                if job_id is not None:
+                    await self.run_job(job_id)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Upload job runner iteration failed: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim_job(self) -> Optional[uuid.UUID]:
+        """Lock the oldest due job (queued, or running with an expired lease)"""
+        async with config.AsyncSessionLocal() as session:
+            async with session.begin():
+                now = func.now()
+                result = await session.execute(
+                    select(UniversalRecordUploadJob)
+                    .where(
+                        or_(
+                            and_(
+                                UniversalRecordUploadJob.status == STATUS_QUEUED,
+                                UniversalRecordUploadJob.available_at <= now,
+                            ),
+                            and_(
+                                UniversalRecordUploadJob.status == STATUS_RUNNING,
+                                UniversalRecordUploadJob.locked_at
+                                < now - RUNNING_LEASE,
+                            ),
+                        )
+                    )
+                    .order_by(UniversalRecordUploadJob.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                job = result.scalars().first()
+                if job is None:
+                    return None
+
+                locked_at = datetime.now(timezone.utc)
+                if job.status == STATUS_RUNNING:
+                    logger.warning(
+                        f"Resuming upload job {job.id} after its lease expired ({len(job.checkpoints)} quarters done)"
+                    )
+                if job.attempts >= self.max_attempts:
+                    # Crashed every time it ran; stop picking it up
+                    job.status = STATUS_FAILED
+                    job.finished_at = locked_at
+                    job.locked_at = None
+                    job.last_error = (
+                        job.last_error
+                        or f"Gave up after {job.attempts} interrupted attempts"
+                    )
+                    logger.error(f"Upload job {job.id} failed permanently")
+                    return None
+
+                job.status = STATUS_RUNNING
+                job.locked_at = locked_at
+                job.attempts += 1
+                if job.started_at is None:
+                    job.started_at = locked_at
+                return job.id
+
+    async def _update(self, job_id: uuid.UUID, **values: Any) -> None:
+        async with config.AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(
+                    update(UniversalRecordUploadJob)
+                    .where(UniversalRecordUploadJob.id == job_id)
+                    .values(**values)
+                )
+
+    async def _heartbeat(self, job_id: uuid.UUID) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            try:
+                await self._update(job_id, locked_at=datetime.now(timezone.utc))
+            except Exception as e:
+                logger.warning(f"Heartbeat for upload job {job_id} failed: {str(e)}")
+
+    async def _changed_records(
+        self, job: UniversalRecordUploadJob, quarter: int, year: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, bytes]]:
+        """
+        Drop records whose row hash matches the last one written to the quarter
+
+        Returns:
+            - Records to reconcile
+            - Row hash of every record with a policy number
+        """
+        keys = [
+            helpers.normalize_policy_number(record.get("Policy number", ""))
+            for record in job.records
+        ]
+        row_hashes = {
+            key: helpers.statement_row_hash(record, job.insurer_name)
+            for key, record in zip(keys, job.records)
+            if key and len(key) <= 100
+        }
+        stored = await _load_row_hashes(quarter, year, list(row_hashes))
+        records = [
+            record
+            for key, record in zip(keys, job.records)
+            if key not in stored or stored[key] != row_hashes[key]
+        ]
+        return records, row_hashes
+
+    async def run_job(self, job_id: uuid.UUID) -> None:
+        """Reconcile the job's remaining quarters, then write its report"""
+        async with config.AsyncSessionLocal() as session:
+            job = await session.get(UniversalRecordUploadJob, job_id)
+        if job is None:
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            checkpoints: Dict[str, Dict[str, Any]] = dict(job.checkpoints or {})
+
+            for target in job.targets:
+                quarter, year = target["quarter"], target["year"]
+                quarter_name = quarter_sheet_name(quarter, year)
+                if quarter_name in checkpoints:
+                    logger.info(f"Upload job {job_id}: {quarter_name} already done")
+                    continue
+                if not job.records:
+                    break
+
+                await self._update(job_id, current_quarter=quarter_name)
+                done = _progress_from_checkpoints(checkpoints)
+
+                async def report_planned(planned: Dict[str, int]) -> None:
+                    await self._update(
+                        job_id,
+                        rows_matched=done["rows_matched"] + planned["matched"],
+                    )
+
+                records, row_hashes = await self._changed_records(job, quarter, year)
+                unchanged = len(job.records) - len(records)
+                if records:
+                    checkpoint = await helpers.reconcile_quarter_sheet(
+                        quarter,
+                        year,
+                        records,
+                        job.insurer_name,
+                        on_planned=report_planned,
+                    )
+                else:
+                    checkpoint = helpers.new_quarter_checkpoint(quarter, year)
+
+                # Rows already reconciled by an earlier upload count as skipped
+                checkpoint["processed"] += unchanged
+                checkpoint["skipped"] += unchanged
+                checkpoint["unchanged"] = unchanged
+                checkpoints[quarter_name] = checkpoint
+                if unchanged:
+                    logger.info(
+                        f"Upload job {job_id}: {unchanged} rows unchanged since the last upload to {quarter_name}"
+                    )
+
+                # Remember the rows written so later uploads can skip them
+                written = {}
+                for detail in checkpoint["change_details"]:
+                    key = helpers.normalize_policy_number(detail["policy_number"])
+                    if key in row_hashes:
+                        written[key] = row_hashes[key]
+
+                # Checkpoint: a resumed job starts after this quarter
+                async with config.AsyncSessionLocal() as session:
+                    async with session.begin():
+                        await _save_row_hashes(session, quarter, year, written)
+                        await session.execute(
+                            update(UniversalRecordUploadJob)
+                            .where(UniversalRecordUploadJob.id == job_id)
+                            .values(
+                                checkpoints=checkpoints,
+                                current_quarter=None,
+                                locked_at=datetime.now(timezone.utc),
+                                **_progress_from_checkpoints(checkpoints),
+                            )
+                        )
+
+            await self._complete(job, checkpoints)
+
+        except Exception as e:
+            await self._fail(job, e)
+        finally:
+            heartbeat.cancel()
+
+    async def _complete(
+        self, job: UniversalRecordUploadJob, checkpoints: Dict[str, Dict[str, Any]]
+    ) -> None:
+        finished_at = datetime.now(timezone.utc)
+        quarter_list = [target["quarter"] for target in job.targets]
+        year_list = [target["year"] for target in job.targets]
+
+        report = helpers.build_quarterly_processing_report(
+            job.file_info,
+            [
+                checkpoints[quarter_sheet_name(q, y)]
+                for q, y in zip(quarter_list, year_list)
+                if quarter_sheet_name(q, y) in checkpoints
+            ],
+            job.insurer_name,
+            job.processed_by,
+            quarter_list,
+            year_list,
+            (finished_at - job.started_at).total_seconds() if job.started_at else 0.0,
+        )
+
+        async with config.AsyncSessionLocal() as session:
+            async with session.begin():
+                reconciliation_report_id = None
+                if job.records:
+                    db_report = helpers.build_reconciliation_report_row(
+                        report,
+                        helpers.get_insurer_mapping(job.insurer_name),
+                        job.processed_by,
+                    )
+                    session.add(db_report)
+                    await session.flush()
+                    reconciliation_report_id = db_report.id
+
+                await session.execute(
+                    update(UniversalRecordUploadJob)
+                    .where(UniversalRecordUploadJob.id == job.id)
+                    .values(
+                        status=STATUS_COMPLETED,
+                        report=report.model_dump(mode="json"),
+                        reconciliation_report_id=reconciliation_report_id,
+                        current_quarter=None,
+                        locked_at=None,
+                        finished_at=finished_at,
+                        last_error=None,
+                    )
+                )
+
+        logger.info(
+            f"Upload job {job.id} completed: {report.stats.total_records_updated} updated, {report.stats.total_records_added} added, {report.stats.total_errors} errors"
+        )
+
+    async def _fail(self, job: UniversalRecordUploadJob, error: Exception) -> None:
+        now = datetime.now(timezone.utc)
+        attempts = job.attempts
+        if attempts >= self.max_attempts:
+            values = {
+                "status": STATUS_FAILED,
+                "finished_at": now,
+                "locked_at": None,
+                "last_error": str(error),
+            }
+            logger.error(
+                f"Upload job {job.id} failed permanently after {attempts} attempts: {str(error)}"
+            )
+        else:
+            delay = min(MAX_RETRY_DELAY_SECONDS, 30 * 2 ** max(attempts - 1, 0))
+            values = {
+                "status": STATUS_QUEUED,
+                "available_at": now + timedelta(seconds=delay),
+                "locked_at": None,
+                "last_error": str(error),
+            }
+            logger.warning(
+                f"Upload job {job.id} failed (attempt {attempts}), will resume in {delay}s: {str(error)}"
+            )
+        try:
+            await self._update(job.id, **values)
+        except Exception as e:
+            # The lease expires and another attempt picks the job up
+            logger.error(f"Could not record failure of upload job {job.id}: {str(e)}")
+
+
+# Global instance started with the application
+upload_job_runner = UploadJobRunner()
@@ -0,0 +1,252 @@
+"""
+Native asyncio client for the Google Sheets v4 REST API
+
+gspread is blocking: calling it from an ``async def`` handler freezes the
+worker's event loop for the whole Google round trip. This module talks to the
+Sheets API directly over a shared ``httpx.AsyncClient`` (pooled keep-alive
+connections), so concurrent requests in one worker overlap their Sheets I/O.
+
+Only the calls the backend uses are covered: values get, batchGet,
+batchUpdate, append and spreadsheet metadata. Responses are shaped like the
+matching gspread results (e.g. ``get_all_values()`` rows padded to the same
+width), so the async and sync paths can share the snapshot cache and parsing
+code.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import google.auth.transport.requests
+import httpx
+from google.oauth2.service_account import Credentials
+
+from config import (
+    GOOGLE_SHEETS_CREDENTIALS,
+    GOOGLE_SHEETS_DOCUMENT_ID,
+    GOOGLE_SHEETS_HTTP_TIMEOUT_SECONDS,
+)
+from utils.sheets_scheduler import request_kind, sheets_scheduler
+
+logger = logging.getLogger(__name__)
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+
+class AsyncSheetsError(Exception):
+    """Raised when the Sheets API returns an error response"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Sheets API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+def quote_sheet_title(title: str) -> str:
+    """Quote a worksheet title for use in an A1 range"""
+    return "'{}'".format(title.replace("'", "''"))
+
+
+def fill_gaps(values: List[List[Any]]) -> List[List[str]]:
+    """Pad every row to the widest row, as gspread's ``get_all_values()`` does"""
+    if not values:
+        return []
+    width = max(len(row) for row in values)
+    return [
+        [str(cell) for cell in row] + [""] * (width - len(row)) for row in values
+    ]
+
+
+class AsyncSheetsClient:
+    """Async Sheets API client sharing one connection pool per process."""
+
+    def __init__(
+        self,
+        credentials_info: Optional[Dict[str, Any]] = None,
+        document_id: Optional[str] = None,
+        timeout_seconds: float = GOOGLE_SHEETS_HTTP_TIMEOUT_SECONDS,
+    ):
+        self.credentials_info = credentials_info or GOOGLE_SHEETS_CREDENTIALS
+        self.document_id = document_id or GOOGLE_SHEETS_DOCUMENT_ID
+        self.timeout_seconds = timeout_seconds
+        self._credentials: Optional[Credentials] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(
+            self.document_id
+            and self.credentials_info
+            and self.credentials_info.get("private_key")
+            and self.credentials_info.get("client_email")
+        )
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=SHEETS_API_URL,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._http
+
+    def _token_is_valid(self) -> bool:
+        # ``valid`` already treats tokens close to expiry as expired
+        return self._credentials is not None and self._credentials.valid
+
+    async def _get_token(self) -> str:
+        """Return a valid access token, refreshing it off the event loop"""
+        if self._token_is_valid():
+            return self._credentials.token
+
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if self._token_is_valid():
+                return self._credentials.token
+            if self._credentials is None:
+                self._credentials = Credentials.from_service_account_info(
+                    self.credentials_info, scopes=SHEETS_SCOPES
+                )
+            # Token exchange uses google-auth's blocking transport
+            await asyncio.to_thread(
+                self._credentials.refresh, google.auth.transport.requests.Request()
+            )
+            logger.info("Refreshed Google Sheets access token for async client")
+            return self._credentials.token
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Any] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if not self.configured:
+            raise AsyncSheetsError(
+                0, "Google Sheets credentials or document ID not configured"
+            )
+
+        # Quota, priority and 429/5xx retries are handled by the shared scheduler
+        return await sheets_scheduler.acall(
+            request_kind(method, path),
+            lambda: self._send(method, path, params=params, json=json),
+        )
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Any] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        token = await self._get_token()
+        response = await self._get_http().request(
+            method,
+            f"/{self.document_id}{path}",
+            params=params,
+            json=json,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        if response.status_code >= 400:
+            try:
+                message = (
+                    response.json().get("error", {}).get("message", response.text)
+                )
+            except ValueError:
+                message = response.text
+            raise AsyncSheetsError(response.status_code, message)
+        return response.json() if response.content else {}
+
+    async def values_get(
+        self,
+        range_name: str,
+        value_render_option: str = "FORMATTED_VALUE",
+        major_dimension: str = "ROWS",
+    ) -> List[List[str]]:
+        """
+        Read one A1 range
+
+        Args:
+            range_name: A1 range, e.g. "'Q3-2025'" or "'Q3-2025'!A1:Z1"
+            value_render_option: FORMATTED_VALUE, UNFORMATTED_VALUE or FORMULA
+            major_dimension: ROWS or COLUMNS
+
+        Returns:
+            List of rows (or columns), without padding
+        """
+        result = await self._request(
+            "GET",
+            f"/values/{quote(range_name, safe='')}",
+            params={
+                "valueRenderOption": value_render_option,
+                "majorDimension": major_dimension,
+            },
+        )
+        return result.get("values", [])
+
+    async def values_batch_get(
+        self,
+        ranges: List[str],
+        value_render_option: str = "FORMATTED_VALUE",
+        major_dimension: str = "ROWS",
+    ) -> List[List[List[str]]]:
+        """Read several A1 ranges in one call; results are in request order"""
+        params = [("ranges", r) for r in ranges]
+        params.append(("valueRenderOption", value_render_option))
+        params.append(("majorDimension", major_dimension))
+        result = await self._request("GET", "/values:batchGet", params=params)
+        return [
+            value_range.get("values", [])
+            for value_range in result.get("valueRanges", [])
+        ]
+
+    async def values_batch_update(
+        self,
+        data: List[Dict[str, Any]],
+        value_input_option: str = "USER_ENTERED",
+    ) -> Dict[str, Any]:
+        """Write several ranges in one call; ``data`` items are {"range", "values"}"""
+        return await self._request(
+            "POST",
+            "/values:batchUpdate",
+            json={"valueInputOption": value_input_option, "data": data},
+        )
+
+    async def values_append(
+        self,
+        range_name: str,
+        values: List[List[Any]],
+        value_input_option: str = "USER_ENTERED",
+        insert_data_option: str = "INSERT_ROWS",
+    ) -> Dict[str, Any]:
+        """Append rows after the last table row of ``range_name``"""
+        return await self._request(
+            "POST",
+            f"/values/{quote(range_name, safe='')}:append",
+            params={
+                "valueInputOption": value_input_option,
+                "insertDataOption": insert_data_option,
+            },
+            json={"values": values},
+        )
+
+    async def get_metadata(self, fields: str = "sheets.properties") -> Dict[str, Any]:
+        """Fetch spreadsheet metadata (by default only the worksheet properties)"""
+        return await self._request("GET", "", params={"fields": fields})
+
+    async def get_all_values(self, worksheet_title: str) -> List[List[str]]:
+        """Async equivalent of ``worksheet.get_all_values()``"""
+        return fill_gaps(await self.values_get(quote_sheet_title(worksheet_title)))
+
+    async def aclose(self) -> None:
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+
+
+# Global instance shared by GoogleSheetsSync and QuarterlySheetManager
+async_sheets_client = AsyncSheetsClient()
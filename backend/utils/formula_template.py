@@ -0,0 +1,230 @@
+"""
+Template-row formula cache for quarterly sheets
+
+Every quarter sheet keeps its calculated-column formulas in row 2. Copying
+them onto a data row used to re-read row 2 with ``value_render_option=FORMULA``
+and re-run the header keyword heuristics and reference rewriting for every
+column on every write.
+
+This module compiles the template row once per worksheet into a plan: the
+template cells, the per-column formula/data decision and a row-relative
+(tokenized) form of each formula, so the formula for any row is a plain
+substitution. Plans are cached, and the template row is re-read at most every
+``GOOGLE_SHEETS_TEMPLATE_CHECK_MINUTES``. If the row's hash has not changed,
+the compiled plan is kept, so steady-state formula propagation makes no API
+calls.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import GOOGLE_SHEETS_TEMPLATE_CHECK_MINUTES
+
+logger = logging.getLogger(__name__)
+
+TemplateKey = Tuple[str, str]
+
+# Row of every quarter sheet that holds the template formulas
+TEMPLATE_ROW = 2
+
+# Cell references such as A1, $B2, C$3 or $D$4
+CELL_REFERENCE_PATTERN = re.compile(r"(\$?)([A-Z]+)(\$?)(\d+)")
+
+
+def rebase_formula(formula: str, source_row: int, target_row: int) -> str:
+    """
+    Move the row references of a formula from ``source_row`` to ``target_row``
+
+    Absolute rows ($) are kept. References to the source row, or to rows below
+    it, are shifted by the row difference. References to rows above the
+    source row are left unchanged.
+    """
+    return RowRelativeFormula(formula, source_row).render(target_row)
+
+
+class RowRelativeFormula:
+    """
+    A formula tokenized once into literal text and row-relative references
+
+    This is the A1 equivalent of an R1C1 formula. Every shiftable row reference
+    is stored as an offset from the source row, so producing the formula for
+    any row is a string join. The Sheets API only accepts A1 notation for
+    USER_ENTERED values, which is why the row numbers are rendered back out.
+    """
+
+    __slots__ = ("formula", "source_row", "_literals", "_references")
+
+    def __init__(self, formula: str, source_row: int = TEMPLATE_ROW):
+        self.formula = formula
+        self.source_row = source_row
+        # _literals has one more entry than _references; they interleave
+        self._literals: List[str] = []
+        self._references: List[Tuple[str, int]] = []
+
+        position = 0
+        pending = ""
+        for match in CELL_REFERENCE_PATTERN.finditer(formula):
+            dollar1, col_letters, dollar2, row_num = match.groups()
+            row_num = int(row_num)
+            pending += formula[position : match.start()]
+            position = match.end()
+            if dollar2 or row_num < source_row:
+                # Absolute or above the template row - never shifts
+                pending += match.group(0)
+                continue
+            self._literals.append(pending)
+            self._references.append(
+                (f"{dollar1}{col_letters}{dollar2}", row_num - source_row)
+            )
+            pending = ""
+        self._literals.append(pending + formula[position:])
+
+    def render(self, target_row: int) -> str:
+        """Produce the A1 formula for ``target_row``"""
+        if not self._references:
+            return self._literals[0]
+        parts = []
+        for literal, (column, offset) in zip(self._literals, self._references):
+            parts.append(literal)
+            parts.append(column)
+            parts.append(str(target_row + offset))
+        parts.append(self._literals[-1])
+        return "".join(parts)
+
+
+@dataclass
+class TemplateColumn:
+    template_cell: str
+    # Template cell holds a formula
+    has_formula: bool
+    # Header suggests a calculated column that always takes the formula
+    is_formula_column: bool
+    # Renders the formula for a given target row
+    render: Optional[Callable[[int], str]] = None
+
+
+@dataclass
+class CompiledTemplate:
+    headers: List[str]
+    columns: List[TemplateColumn]
+    version: str
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def formula_count(self) -> int:
+        return sum(1 for column in self.columns if column.has_formula)
+
+    def formula_columns(self) -> List[int]:
+        """0-based indices of columns whose template cell is a formula"""
+        return [i for i, column in enumerate(self.columns) if column.has_formula]
+
+    def render_column(self, col_index: int, rows: Iterable[int]) -> List[List[str]]:
+        """Render one formula column for many rows as a column of single-cell rows"""
+        render = self.columns[col_index].render
+        return [[render(row)] for row in rows]
+
+
+def template_version(template_row: List[str]) -> str:
+    """Stable hash of a template row's raw cell contents"""
+    digest = hashlib.sha1("\x1f".join(str(c) for c in template_row).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compile_template(
+    headers: List[str],
+    template_row: List[str],
+    formula_column_keywords: List[str],
+    source_row: int = TEMPLATE_ROW,
+) -> CompiledTemplate:
+    """Compile a template row into per-column formula/data decisions and rewriters"""
+    columns = []
+    for i, template_cell in enumerate(template_row):
+        header_name = headers[i].lower() if i < len(headers) else f"column_{i+1}"
+        has_formula = bool(template_cell) and str(template_cell).startswith("=")
+        column = TemplateColumn(
+            template_cell=template_cell,
+            has_formula=has_formula,
+            is_formula_column=any(
+                keyword in header_name for keyword in formula_column_keywords
+            ),
+        )
+        if has_formula:
+            column.render = RowRelativeFormula(str(template_cell), source_row).render
+        columns.append(column)
+
+    return CompiledTemplate(
+        headers=list(headers),
+        columns=columns,
+        version=template_version(template_row),
+    )
+
+
+class FormulaTemplateCache:
+    """Thread-safe cache of compiled template rows keyed by (spreadsheet, worksheet)."""
+
+    def __init__(self, check_interval_minutes: float = GOOGLE_SHEETS_TEMPLATE_CHECK_MINUTES):
+        self.check_interval_seconds = check_interval_minutes * 60
+        self._templates: Dict[TemplateKey, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: TemplateKey,
+        headers: List[str],
+        fetch_template_row: Callable[[], List[str]],
+        formula_column_keywords: List[str],
+    ) -> CompiledTemplate:
+        """
+        Return the compiled template for a worksheet
+
+        Args:
+            key: (spreadsheet id, worksheet title)
+            headers: Sheet headers the template columns line up with
+            fetch_template_row: Callable reading row 2 with formulas unrendered
+            formula_column_keywords: Header keywords marking calculated columns
+
+        Returns:
+            CompiledTemplate, re-read only when the check interval has passed
+        """
+        with self._lock:
+            cached = self._templates.get(key)
+        now = time.monotonic()
+
+        if (
+            cached is not None
+            and cached.headers == headers
+            and (now - cached.checked_at) < self.check_interval_seconds
+        ):
+            return cached
+
+        template_row = fetch_template_row()
+        version = template_version(template_row)
+
+        if cached is not None and cached.headers == headers and cached.version == version:
+            cached.checked_at = now
+            return cached
+
+        compiled = compile_template(headers, template_row, formula_column_keywords)
+        with self._lock:
+            self._templates[key] = compiled
+        logger.info(
+            f"Compiled template row for {key[1]}: {compiled.formula_count} formulas (version {version[:8]})"
+        )
+        return compiled
+
+    def invalidate(self, spreadsheet_id: str, worksheet_title: Optional[str] = None) -> None:
+        with self._lock:
+            if worksheet_title is not None:
+                self._templates.pop((spreadsheet_id, worksheet_title), None)
+                return
+            for key in [k for k in self._templates if k[0] == spreadsheet_id]:
+                self._templates.pop(key, None)
+
+
+# Global instance used by QuarterlySheetManager
+formula_template_cache = FormulaTemplateCache()
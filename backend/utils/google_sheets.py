@@ -4,8 +4,12 @@ from typing import Any, Dict, List, Optional
 
 import gspread
 from google.oauth2.service_account import Credentials
+from gspread.utils import numericise_all
 
 from config import GOOGLE_SHEETS_CREDENTIALS, GOOGLE_SHEETS_DOCUMENT_ID
+from utils.async_sheets import async_sheets_client
+from utils.sheet_append import append_rows
+from utils.sheets_scheduler import ScheduledClient, off_event_loop
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +61,8 @@ class GoogleSheetsSync:
         self.document_id = GOOGLE_SHEETS_DOCUMENT_ID
         self.client = None
         self.spreadsheet = None
+        # Native async transport for reads made from async request handlers
+        self.async_client = async_sheets_client
         self._initialize_client()
 
     def _initialize_client(self):
@@ -78,7 +84,9 @@ class GoogleSheetsSync:
                 self.credentials, scopes=scope
             )
 
-            self.client = gspread.authorize(credentials)
+            self.client = gspread.authorize(
+                credentials, client_factory=ScheduledClient
+            )
             self.spreadsheet = self.client.open_by_key(self.document_id)
 
             logger.info("Google Sheets client initialized successfully")
@@ -86,6 +94,40 @@ class GoogleSheetsSync:
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets client: {str(e)}")
 
+    async def aget_all_values(self, worksheet_name: str) -> List[List[str]]:
+        """
+        Raw values of a worksheet whose header row must be unique
+
+        Args:
+            worksheet_name: Title of the worksheet (row 1 = headers)
+
+        Returns:
+            Every row as returned by ``get_all_values()``
+        """
+        data = await self.async_client.get_all_values(worksheet_name)
+        if data and len(data[0]) != len(set(data[0])):
+            raise gspread.exceptions.GSpreadException(
+                "the header row in the worksheet is not unique"
+            )
+        return data
+
+    async def aget_all_records(self, worksheet_name: str) -> List[Dict[str, Any]]:
+        """
+        Async equivalent of ``worksheet.get_all_records()``
+
+        Args:
+            worksheet_name: Title of the worksheet (row 1 = headers)
+
+        Returns:
+            One dictionary per data row, with numeric strings converted like gspread
+        """
+        data = await self.aget_all_values(worksheet_name)
+        if not data:
+            return []
+
+        keys = data[0]
+        return [dict(zip(keys, numericise_all(row))) for row in data[1:]]
+
     def _get_or_create_worksheet(
         self, worksheet_name: str, headers: List[str]
     ) -> Optional[gspread.Worksheet]:
@@ -128,34 +170,11 @@ class GoogleSheetsSync:
             result = chr(65 + remainder) + result
         return result
 
-    def _find_next_empty_row(self, worksheet) -> int:
-        """Find the next empty row in the worksheet starting from column A"""
-        try:
-            # Get all values from the worksheet to find the actual last row with data
-            all_values = worksheet.get_all_values()
-
-            # Find the last row that contains any data
-            last_row_with_data = 0
-            for i, row in enumerate(all_values):
-                if any(cell.strip() for cell in row):
-                    last_row_with_data = i + 1  # gspread uses 1-based indexing
-
-            # Next empty row is the one after the last row with data
-            next_row = last_row_with_data + 1
-
-            # Ensure we don't overwrite the header row
-            if next_row <= 1:
-                next_row = 2
-
-            logger.info(
-                f"Google Sheets utility - Found next empty row: {next_row} (last data row was: {last_row_with_data})"
-            )
-            return next_row
-
-        except Exception as e:
-            logger.error(f"Error finding next empty row: {str(e)}")
-            # Fallback to row 2 if there's an error
-            return 2
+    def _append_row(
+        self, worksheet, row_values: List[str], value_input_option: str = "RAW"
+    ) -> int:
+        """Append a row after the worksheet's data; returns the row it landed on"""
+        return append_rows(worksheet, [row_values], value_input_option)
 
     def _safe_sync(self, sync_function, *args, **kwargs):
         """Safely execute sync function with error handling"""
@@ -220,12 +239,8 @@ class GoogleSheetsSync:
 
             row_values = [str(val) if val is not None else "" for val in row_values]
 
-            # Find the next empty row starting from A column
-            next_row = self._find_next_empty_row(worksheet)
-
-            # Insert the row data starting from column A
-            cell_range = f"A{next_row}:{self._col_to_a1(len(row_values))}{next_row}"
-            worksheet.update(cell_range, [row_values], value_input_option="RAW")
+            # Insert the row after the existing data, starting from column A
+            next_row = self._append_row(worksheet, row_values)
 
             logger.info(
                 f"Synced child ID request {child_id_data.get('id')} to Google Sheets at row {next_row}"
@@ -303,12 +318,8 @@ class GoogleSheetsSync:
 
             row_values = [str(val) if val is not None else "" for val in row_values]
 
-            # Find the next empty row starting from A column
-            next_row = self._find_next_empty_row(worksheet)
-
-            # Insert the row data starting from column A
-            cell_range = f"A{next_row}:{self._col_to_a1(len(row_values))}{next_row}"
-            worksheet.update(cell_range, [row_values], value_input_option="RAW")
+            # Insert the row after the existing data, starting from column A
+            next_row = self._append_row(worksheet, row_values)
 
             logger.info(
                 f"Synced cut pay transaction {cutpay_data.get('id')} to CutPay sheet at row {next_row}"
@@ -486,12 +497,8 @@ class GoogleSheetsSync:
 
             row_values = [str(val) if val is not None else "" for val in row_values]
 
-            # Find the next empty row starting from A column
-            next_row = self._find_next_empty_row(worksheet)
-
-            # Insert the row data starting from column A
-            cell_range = f"A{next_row}:{self._col_to_a1(len(row_values))}{next_row}"
-            worksheet.update(cell_range, [row_values], value_input_option="RAW")
+            # Insert the row after the existing data, starting from column A
+            next_row = self._append_row(worksheet, row_values)
 
             logger.info(
                 f"Synced policy {policy_data.get('policy_number')} to Policies sheet at row {next_row}"
@@ -571,12 +578,9 @@ class GoogleSheetsSync:
             else:
                 master_row_data.append("")
 
-        # Find next empty row and insert
-        next_row = self._find_next_empty_row(master_sheet)
-        last_col = self._col_to_a1(len(master_headers))
-        cell_range = f"A{next_row}:{last_col}{next_row}"
-        master_sheet.update(
-            cell_range, [master_row_data], value_input_option="USER_ENTERED"
+        # Insert the row after the existing data
+        next_row = self._append_row(
+            master_sheet, master_row_data, value_input_option="USER_ENTERED"
         )
 
         logger.info(
@@ -1049,7 +1053,8 @@ async def resolve_insurer_broker_names(cutpay_data: Dict[str, Any]) -> Dict[str,
     return cutpay_data
 
 
-async def get_master_sheet_data(
+@off_event_loop
+def get_master_sheet_data(
     insurer_name: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """Get all records from master sheet, optionally filtered by insurer name"""
@@ -1090,7 +1095,8 @@ async def get_master_sheet_data(
         return []
 
 
-async def update_master_sheet_record(
+@off_event_loop
+def update_master_sheet_record(
     policy_number: str, updated_data: Dict[str, Any]
 ) -> bool:
     """Update existing record in master sheet by policy number"""
@@ -1160,7 +1166,8 @@ async def update_master_sheet_record(
         return False
 
 
-async def add_master_sheet_record(record_data: Dict[str, Any]) -> bool:
+@off_event_loop
+def add_master_sheet_record(record_data: Dict[str, Any]) -> bool:
     """Add new record to master sheet"""
     try:
         if not google_sheets_sync.client:
@@ -9,19 +9,114 @@ Features:
 - Formula replication from master sheet template
 - Template management and header creation
 - Sheet access and validation utilities
+- Cached quarter sheet snapshots with write-through patching
+- Policy number → row index for single-row lookups
+- Compiled template-row formulas cached per worksheet
+- Cached worksheet directory for sheet lookups
 """
 
+import asyncio
 import logging
+import time
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import gspread
 from google.oauth2.service_account import Credentials
 
 from config import GOOGLE_SHEETS_CREDENTIALS, GOOGLE_SHEETS_DOCUMENT_ID
+from utils.async_sheets import (
+    AsyncSheetsError,
+    async_sheets_client,
+    quote_sheet_title,
+)
+from utils.formula_template import (
+    TEMPLATE_ROW,
+    CompiledTemplate,
+    formula_template_cache,
+    rebase_formula,
+)
+from utils.sheet_append import append_rows
+from utils.sheet_cache import SheetSnapshot, sheet_snapshot_cache
+from utils.sheet_index import find_policy_column, policy_row_index
+from utils.sheets_scheduler import ScheduledClient
+from utils.worksheet_directory import WorksheetDirectory
 
 logger = logging.getLogger(__name__)
 
+# Rows per values.batchUpdate request when writing many rows at once
+BATCH_WRITE_CHUNK_ROWS = 500
+
+# Day 0 of the serial numbers Google Sheets stores dates as
+SHEETS_EPOCH = datetime(1899, 12, 30)
+
+# Formats of date strings written to the sheets (ISO from the backend,
+# DD/MM/YYYY from insurer statements), compared with stored date serials
+CELL_DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%d/%m/%Y",
+]
+
+# Row ranges per values.batchGet request when reading scattered rows back
+ROW_READ_RANGES_PER_REQUEST = 100
+
+# Rows between two wanted rows that are read through rather than split into ranges
+ROW_READ_MAX_GAP = 20
+
+# Header keywords of columns that typically hold formulas rather than data
+FORMULA_COLUMN_KEYWORDS = [
+    "running balance",
+    "running bal",
+    "balance",
+    "total",
+    "amount",
+    "percentage",
+    "percent",
+    "%",
+    "calculation",
+    "calc",
+    "computed",
+    "sum",
+    "subtotal",
+    "grand total",
+    "net",
+    "gross",
+    "commission",
+    "brokerage",
+    "fee",
+    "charge",
+    "due",
+    "outstanding",
+    "difference",
+    "variance",
+    "match",
+    "status",
+    "receivable",
+    "payable",
+    "gst",
+    "diff",
+    "extra",
+    "actual",
+    "paid",
+    "invoice",
+]
+
+
+class SheetBatchWriteError(Exception):
+    """
+    Raised when a request of ``sync_records_batch`` fails
+
+    Earlier requests of the batch may have been written. ``results`` holds
+    one result per entry, so callers can tell which records made it.
+    """
+
+    def __init__(self, message: str, results: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.results = results
+
 
 class QuarterlySheetManager:
     """Manages data routing to existing quarterly sheets and template management.
@@ -37,6 +132,19 @@ class QuarterlySheetManager:
         # Master template sheet name in Google Sheets (instead of local CSV)
         self.master_template_sheet_name = "Master Template"
 
+        # Shared in-memory snapshots of worksheet values
+        self.snapshot_cache = sheet_snapshot_cache
+        # Shared policy number → row index per worksheet
+        self.policy_index = policy_row_index
+        # Compiled row-2 formulas per worksheet, plus cached template headers
+        self.template_cache = formula_template_cache
+        self._template_headers: Optional[List[str]] = None
+        self._template_headers_loaded_at = 0.0
+        # Cached title → worksheet map (avoids a metadata fetch per lookup)
+        self.worksheet_directory = WorksheetDirectory(lambda: self.spreadsheet)
+        # Native async transport for reads made from async request handlers
+        self.async_client = async_sheets_client
+
     def _initialize_client(self):
         """Initialize Google Sheets client with service account credentials"""
         try:
@@ -56,7 +164,9 @@ class QuarterlySheetManager:
                 self.credentials, scopes=scope
             )
 
-            self.client = gspread.authorize(credentials)
+            self.client = gspread.authorize(
+                credentials, client_factory=ScheduledClient
+            )
             self.spreadsheet = self.client.open_by_key(self.document_id)
 
             logger.info(
@@ -103,29 +213,16 @@ class QuarterlySheetManager:
             num_columns = len(headers)
             last_col = self._col_to_a1(num_columns)
 
-            # Get all values and formulas from row 2 (template row)
-            template_row = 2
-
-            # Get the range of data (use our actual column count)
-            template_range = f"A{template_row}:{last_col}{template_row}"
+            template_row = TEMPLATE_ROW
 
-            logger.info(f"🔍 Getting formulas from template range: {template_range}")
-
-            # Get formulas from template row
+            # Get the compiled template row (cached per worksheet)
             try:
-                template_formulas = worksheet.batch_get(
-                    [template_range], value_render_option="FORMULA"
-                )[0]
-                if not template_formulas or not template_formulas[0]:
+                template = self._get_compiled_template(worksheet, headers)
+                if not template.columns:
                     logger.warning(
                         f"⚠️ No formulas found in template row {template_row}"
                     )
                     return True  # Not an error, just no formulas to copy
-
-                template_formula_row = template_formulas[0]
-                logger.info(
-                    f"📊 Found template row with {len(template_formula_row)} cells"
-                )
             except Exception as e:
                 logger.warning(
                     f"⚠️ Could not get formulas from template row {template_row}: {str(e)}"
@@ -152,125 +249,10 @@ class QuarterlySheetManager:
                 )
                 current_value_row = [""] * num_columns  # Create empty row
 
-            # Identify which columns typically contain formulas vs data
-            formula_column_keywords = [
-                "running balance",
-                "running bal",
-                "balance",
-                "total",
-                "amount",
-                "percentage",
-                "percent",
-                "%",
-                "calculation",
-                "calc",
-                "computed",
-                "sum",
-                "subtotal",
-                "grand total",
-                "net",
-                "gross",
-                "commission",
-                "brokerage",
-                "fee",
-                "charge",
-                "due",
-                "outstanding",
-                "difference",
-                "variance",
-                "match",
-                "status",
-                "receivable",
-                "payable",
-                "gst",
-                "diff",
-                "extra",
-                "actual",
-                "paid",
-                "invoice",
-            ]
-
-            # Prepare update data with intelligent formula vs data preservation
-            update_row = []
-            formulas_copied = 0
-            data_preserved = 0
-
-            logger.info(
-                f"🧮 Processing {len(template_formula_row)} columns for formula/data decision"
+            update_row, formulas_copied, data_preserved = self._merge_template_formulas(
+                template, current_value_row, target_row
             )
 
-            for i, template_cell in enumerate(template_formula_row):
-                current_value = (
-                    current_value_row[i] if i < len(current_value_row) else ""
-                )
-                header_name = (
-                    headers[i].lower() if i < len(headers) else f"column_{i+1}"
-                )
-
-                # Check if this column likely contains formulas based on header name
-                is_likely_formula_column = any(
-                    keyword in header_name for keyword in formula_column_keywords
-                )
-
-                # Log the decision process for first few columns and formula columns
-                if i < 5 or is_likely_formula_column:
-                    logger.debug(
-                        f"Column {i+1} '{headers[i] if i < len(headers) else 'Unknown'}': template='{str(template_cell)[:30]}', current='{str(current_value)[:30]}', formula_column={is_likely_formula_column}"
-                    )
-
-                # Decision logic for formula vs data
-                if template_cell and str(template_cell).startswith("="):
-                    # Template has a formula
-                    if is_likely_formula_column:
-                        # This is likely a calculated column - always use formula
-                        updated_formula = self._update_formula_references(
-                            template_cell, template_row, target_row
-                        )
-                        update_row.append(updated_formula)
-                        formulas_copied += 1
-                        if i < 10:  # Log first 10 for debugging
-                            logger.info(
-                                f"✅ Column {i+1} ({header_name}): Applied original template formula"
-                            )
-                    elif not current_value or str(current_value).strip() == "":
-                        # Data column but empty - use formula as fallback
-                        updated_formula = self._update_formula_references(
-                            template_cell, template_row, target_row
-                        )
-                        update_row.append(updated_formula)
-                        formulas_copied += 1
-                        if i < 10:
-                            logger.info(
-                                f"🔄 Column {i+1} ({header_name}): Applied original template formula (empty data)"
-                            )
-                    elif str(current_value).startswith("="):
-                        # Current value is already a formula - update it
-                        updated_formula = self._update_formula_references(
-                            template_cell, template_row, target_row
-                        )
-                        update_row.append(updated_formula)
-                        formulas_copied += 1
-                        if i < 10:
-                            logger.info(
-                                f"🔄 Column {i+1} ({header_name}): Updated existing formula with original template"
-                            )
-                    else:
-                        # Data column with actual data - preserve the data
-                        update_row.append(current_value)
-                        data_preserved += 1
-                        if i < 10:
-                            logger.info(
-                                f"📝 Column {i+1} ({header_name}): Preserved data: '{str(current_value)[:20]}'"
-                            )
-                else:
-                    # Template doesn't have a formula - preserve current value or use empty
-                    if i < len(current_value_row):
-                        update_row.append(current_value)
-                        if current_value and str(current_value).strip():
-                            data_preserved += 1
-                    else:
-                        update_row.append("")
-
             # Update the target row with intelligent formula/data handling
             if update_row:
                 logger.info(
@@ -311,6 +293,563 @@ class QuarterlySheetManager:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
 
+    def _merge_template_formulas(
+        self,
+        template: CompiledTemplate,
+        current_value_row: List[str],
+        target_row: int,
+    ) -> Tuple[List[str], int, int]:
+        """
+        Combine compiled template formulas with a row's data values
+
+        For each column, the template formula (rebased onto ``target_row``) is
+        used for calculated columns, empty cells and cells that already hold a
+        formula; any other data value is preserved.
+
+        Returns:
+            Tuple of (merged row, formulas copied, data values preserved)
+        """
+        update_row = []
+        formulas_copied = 0
+        data_preserved = 0
+
+        for i, column in enumerate(template.columns):
+            current_value = current_value_row[i] if i < len(current_value_row) else ""
+
+            # Decision logic for formula vs data
+            if column.has_formula:
+                if (
+                    column.is_formula_column
+                    or not current_value
+                    or str(current_value).strip() == ""
+                    or str(current_value).startswith("=")
+                ):
+                    # Calculated column, empty data or existing formula - use template
+                    update_row.append(column.render(target_row))
+                    formulas_copied += 1
+                else:
+                    # Data column with actual data - preserve the data
+                    update_row.append(current_value)
+                    data_preserved += 1
+            elif i < len(current_value_row):
+                # Template doesn't have a formula - preserve current value
+                update_row.append(current_value)
+                if current_value and str(current_value).strip():
+                    data_preserved += 1
+            else:
+                update_row.append("")
+
+        return update_row, formulas_copied, data_preserved
+
+    def _get_compiled_template(
+        self, worksheet: gspread.Worksheet, headers: List[str]
+    ) -> CompiledTemplate:
+        """Get the compiled template row of a worksheet from the template cache"""
+        return self.template_cache.get(
+            (self.document_id, worksheet.title),
+            headers,
+            lambda: self._get_template_formula_row(worksheet, len(headers)),
+            FORMULA_COLUMN_KEYWORDS,
+        )
+
+    def _get_template_formula_row(
+        self, worksheet: gspread.Worksheet, num_columns: int
+    ) -> List[str]:
+        """Read the template row (row 2) of a worksheet with formulas unrendered"""
+        last_col = self._col_to_a1(num_columns)
+        template_formulas = worksheet.batch_get(
+            [f"A2:{last_col}2"], value_render_option="FORMULA"
+        )[0]
+        if not template_formulas or not template_formulas[0]:
+            return []
+        return list(template_formulas[0])
+
+    def _build_row_with_formulas(
+        self,
+        worksheet: gspread.Worksheet,
+        headers: List[str],
+        row_data: List[str],
+        target_row: int,
+    ) -> List[str]:
+        """
+        Build the final contents of a row locally: data values plus template formulas
+
+        Produces the same cells as writing ``row_data`` and then running
+        ``_copy_formulas_only_to_row``, so the row can be written in one request.
+        """
+        return self._build_rows_with_formulas(
+            worksheet, headers, {target_row: row_data}
+        )[target_row]
+
+    def _build_rows_with_formulas(
+        self,
+        worksheet: gspread.Worksheet,
+        headers: List[str],
+        rows: Dict[int, List[str]],
+    ) -> Dict[int, List[str]]:
+        """
+        Build many rows at once from the compiled template
+
+        The template is resolved once and each formula is rendered per row by
+        substitution, so thousands of rows cost no extra API calls or regex work.
+
+        Args:
+            worksheet: Worksheet the rows belong to
+            headers: Sheet headers
+            rows: Mapping of 1-based row number to data values
+
+        Returns:
+            Mapping of row number to final cell values (data plus formulas)
+        """
+        try:
+            template = self._get_compiled_template(worksheet, headers)
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Could not get formulas from template row 2 of {worksheet.title}: {str(e)}"
+            )
+            return {row: list(values) for row, values in rows.items()}
+
+        if not template.columns:
+            return {row: list(values) for row, values in rows.items()}
+
+        built = {}
+        for target_row, row_data in rows.items():
+            merged_row, _, _ = self._merge_template_formulas(
+                template, row_data, target_row
+            )
+            # Keep data beyond the last template cell
+            merged_row.extend(row_data[len(merged_row) :])
+            built[target_row] = merged_row
+        return built
+
+    def _formula_column_ranges(
+        self,
+        worksheet: gspread.Worksheet,
+        template: CompiledTemplate,
+        start_row: int,
+        end_row: int,
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Ranges filling every calculated column of a contiguous block of rows
+
+        Only columns whose template cell is a formula and whose header marks a
+        calculated column are included (they always take the formula), one
+        range per column covering ``start_row``..``end_row``.
+
+        Returns:
+            Tuple of (values.batchUpdate data entries, column indexes covered)
+        """
+        if end_row < start_row:
+            return [], []
+
+        rows = range(start_row, end_row + 1)
+        data = []
+        columns = []
+        for col_index in template.formula_columns():
+            if not template.columns[col_index].is_formula_column:
+                continue
+            col = self._col_to_a1(col_index + 1)
+            data.append(
+                {
+                    "range": self._a1_range(
+                        worksheet, f"{col}{start_row}:{col}{end_row}"
+                    ),
+                    "values": template.render_column(col_index, rows),
+                }
+            )
+            columns.append(col_index)
+        return data, columns
+
+    def _a1_range(self, worksheet: gspread.Worksheet, range_name: str) -> str:
+        """Qualify an A1 range with the worksheet title for spreadsheet-level calls"""
+        title = worksheet.title.replace("'", "''")
+        return f"'{title}'!{range_name}"
+
+    def _batch_write_rows(
+        self, worksheet: gspread.Worksheet, rows: Dict[int, List[str]]
+    ) -> Dict[str, Any]:
+        """
+        Write several full rows of a worksheet in a single values.batchUpdate call
+
+        Args:
+            worksheet: Target worksheet
+            rows: Mapping of 1-based row number to the row's cell values
+
+        Returns:
+            The raw batchUpdate API response
+        """
+        data = [
+            {
+                "range": self._a1_range(
+                    worksheet,
+                    f"A{row_number}:{self._col_to_a1(max(len(values), 1))}{row_number}",
+                ),
+                "values": [values],
+            }
+            for row_number, values in sorted(rows.items())
+        ]
+        return self.spreadsheet.values_batch_update(
+            {"valueInputOption": "USER_ENTERED", "data": data}
+        )
+
+    def _write_record_row(
+        self,
+        worksheet: gspread.Worksheet,
+        headers: List[str],
+        row_data: List[str],
+        target_row: int,
+    ) -> List[Optional[str]]:
+        """
+        Write a record's data and template formulas to a row in one round trip
+
+        Returns:
+            The written values for the snapshot, None for formula cells
+        """
+        final_row = self._build_row_with_formulas(
+            worksheet, headers, row_data, target_row
+        )
+        self._batch_write_rows(worksheet, {target_row: final_row})
+        # Formula results are not known locally, keep them out of the snapshot
+        return [
+            None if str(value).startswith("=") else value for value in final_row
+        ]
+
+    def _read_rows(
+        self, worksheet: gspread.Worksheet, row_numbers: List[int]
+    ) -> Dict[int, List[Any]]:
+        """
+        Read the current cells of some rows from the sheet, unrendered
+
+        Unlike ``_read_row`` this never uses the snapshot cache, so the cells
+        reflect edits made since the snapshot was taken. They are read with
+        the FORMULA render option: data cells hold the entered value (numbers
+        as numbers, dates as serial numbers) and formula cells their formula,
+        so one read serves both the data and the template comparison. Nearby
+        rows are read as one range, and ranges are batched into few
+        values.batchGet calls.
+
+        Returns:
+            Mapping of row number to its cells ([] for an empty row)
+        """
+        runs: List[List[int]] = []
+        for row_number in sorted(set(row_numbers)):
+            if runs and row_number - runs[-1][1] <= ROW_READ_MAX_GAP:
+                runs[-1][1] = row_number
+            else:
+                runs.append([row_number, row_number])
+
+        cells: Dict[int, List[Any]] = {}
+        for chunk_start in range(0, len(runs), ROW_READ_RANGES_PER_REQUEST):
+            chunk = runs[chunk_start : chunk_start + ROW_READ_RANGES_PER_REQUEST]
+            results = worksheet.batch_get(
+                [f"{first}:{last}" for first, last in chunk],
+                value_render_option="FORMULA",
+                date_time_render_option="SERIAL_NUMBER",
+            )
+            for (first_row, _), value_rows in zip(chunk, results):
+                for offset, value_row in enumerate(value_rows):
+                    cells[first_row + offset] = list(value_row)
+        return {row_number: cells.get(row_number, []) for row_number in row_numbers}
+
+    @staticmethod
+    def _cell_number(value: str) -> Optional[float]:
+        """Number an entered string stands for (amount, percentage or date)"""
+        text = value.strip().replace(",", "").replace("₹", "")
+        try:
+            if text.endswith("%"):
+                return float(text[:-1]) / 100
+            return float(text)
+        except ValueError:
+            pass
+        for date_format in CELL_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+            # Sheets stores dates as days since 1899-12-30
+            return (parsed - SHEETS_EPOCH).total_seconds() / 86400
+        return None
+
+    def _same_cell_value(self, current: Any, new_value: str) -> bool:
+        """
+        Whether an unrendered cell already holds ``new_value``
+
+        Numbers, percentages and dates are compared by value, as the cell
+        stores them and not as they are displayed, so an unchanged amount or
+        date is not rewritten.
+        """
+        if isinstance(current, bool):
+            return str(current).lower() == new_value.strip().lower()
+        if str(current).strip() == new_value.strip():
+            return True
+        if isinstance(current, (int, float)):
+            number = self._cell_number(new_value)
+            return number is not None and abs(number - current) < 1e-9
+        return False
+
+    def _diff_row_cells(
+        self,
+        template: Optional[CompiledTemplate],
+        row_number: int,
+        row_data: List[str],
+        current_cells: Sequence[Any],
+        fields: Optional[set] = None,
+    ) -> Dict[int, str]:
+        """
+        Work out the cells of a row that must change to hold ``row_data``
+
+        Applies the same formula/data decision as ``_merge_template_formulas``
+        but returns only the cells whose content differs. A formula cell is
+        written only when it does not match its template (the template changed
+        or the formula is missing). Columns outside ``fields`` keep their data.
+
+        Args:
+            template: Compiled template of the sheet, or None if unavailable
+            row_number: 1-based row being updated
+            row_data: New values ordered by sheet headers
+            current_cells: Current unrendered cells of the row (``_read_rows``)
+            fields: Column indices allowed to change data (None for all)
+
+        Returns:
+            Mapping of 0-based column index to the value or formula to write
+        """
+        changes: Dict[int, str] = {}
+        template_columns = template.columns if template is not None else []
+
+        for i, new_value in enumerate(row_data):
+            in_scope = fields is None or i in fields
+            current = current_cells[i] if i < len(current_cells) else ""
+            current_cell = str(current)
+            column = template_columns[i] if i < len(template_columns) else None
+
+            if column is not None and column.has_formula:
+                formula = column.render(row_number)
+                if not in_scope:
+                    # Only a formula that no longer matches its template is refreshed
+                    if current_cell.startswith("=") and current_cell != formula:
+                        changes[i] = formula
+                    continue
+                if column.is_formula_column or not str(new_value).strip():
+                    if current_cell != formula:
+                        changes[i] = formula
+                    continue
+                # Data column with actual data overrides the template formula
+                if current_cell.startswith("=") or not self._same_cell_value(
+                    current, str(new_value)
+                ):
+                    changes[i] = new_value
+                continue
+
+            if in_scope and not self._same_cell_value(current, str(new_value)):
+                changes[i] = new_value
+
+        return changes
+
+    def _cell_ranges(
+        self, worksheet: gspread.Worksheet, row_number: int, changes: Dict[int, str]
+    ) -> List[Dict[str, Any]]:
+        """Group a row's changed cells into contiguous single-row ranges"""
+        data = []
+        run: List[int] = []
+        for col_index in sorted(changes) + [None]:
+            if run and (col_index is None or col_index != run[-1] + 1):
+                first = self._col_to_a1(run[0] + 1)
+                last = self._col_to_a1(run[-1] + 1)
+                data.append(
+                    {
+                        "range": self._a1_range(
+                            worksheet, f"{first}{row_number}:{last}{row_number}"
+                        ),
+                        "values": [[changes[i] for i in run]],
+                    }
+                )
+                run = []
+            if col_index is not None:
+                run.append(col_index)
+        return data
+
+    def _write_row_changes(
+        self,
+        worksheet: gspread.Worksheet,
+        headers: List[str],
+        rows: Dict[int, Tuple[List[str], Optional[set]]],
+        expected_policies: Optional[Dict[int, str]] = None,
+    ) -> Tuple[
+        Dict[int, List[Optional[str]]], Dict[int, int], Dict[int, str], set
+    ]:
+        """
+        Update existing rows by writing only their changed cells
+
+        The rows are read back from the sheet first and diffed against their
+        entered values, not a cached snapshot of displayed values: a snapshot
+        older than an edit made in Google Sheets would hide a cell that has to
+        be rewritten, and display formatting would make unchanged numbers and
+        dates look different.
+        Changed cells are grouped into contiguous ranges per row and sent in
+        chunked values.batchUpdate calls across rows. Rows without changes
+        cost no write.
+
+        Args:
+            worksheet: Target worksheet
+            headers: Sheet headers
+            rows: Mapping of row number to (new values, column indices allowed
+                to change data or None for all)
+            expected_policies: Policy number each row must hold; a row whose
+                freshly read policy cell differs is not written
+
+        Returns:
+            Tuple of (patched row values for the snapshot, None for cells not
+            written or written as formulas; cells written per row; error per
+            failed row; rows not written because they hold another policy)
+        """
+        try:
+            template = self._get_compiled_template(worksheet, headers)
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Could not get formulas from template row 2 of {worksheet.title}: {str(e)}"
+            )
+            template = None
+
+        current_rows = self._read_rows(worksheet, list(rows))
+        policy_col_index = find_policy_column(headers)
+
+        changes: Dict[int, Dict[int, str]] = {}
+        patched: Dict[int, List[Optional[str]]] = {}
+        moved: set = set()
+        for row_number, (row_data, fields) in rows.items():
+            expected = (expected_policies or {}).get(row_number)
+            if expected is not None and policy_col_index != -1:
+                current = current_rows[row_number]
+                cell = (
+                    current[policy_col_index]
+                    if policy_col_index < len(current)
+                    else ""
+                )
+                if self.policy_index.normalize(cell) != self.policy_index.normalize(
+                    expected
+                ):
+                    logger.warning(
+                        f"Row {row_number} of {worksheet.title} no longer holds policy '{expected}', not writing it"
+                    )
+                    moved.add(row_number)
+                    continue
+            row_changes = self._diff_row_cells(
+                template, row_number, row_data, current_rows[row_number], fields
+            )
+            changes[row_number] = row_changes
+
+            # Cells that were not written keep their cached display values
+            patched_row: List[Optional[str]] = [None] * len(row_data)
+            for col_index, value in row_changes.items():
+                # Formula results are not known locally, keep them out of the snapshot
+                patched_row[col_index] = None if str(value).startswith("=") else value
+            patched[row_number] = patched_row
+
+        failed: Dict[int, str] = {}
+        changed_rows = sorted(row for row, cells in changes.items() if cells)
+        for chunk_start in range(0, len(changed_rows), BATCH_WRITE_CHUNK_ROWS):
+            chunk = changed_rows[chunk_start : chunk_start + BATCH_WRITE_CHUNK_ROWS]
+            data = []
+            for row_number in chunk:
+                data.extend(
+                    self._cell_ranges(worksheet, row_number, changes[row_number])
+                )
+            try:
+                self.spreadsheet.values_batch_update(
+                    {"valueInputOption": "USER_ENTERED", "data": data}
+                )
+            except Exception as e:
+                logger.error(
+                    f"Cell update of {len(chunk)} rows in {worksheet.title} failed: {str(e)}"
+                )
+                for row_number in changed_rows[chunk_start:]:
+                    failed[row_number] = str(e)
+                break
+
+        cell_counts = {row: len(cells) for row, cells in changes.items()}
+        logger.info(
+            f"Updated {len(changed_rows)}/{len(rows)} rows in {worksheet.title} with {sum(cell_counts.values())} changed cells"
+        )
+        return patched, cell_counts, failed, moved
+
+    def _update_policy_rows(
+        self,
+        worksheet: gspread.Worksheet,
+        headers: List[str],
+        updates: Dict[str, Tuple[int, List[str], Optional[set], str]],
+    ) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, str], Dict[str, str]]:
+        """
+        Write the changed cells of policy rows found through the policy index
+
+        The index and snapshot can be stale together (a row deleted by another
+        worker or directly in Google Sheets), so each row's policy cell is
+        checked in the fresh read before anything is written. When a row holds
+        another policy, both caches are dropped and the policy is looked up
+        again once; it is never written to the row the stale index named.
+
+        Args:
+            worksheet: Target quarter sheet
+            headers: Sheet headers
+            updates: Mapping of normalized policy number to (row found for it,
+                new values, column indices allowed to change data or None for
+                all, policy number)
+
+        Returns:
+            Tuple of (row written per policy; cells written per policy; error
+            per policy whose write request failed; error per policy that is no
+            longer in the sheet)
+        """
+        rows_by_key: Dict[str, int] = {}
+        cell_counts: Dict[str, int] = {}
+        failed: Dict[str, str] = {}
+        missing: Dict[str, str] = {}
+        pending = dict(updates)
+
+        for attempt in range(2):
+            patched, counts, failed_rows, moved = self._write_row_changes(
+                worksheet,
+                headers,
+                {row: (data, fields) for row, data, fields, _ in pending.values()},
+                expected_policies={
+                    row: policy_number for row, _, _, policy_number in pending.values()
+                },
+            )
+            retry = {}
+            for key, (row, data, fields, policy_number) in pending.items():
+                if row in moved:
+                    retry[key] = (row, data, fields, policy_number)
+                elif row in failed_rows:
+                    failed[key] = failed_rows[row]
+                else:
+                    rows_by_key[key] = row
+                    cell_counts[key] = counts[row]
+                    if counts[row]:
+                        self._record_row_write(
+                            worksheet, row, patched[row], policy_number=policy_number
+                        )
+            if not retry:
+                break
+
+            self.snapshot_cache.invalidate(self.document_id, worksheet.title)
+            self.policy_index.invalidate(self.document_id, worksheet.title)
+            pending = {}
+            for key, (row, data, fields, policy_number) in retry.items():
+                found = (
+                    self.find_row_by_policy_number(worksheet, policy_number)
+                    if attempt == 0
+                    else None
+                )
+                if found is None:
+                    missing[key] = (
+                        f"Policy number '{policy_number}' is no longer at row {row} of {worksheet.title} and could not be found again."
+                    )
+                else:
+                    pending[key] = (found["row_number"], data, fields, policy_number)
+            if not pending:
+                break
+
+        return rows_by_key, cell_counts, failed, missing
+
     def _update_formula_references(
         self, formula: str, source_row: int, target_row: int
     ) -> str:
@@ -327,31 +866,7 @@ class QuarterlySheetManager:
             Updated formula with row references adjusted, preserving original structure
         """
         try:
-            import re
-
-            # Pattern to match cell references (e.g., A1, B2, $C$3, etc.)
-            # This matches: optional $, letters, optional $, numbers
-            pattern = r"(\$?)([A-Z]+)(\$?)(\d+)"
-
-            def replace_reference(match):
-                dollar1, col_letters, dollar2, row_num = match.groups()
-                row_num = int(row_num)
-
-                # If row is absolute ($), don't change it
-                if dollar2:
-                    return match.group(0)
-
-                # If the row number matches the source row, update it to target row
-                if row_num == source_row:
-                    row_num = target_row
-                # Otherwise, adjust relative references
-                elif row_num > source_row:
-                    # Relative reference below the source - adjust by the difference
-                    row_num = row_num + (target_row - source_row)
-
-                return f"{dollar1}{col_letters}{dollar2}{row_num}"
-
-            updated_formula = re.sub(pattern, replace_reference, formula)
+            updated_formula = rebase_formula(formula, source_row, target_row)
 
             # REMOVED: Formula improvements - preserve original formula exactly as in template
             # updated_formula = self._improve_formula_for_text_handling(updated_formula)
@@ -456,6 +971,7 @@ class QuarterlySheetManager:
                 rows=1000,
                 cols=len(self.create_quarterly_sheet_headers()),
             )
+            self.worksheet_directory.invalidate()
 
             # Get the Master Template sheet
             try:
@@ -648,51 +1164,29 @@ class QuarterlySheetManager:
                 logger.error("Spreadsheet not initialized")
                 return None
 
-            # Try to get the Master Template sheet
-            try:
-                template_sheet = self.spreadsheet.worksheet(
-                    self.master_template_sheet_name
-                )
-                logger.info(
-                    f"Found Master Template sheet: {self.master_template_sheet_name}"
+            # Try the configured name, then alternative names, then the Master sheet
+            candidate_names = [
+                self.master_template_sheet_name,
+                "Master Template",
+                "Template",
+                "Master_Template",
+                "MasterTemplate",
+                "Master",
+            ]
+            template_sheet = self.worksheet_directory.first_of(candidate_names)
+            if template_sheet is None:
+                logger.error(
+                    "No suitable template sheet found (Master Template, Template, or Master)"
                 )
-                return template_sheet
-            except gspread.WorksheetNotFound:
+                return None
+
+            if template_sheet.title == "Master":
                 logger.warning(
-                    f"Master Template sheet '{self.master_template_sheet_name}' not found"
+                    "Using 'Master' sheet as template since 'Master Template' not found"
                 )
-
-                # Try alternative names
-                alternative_names = [
-                    "Master Template",
-                    "Template",
-                    "Master_Template",
-                    "MasterTemplate",
-                ]
-                for alt_name in alternative_names:
-                    try:
-                        template_sheet = self.spreadsheet.worksheet(alt_name)
-                        logger.info(
-                            f"Found Master Template sheet with alternative name: {alt_name}"
-                        )
-                        self.master_template_sheet_name = alt_name  # Update the name
-                        return template_sheet
-                    except gspread.WorksheetNotFound:
-                        continue
-
-                # If no template sheet found, check if we can use Master sheet as template
-                try:
-                    master_sheet = self.spreadsheet.worksheet("Master")
-                    logger.warning(
-                        "Using 'Master' sheet as template since 'Master Template' not found"
-                    )
-                    self.master_template_sheet_name = "Master"
-                    return master_sheet
-                except gspread.WorksheetNotFound:
-                    logger.error(
-                        "No suitable template sheet found (Master Template, Template, or Master)"
-                    )
-                    return None
+            self.master_template_sheet_name = template_sheet.title
+            logger.debug(f"Found Master Template sheet: {template_sheet.title}")
+            return template_sheet
 
         except Exception as e:
             logger.error(f"Error getting master template sheet: {str(e)}")
@@ -705,34 +1199,23 @@ class QuarterlySheetManager:
                 logger.error("Spreadsheet not initialized")
                 return None
 
-            # Try to get the Summary sheet
-            try:
-                summary_sheet = self.spreadsheet.worksheet("Summary")
-                logger.info("Found Summary sheet")
-                return summary_sheet
-            except gspread.WorksheetNotFound:
-                logger.warning("Summary sheet not found")
-
-                # Try alternative names for summary sheet
-                alternative_names = [
+            # Try the Summary sheet, then alternative names
+            summary_sheet = self.worksheet_directory.first_of(
+                [
+                    "Summary",
                     "SUMMARY",
                     "Summary Report",
                     "Agent Summary",
                     "Financial Summary",
                 ]
-                for alt_name in alternative_names:
-                    try:
-                        summary_sheet = self.spreadsheet.worksheet(alt_name)
-                        logger.info(
-                            f"Found Summary sheet with alternative name: {alt_name}"
-                        )
-                        return summary_sheet
-                    except gspread.WorksheetNotFound:
-                        continue
-
+            )
+            if summary_sheet is None:
                 logger.error("No Summary sheet found with any expected name")
                 return None
 
+            logger.debug(f"Found Summary sheet: {summary_sheet.title}")
+            return summary_sheet
+
         except Exception as e:
             logger.error(f"Error getting summary sheet: {str(e)}")
             return None
@@ -744,35 +1227,24 @@ class QuarterlySheetManager:
                 logger.error("Spreadsheet not initialized")
                 return None
 
-            # Try to get the Broker sheet
-            try:
-                broker_sheet = self.spreadsheet.worksheet("Broker Sheet")
-                logger.info("Found Broker Sheet")
-                return broker_sheet
-            except gspread.WorksheetNotFound:
-                logger.warning("Broker Sheet not found")
-
-                # Try alternative names for broker sheet
-                alternative_names = [
+            # Try the Broker Sheet, then alternative names
+            broker_sheet = self.worksheet_directory.first_of(
+                [
+                    "Broker Sheet",
                     "Broker",
                     "BROKER SHEET",
                     "Broker Data",
                     "Brokers",
                     "Broker Report",
                 ]
-                for alt_name in alternative_names:
-                    try:
-                        broker_sheet = self.spreadsheet.worksheet(alt_name)
-                        logger.info(
-                            f"Found Broker sheet with alternative name: {alt_name}"
-                        )
-                        return broker_sheet
-                    except gspread.WorksheetNotFound:
-                        continue
-
+            )
+            if broker_sheet is None:
                 logger.error("No Broker sheet found with any expected name")
                 return None
 
+            logger.debug(f"Found Broker sheet: {broker_sheet.title}")
+            return broker_sheet
+
         except Exception as e:
             logger.error(f"Error getting broker sheet: {str(e)}")
             return None
@@ -1092,14 +1564,388 @@ class QuarterlySheetManager:
 
     def create_quarterly_sheet_headers(self) -> List[str]:
         """Create headers for quarterly sheet from Master Template"""
+        # Master Template headers rarely change; re-read them on the template check interval
+        if (
+            self._template_headers
+            and time.monotonic() - self._template_headers_loaded_at
+            < self.template_cache.check_interval_seconds
+        ):
+            return list(self._template_headers)
+
         # Get data headers from Master Template
         complete_headers = self.load_master_template_headers()
+        self._template_headers = list(complete_headers)
+        self._template_headers_loaded_at = time.monotonic()
 
         logger.info(
             f"Created quarterly sheet headers with {len(complete_headers)} data columns from Master Template"
         )
         return complete_headers
 
+    def get_worksheet_snapshot(
+        self, worksheet: gspread.Worksheet, force_refresh: bool = False
+    ) -> SheetSnapshot:
+        """
+        Get all values of a worksheet, served from the snapshot cache when fresh
+
+        Args:
+            worksheet: Worksheet to read
+            force_refresh: Bypass the cache and download the sheet again
+
+        Returns:
+            SheetSnapshot whose ``values`` match ``worksheet.get_all_values()``
+        """
+
+        def load_values() -> List[List[str]]:
+            try:
+                return worksheet.get_all_values()
+            except gspread.exceptions.APIError:
+                # The cached worksheet may have been deleted or recreated
+                self.worksheet_directory.invalidate()
+                raise
+
+        return self.snapshot_cache.get(
+            self.document_id,
+            worksheet.title,
+            load_values,
+            force_refresh=force_refresh,
+        )
+
+    def get_quarter_sheet_snapshot(
+        self, quarter: int, year: int, force_refresh: bool = False
+    ) -> Optional[SheetSnapshot]:
+        """Get the cached snapshot of a quarter sheet, or None if the sheet does not exist"""
+        sheet_name = self.get_quarterly_sheet_name(quarter, year)
+
+        if not force_refresh:
+            snapshot = self.snapshot_cache.peek(self.document_id, sheet_name)
+            if snapshot is not None:
+                return snapshot
+
+        worksheet = self.get_quarterly_sheet(quarter, year)
+        if not worksheet:
+            return None
+        return self.get_worksheet_snapshot(worksheet, force_refresh=force_refresh)
+
+    async def aget_worksheet_snapshot(
+        self, worksheet_title: str, force_refresh: bool = False
+    ) -> SheetSnapshot:
+        """
+        Async variant of ``get_worksheet_snapshot`` using the native async client
+
+        Args:
+            worksheet_title: Title of the worksheet to read
+            force_refresh: Bypass the cache and download the sheet again
+
+        Returns:
+            SheetSnapshot shared with the sync read path
+        """
+
+        async def load_values() -> List[List[str]]:
+            try:
+                return await self.async_client.get_all_values(worksheet_title)
+            except AsyncSheetsError:
+                self.worksheet_directory.invalidate()
+                raise
+
+        return await self.snapshot_cache.aget(
+            self.document_id,
+            worksheet_title,
+            load_values,
+            force_refresh=force_refresh,
+        )
+
+    async def aget_quarter_sheet_snapshot(
+        self, quarter: int, year: int, force_refresh: bool = False
+    ) -> Optional[SheetSnapshot]:
+        """Async variant of ``get_quarter_sheet_snapshot``"""
+        sheet_name = self.get_quarterly_sheet_name(quarter, year)
+
+        if not force_refresh:
+            snapshot = self.snapshot_cache.peek(self.document_id, sheet_name)
+            if snapshot is not None:
+                return snapshot
+
+        # A directory refresh goes through gspread, so keep it off the event loop
+        if not await asyncio.to_thread(self.sheet_exists, sheet_name):
+            return None
+        return await self.aget_worksheet_snapshot(
+            sheet_name, force_refresh=force_refresh
+        )
+
+    async def aget_sheet_values(self, worksheet_title: str) -> List[List[str]]:
+        """Read every value of a worksheet without caching (e.g. Summary sheets)"""
+        return await self.async_client.get_all_values(worksheet_title)
+
+    def _record_row_write(
+        self,
+        worksheet: gspread.Worksheet,
+        row_number: int,
+        row_values: Sequence[Optional[str]],
+        policy_number: Optional[str] = None,
+    ) -> None:
+        """
+        Patch the cached snapshot and policy index after writing data values to a row
+
+        ``row_values`` are the values written from column A; None marks cells
+        (such as formulas) whose value is not known locally.
+        """
+        try:
+            self.snapshot_cache.patch_row(
+                self.document_id, worksheet.title, row_number, row_values
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not patch snapshot for {worksheet.title}, invalidating: {str(e)}"
+            )
+            self.snapshot_cache.invalidate(self.document_id, worksheet.title)
+
+        if policy_number:
+            self.policy_index.record_row(
+                (self.document_id, worksheet.title), policy_number, row_number
+            )
+
+    def _record_row_delete(self, worksheet: gspread.Worksheet, row_number: int) -> None:
+        """Update caches after a row was deleted (rows below shift up by one)"""
+        key = (self.document_id, worksheet.title)
+        self.snapshot_cache.invalidate(self.document_id, worksheet.title)
+        self.policy_index.record_delete(key, row_number)
+
+    def _index_from_snapshot(self, key: Tuple[str, str], snapshot: SheetSnapshot):
+        """Build a worksheet's policy index from an already downloaded snapshot"""
+        headers = snapshot.headers
+        policy_col_index = find_policy_column(headers)
+        if policy_col_index == -1:
+            return None
+        column_values = [
+            row[policy_col_index] if policy_col_index < len(row) else ""
+            for row in snapshot.values
+        ]
+        return self.policy_index.set_index(key, headers, column_values)
+
+    def _build_policy_index(self, worksheet: gspread.Worksheet):
+        """Rebuild the policy index of a worksheet from one column read"""
+        key = (self.document_id, worksheet.title)
+
+        # A fresh snapshot already holds the column, no network call needed
+        snapshot = self.snapshot_cache.peek(self.document_id, worksheet.title)
+        if snapshot is not None:
+            return self._index_from_snapshot(key, snapshot)
+
+        headers = worksheet.row_values(1)
+        policy_col_index = find_policy_column(headers)
+        if policy_col_index == -1:
+            return None
+        column_values = worksheet.col_values(policy_col_index + 1)
+        return self.policy_index.set_index(key, headers, column_values)
+
+    def _read_row(self, worksheet: gspread.Worksheet, row_number: int) -> List[str]:
+        """Read one row, from a fresh snapshot when available"""
+        snapshot = self.snapshot_cache.peek(self.document_id, worksheet.title)
+        if snapshot is not None:
+            if row_number <= snapshot.row_count:
+                return list(snapshot.values[row_number - 1])
+            return []
+        return worksheet.row_values(row_number)
+
+    def find_row_by_policy_number(
+        self, worksheet: gspread.Worksheet, policy_number: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Locate a policy in a worksheet using the policy row index
+
+        The indexed row is read back and its policy number checked, so an index
+        made stale by edits in Google Sheets is rebuilt instead of trusted. The
+        read may come from the snapshot, which can be stale along with the
+        index, so writers check the row again in a fresh read before writing
+        (``_update_policy_rows``).
+
+        Args:
+            worksheet: Quarter sheet to search
+            policy_number: Policy number to find (compared normalized)
+
+        Returns:
+            Dict with row_number, headers and values of the row, or None if the
+            policy (or the policy number column) is not in the sheet
+        """
+        key = (self.document_id, worksheet.title)
+        builder = lambda: self._build_policy_index(worksheet)  # noqa: E731
+        target = self.policy_index.normalize(policy_number)
+
+        for attempt in range(2):
+            if attempt == 0:
+                row_number, index = self.policy_index.lookup(
+                    key, policy_number, builder
+                )
+            else:
+                index = self.policy_index.get_index(key, builder, force_rebuild=True)
+                row_number = index.rows.get(target) if index else None
+
+            if index is None or row_number is None:
+                return None
+
+            row_values = self._read_row(worksheet, row_number)
+            cell = (
+                row_values[index.policy_col_index]
+                if index.policy_col_index < len(row_values)
+                else ""
+            )
+            if self.policy_index.normalize(cell) == target:
+                return {
+                    "row_number": row_number,
+                    "headers": index.headers,
+                    "values": row_values,
+                }
+
+            logger.info(
+                f"Policy index for {worksheet.title} was stale at row {row_number}, rebuilding"
+            )
+            self.snapshot_cache.invalidate(self.document_id, worksheet.title)
+
+        return None
+
+    def delete_row_by_policy_number(
+        self, worksheet: gspread.Worksheet, policy_number: str
+    ) -> Optional[int]:
+        """
+        Delete a policy's row from a quarter sheet and shift the caches
+
+        The row found through the policy index is read back from the sheet
+        (not the snapshot, which can be stale along with the index) and its
+        policy number checked before the delete. On a mismatch both caches are
+        dropped and the policy is looked up again once.
+
+        Args:
+            worksheet: Quarter sheet to delete from
+            policy_number: Policy number of the row to delete
+
+        Returns:
+            The deleted row number, or None if the policy is not in the sheet
+
+        Raises:
+            ValueError: If the policy's row kept moving while it was looked up
+        """
+        target = self.policy_index.normalize(policy_number)
+        for _ in range(2):
+            found = self.find_row_by_policy_number(worksheet, policy_number)
+            if found is None:
+                return None
+            row_number = found["row_number"]
+            current = self._read_rows(worksheet, [row_number])[row_number]
+            policy_col_index = find_policy_column(found["headers"])
+            cell = (
+                current[policy_col_index] if policy_col_index < len(current) else ""
+            )
+            if self.policy_index.normalize(cell) == target:
+                worksheet.delete_rows(row_number)
+                # Rows below shifted up, so the caches must follow
+                self._record_row_delete(worksheet, row_number)
+                return row_number
+
+            logger.warning(
+                f"Row {row_number} of {worksheet.title} no longer holds policy '{policy_number}', looking it up again"
+            )
+            self.snapshot_cache.invalidate(self.document_id, worksheet.title)
+            self.policy_index.invalidate(self.document_id, worksheet.title)
+
+        raise ValueError(
+            f"Row of policy '{policy_number}' in {worksheet.title} moved while it was being deleted"
+        )
+
+    async def _abuild_policy_index(self, worksheet_title: str):
+        """Async variant of ``_build_policy_index`` using the native async client"""
+        key = (self.document_id, worksheet_title)
+
+        snapshot = self.snapshot_cache.peek(self.document_id, worksheet_title)
+        if snapshot is not None:
+            return self._index_from_snapshot(key, snapshot)
+
+        sheet_range = quote_sheet_title(worksheet_title)
+        header_rows = await self.async_client.values_get(f"{sheet_range}!1:1")
+        headers = header_rows[0] if header_rows else []
+        policy_col_index = find_policy_column(headers)
+        if policy_col_index == -1:
+            return None
+
+        col_letter = self._col_to_a1(policy_col_index + 1)
+        columns = await self.async_client.values_get(
+            f"{sheet_range}!{col_letter}:{col_letter}", major_dimension="COLUMNS"
+        )
+        return self.policy_index.set_index(
+            key, headers, columns[0] if columns else []
+        )
+
+    async def _aread_row(self, worksheet_title: str, row_number: int) -> List[str]:
+        """Async variant of ``_read_row``"""
+        snapshot = self.snapshot_cache.peek(self.document_id, worksheet_title)
+        if snapshot is not None:
+            if row_number <= snapshot.row_count:
+                return list(snapshot.values[row_number - 1])
+            return []
+        rows = await self.async_client.values_get(
+            f"{quote_sheet_title(worksheet_title)}!{row_number}:{row_number}"
+        )
+        return rows[0] if rows else []
+
+    async def afind_row_by_policy_number(
+        self, worksheet_title: str, policy_number: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of ``find_row_by_policy_number``
+
+        Args:
+            worksheet_title: Title of the quarter sheet to search
+            policy_number: Policy number to find (compared normalized)
+
+        Returns:
+            Dict with row_number, headers and values of the row, or None
+        """
+        key = (self.document_id, worksheet_title)
+        target = self.policy_index.normalize(policy_number)
+        if not target:
+            return None
+
+        for attempt in range(2):
+            index = self.policy_index.current(key) if attempt == 0 else None
+            if index is None:
+                index = await self._abuild_policy_index(worksheet_title)
+            if index is None:
+                return None
+
+            row_number = index.rows.get(target)
+            if row_number is None:
+                if attempt == 0 and self.policy_index.refresh_on_miss(index):
+                    continue
+                return None
+
+            row_values = await self._aread_row(worksheet_title, row_number)
+            cell = (
+                row_values[index.policy_col_index]
+                if index.policy_col_index < len(row_values)
+                else ""
+            )
+            if self.policy_index.normalize(cell) == target:
+                return {
+                    "row_number": row_number,
+                    "headers": index.headers,
+                    "values": row_values,
+                }
+
+            logger.info(
+                f"Policy index for {worksheet_title} was stale at row {row_number}, rebuilding"
+            )
+            self.snapshot_cache.invalidate(self.document_id, worksheet_title)
+
+        return None
+
+    def _policy_number_from_record(self, record_data: Dict[str, Any]) -> str:
+        """Extract the policy number from record data keyed by header or field name"""
+        return str(
+            record_data.get("Policy number", "")
+            or record_data.get("policy_number", "")
+            or ""
+        )
+
     def get_quarterly_sheet_name(self, quarter: int, year: int) -> str:
         """Generate quarterly sheet name"""
         return f"Q{quarter}-{year}"
@@ -1110,9 +1956,7 @@ class QuarterlySheetManager:
             if not self.spreadsheet:
                 return False
 
-            worksheet_list = self.spreadsheet.worksheets()
-            existing_names = [ws.title for ws in worksheet_list]
-            return sheet_name in existing_names
+            return self.worksheet_directory.exists(sheet_name)
         except Exception as e:
             logger.error(f"Error checking if sheet exists: {str(e)}")
             return False
@@ -1123,8 +1967,9 @@ class QuarterlySheetManager:
             quarter_name, quarter, year = self.get_current_quarter_info()
 
             # Check if current quarter sheet exists
-            if self.sheet_exists(quarter_name):
-                return self.spreadsheet.worksheet(quarter_name)
+            worksheet = self.worksheet_directory.get(quarter_name)
+            if worksheet is not None:
+                return worksheet
             else:
                 logger.warning(
                     f"Current quarter sheet {quarter_name} does not exist. Sheet creation is handled by Google Apps Script."
@@ -1143,8 +1988,9 @@ class QuarterlySheetManager:
             quarter_name = self.get_quarterly_sheet_name(quarter, year)
 
             # Check if the specified quarter sheet exists
-            if self.sheet_exists(quarter_name):
-                return self.spreadsheet.worksheet(quarter_name)
+            worksheet = self.worksheet_directory.get(quarter_name)
+            if worksheet is not None:
+                return worksheet
             else:
                 logger.warning(f"Quarter sheet {quarter_name} does not exist")
                 return None
@@ -1153,6 +1999,142 @@ class QuarterlySheetManager:
             logger.error(f"Error getting quarter sheet Q{quarter}-{year}: {str(e)}")
             return None
 
+    def _record_to_row(
+        self, record_data: Dict[str, Any], headers: List[str]
+    ) -> List[str]:
+        """Order record values by sheet headers, accepting header or snake_case keys"""
+        row_data = []
+        for header in headers:
+            value = record_data.get(header, "") or record_data.get(
+                header.replace(" ", "_").lower(), ""
+            )
+            row_data.append(str(value) if value else "")
+        return row_data
+
+    def _append_record_rows(
+        self,
+        worksheet: gspread.Worksheet,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_numbers: List[Optional[str]],
+    ) -> Tuple[int, Optional[str]]:
+        """
+        Append records to a quarter sheet and fill in their template formulas
+
+        The data goes in with one values.append (INSERT_ROWS) call, which picks
+        the rows server-side, so concurrent writers never share a row.
+        Formulas refer to their own row, so they are rendered for the rows the
+        API reports and written with a second, formula-only batch update: one
+        range per calculated column for the whole block, plus single cells for
+        template formulas that only fill blank data cells.
+
+        Args:
+            worksheet: Target quarter sheet
+            headers: Sheet headers
+            rows: Data values of each record, ordered by headers
+            policy_numbers: Policy number of each record, for the policy index
+
+        Returns:
+            Tuple of (first appended row, error of the formula write or None)
+        """
+        first_row = append_rows(worksheet, rows, "USER_ENTERED")
+        last_row = first_row + len(rows) - 1
+        numbered = {first_row + offset: row for offset, row in enumerate(rows)}
+        built = self._build_rows_with_formulas(worksheet, headers, numbered)
+
+        data: List[Dict[str, Any]] = []
+        filled_columns: List[int] = []
+        try:
+            # Already compiled by _build_rows_with_formulas, so no API call
+            template = self._get_compiled_template(worksheet, headers)
+            data, filled_columns = self._formula_column_ranges(
+                worksheet, template, first_row, last_row
+            )
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Could not get formulas from template row 2 of {worksheet.title}: {str(e)}"
+            )
+
+        for row_number in sorted(built):
+            row_data = numbered[row_number]
+            formulas = {
+                col_index: value
+                for col_index, value in enumerate(built[row_number])
+                if col_index not in filled_columns
+                and str(value).startswith("=")
+                and (col_index >= len(row_data) or row_data[col_index] != value)
+            }
+            if formulas:
+                data.extend(self._cell_ranges(worksheet, row_number, formulas))
+
+        formula_error = None
+        if data:
+            try:
+                self.spreadsheet.values_batch_update(
+                    {"valueInputOption": "USER_ENTERED", "data": data}
+                )
+            except Exception as e:
+                formula_error = f"Row data was appended but formulas were not written: {str(e)}"
+                logger.error(
+                    f"Formula write for rows {first_row}-{last_row} of {worksheet.title} failed: {str(e)}"
+                )
+
+        self._record_rows_appended(
+            worksheet,
+            first_row,
+            [
+                [None if str(value).startswith("=") else value for value in built[row]]
+                for row in sorted(built)
+            ],
+            policy_numbers,
+        )
+        return first_row, formula_error
+
+    def _record_rows_appended(
+        self,
+        worksheet: gspread.Worksheet,
+        first_row: int,
+        rows: List[List[Optional[str]]],
+        policy_numbers: List[Optional[str]],
+    ) -> None:
+        """Update the caches after rows were inserted starting at ``first_row``"""
+        snapshot = self.snapshot_cache.peek(self.document_id, worksheet.title)
+        if snapshot is not None and first_row <= snapshot.row_count:
+            # The table ended at a blank row, so the insert shifted rows below it
+            self.snapshot_cache.invalidate(self.document_id, worksheet.title)
+            self.policy_index.invalidate(self.document_id, worksheet.title)
+            return
+        for offset, (values, policy_number) in enumerate(zip(rows, policy_numbers)):
+            self._record_row_write(
+                worksheet, first_row + offset, values, policy_number=policy_number
+            )
+
+    def _append_record_row(
+        self, worksheet: gspread.Worksheet, record_data: Dict[str, Any]
+    ) -> int:
+        """
+        Append a record to a quarter sheet with its template formulas
+
+        Returns:
+            The 1-based row number the record was written to
+        """
+        headers = self.create_quarterly_sheet_headers()
+        row_data = self._record_to_row(record_data, headers)
+
+        # A failed formula write is logged; appending again would duplicate
+        # the record, and the next update of the policy restores the formulas
+        next_row, _ = self._append_record_rows(
+            worksheet,
+            headers,
+            [row_data],
+            [self._policy_number_from_record(record_data)],
+        )
+
+        logger.info(
+            f"Inserted record with formulas to row {next_row} in {worksheet.title}"
+        )
+        return next_row
+
     def route_new_record_to_current_quarter(
         self, record_data: Dict[str, Any], operation_type: str = "CREATE"
     ) -> Dict[str, Any]:
@@ -1176,41 +2158,8 @@ class QuarterlySheetManager:
                     "error": "Could not access current quarter sheet",
                 }
 
-            # Get headers
-            headers = self.create_quarterly_sheet_headers()
-
-            # Prepare row data
-            row_data = []
-            for header in headers:
-                value = record_data.get(header, "") or record_data.get(
-                    header.replace(" ", "_").lower(), ""
-                )
-                row_data.append(str(value) if value else "")
-
-            # Find next empty row
-            next_row = self._find_next_empty_row(current_sheet)
-            logger.info(f"Found next empty row: {next_row} in quarter sheet")
-
-            # First, add the actual record data
-            range_notation = f"A{next_row}:{self._col_to_a1(len(headers))}{next_row}"
-            logger.info(f"Inserting policy data to range: {range_notation}")
-            current_sheet.update(
-                range_notation, [row_data], value_input_option="USER_ENTERED"
-            )
-            logger.info(f"Successfully inserted policy data to row {next_row}")
-
-            # Then, copy ONLY the formulas from row 2 to the new row (preserving our data)
-            logger.info(
-                f"Starting formula copy process from template row 2 to row {next_row}"
-            )
-            formula_copy_success = self._copy_formulas_only_to_row(
-                current_sheet, next_row
-            )
-
-            if formula_copy_success:
-                logger.info(f"✅ Formula copy to row {next_row} completed successfully")
-            else:
-                logger.warning(f"⚠️ Formula copy to row {next_row} failed or had issues")
+            # Write data and template formulas to the next free row in one request
+            next_row = self._append_record_row(current_sheet, record_data)
 
             quarter_name, quarter, year = self.get_current_quarter_info()
 
@@ -1246,10 +2195,10 @@ class QuarterlySheetManager:
         try:
             # Get specific quarter sheet
             quarter_name = f"Q{quarter}-{year}"
-            try:
-                target_sheet = self.spreadsheet.worksheet(quarter_name)
+            target_sheet = self.worksheet_directory.get(quarter_name)
+            if target_sheet is not None:
                 logger.info(f"Found target quarter sheet: {quarter_name}")
-            except gspread.WorksheetNotFound:
+            else:
                 logger.error(
                     f"Quarter sheet {quarter_name} not found. Sheet creation is handled by Google Apps Script."
                 )
@@ -1258,36 +2207,8 @@ class QuarterlySheetManager:
                     "error": f"Quarter sheet {quarter_name} does not exist. Sheets must be created via Google Apps Script.",
                 }
 
-            # Get headers
-            headers = self.create_quarterly_sheet_headers()
-
-            # Prepare row data
-            row_data = []
-            for header in headers:
-                value = record_data.get(header, "") or record_data.get(
-                    header.replace(" ", "_").lower(), ""
-                )
-                row_data.append(str(value) if value else "")
-
-            # Find next empty row
-            next_row = self._find_next_empty_row(target_sheet)
-
-            # First, add the actual record data
-            range_notation = f"A{next_row}:{self._col_to_a1(len(headers))}{next_row}"
-            target_sheet.update(
-                range_notation, [row_data], value_input_option="USER_ENTERED"
-            )
-
-            # Then, copy ONLY the formulas from row 2 to the new row (preserving our data)
-            logger.info(
-                f"DEBUG: About to copy formulas to new record at row {next_row} in {quarter_name}"
-            )
-            formula_copy_success = self._copy_formulas_only_to_row(
-                target_sheet, next_row
-            )
-            logger.info(
-                f"DEBUG: Formula copy to new record row {next_row} in {quarter_name} success: {formula_copy_success}"
-            )
+            # Write data and template formulas to the next free row in one request
+            next_row = self._append_record_row(target_sheet, record_data)
 
             logger.info(
                 f"Successfully {operation_type.lower()}d record to {quarter_name} at row {next_row} with formulas"
@@ -1302,32 +2223,24 @@ class QuarterlySheetManager:
             return {"success": False, "error": str(e)}
 
     def _find_next_empty_row(self, worksheet: gspread.Worksheet) -> int:
-        """Find the next empty row in the worksheet"""
-        try:
-            # Get all values from the worksheet to find the actual last row with data
-            all_values = worksheet.get_all_values()
-
-            # Find the last row that contains any data
-            last_row_with_data = 0
-            for i, row in enumerate(all_values):
-                if any(cell.strip() for cell in row):
-                    last_row_with_data = i + 1  # gspread uses 1-based indexing
-
-            # Next empty row is the one after the last row with data
-            next_row = last_row_with_data + 1
-
-            # Ensure we don't overwrite the header row (row 1) or template formulas row (row 2)
-            if next_row <= 2:
-                next_row = 3  # Start from row 3 to preserve template formulas in row 2
-
-            logger.info(
-                f"Found next empty row: {next_row} (last data row was: {last_row_with_data})"
-            )
-            return next_row
+        """
+        Find the row after the last one holding any data, from a fresh read
 
-        except Exception as e:
-            logger.error(f"Error finding next empty row: {str(e)}")
-            return 2
+        Only for diagnostics; records are added with ``_append_record_rows``,
+        which cannot collide with other writers.
+        """
+        all_values = worksheet.get_all_values()
+        last_row_with_data = 0
+        for i, row in enumerate(all_values):
+            if any(cell.strip() for cell in row):
+                last_row_with_data = i + 1
+
+        # Start from row 3 to preserve the header (row 1) and template formulas (row 2)
+        next_row = max(last_row_with_data + 1, 3)
+        logger.info(
+            f"Found next empty row: {next_row} (last data row was: {last_row_with_data})"
+        )
+        return next_row
 
     def test_formula_copying(
         self, sheet_name: Optional[str] = None, target_row: Optional[int] = None
@@ -1345,9 +2258,8 @@ class QuarterlySheetManager:
         try:
             # Get the worksheet to test on
             if sheet_name:
-                try:
-                    worksheet = self.spreadsheet.worksheet(sheet_name)
-                except gspread.WorksheetNotFound:
+                worksheet = self.worksheet_directory.get(sheet_name)
+                if worksheet is None:
                     return {
                         "success": False,
                         "error": f"Sheet '{sheet_name}' not found",
@@ -1497,10 +2409,10 @@ class QuarterlySheetManager:
         try:
             sheet_name = self.get_quarterly_sheet_name(quarter, year)
 
-            if not self.sheet_exists(sheet_name):
+            worksheet = self.worksheet_directory.get(sheet_name)
+            if worksheet is None:
                 return {"exists": False, "sheet_name": sheet_name}
 
-            worksheet = self.spreadsheet.worksheet(sheet_name)
             all_records = worksheet.get_all_records()
 
             # Count records by match
@@ -1529,21 +2441,34 @@ class QuarterlySheetManager:
             logger.error(f"Error getting quarter summary: {str(e)}")
             return {"exists": False, "error": str(e)}
 
+    def _field_columns(
+        self, headers: List[str], fields: Optional[List[str]]
+    ) -> Optional[set]:
+        """Column indices of ``fields`` (None means every column may change)"""
+        if fields is None:
+            return None
+        wanted = set(fields)
+        return {i for i, header in enumerate(headers) if header in wanted}
+
     def update_existing_record_by_policy_number(
         self,
         record_data: Dict[str, Any],
         policy_number: str,
         quarter: Optional[int] = None,
         year: Optional[int] = None,
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Find and update an existing record by policy number in a specific or current quarter sheet
 
+        Only the cells that differ from the sheet are written.
+
         Args:
             record_data: The updated record data
             policy_number: Policy number to search for
             quarter: Optional specific quarter (1-4) to search in
             year: Optional specific year to search in
+            fields: Optional headers allowed to change; other data cells are kept
 
         Returns:
             Success status and details
@@ -1552,10 +2477,10 @@ class QuarterlySheetManager:
             # Get target quarter sheet
             if quarter and year:
                 quarter_name = f"Q{quarter}-{year}"
-                try:
-                    target_sheet = self.spreadsheet.worksheet(quarter_name)
+                target_sheet = self.worksheet_directory.get(quarter_name)
+                if target_sheet is not None:
                     logger.info(f"Targeting specific quarter sheet: {quarter_name}")
-                except gspread.WorksheetNotFound:
+                else:
                     logger.warning(
                         f"Quarter sheet {quarter_name} not found, falling back to current quarter"
                     )
@@ -1571,67 +2496,46 @@ class QuarterlySheetManager:
                     "error": "Could not access target quarter sheet",
                 }
 
-            # Get all records to find the one with matching policy number
-            all_values = target_sheet.get_all_values()
-            headers = all_values[0] if all_values else []
-
-            # Find policy number column index
-            policy_col_index = -1
-            for i, header in enumerate(headers):
-                if header.lower().strip() in ["policy number", "policy_number"]:
-                    policy_col_index = i
-                    break
-
-            if policy_col_index == -1:
-                return {
-                    "success": False,
-                    "error": "Policy number column not found in sheet",
-                }
+            # Look up the row through the policy number index
+            found = self.find_row_by_policy_number(target_sheet, policy_number)
 
-            # Find the row with matching policy number
-            target_row = -1
-            # Skip header (row 1) and dummy/formula row (row 2)
-            for row_index, row_data in enumerate(all_values[2:], start=3):
-                if policy_col_index < len(row_data):
-                    if row_data[policy_col_index].strip() == policy_number.strip():
-                        target_row = row_index
-                        break
-
-            if target_row == -1:
+            if found is None:
                 # Policy number not found - do NOT create new record, return error instead
                 logger.error(
-                    f"Policy number '{policy_number}' not found in quarter sheet '{quarter_name}'. Available policy numbers in sheet: {[row[policy_col_index] for row in all_values[1:] if policy_col_index < len(row)][:10]}"
-                )  # Show first 10 for debugging
+                    f"Policy number '{policy_number}' not found in quarter sheet '{quarter_name}'"
+                )
                 return {
                     "success": False,
                     "error": f"Policy number '{policy_number}' not found in quarter sheet '{quarter_name}' for update. Use create endpoint to add new policies.",
                 }
 
+            target_row = found["row_number"]
+
             logger.info(
                 f"Found policy '{policy_number}' at row {target_row} in quarter sheet '{quarter_name}'"
             )
 
             # Prepare updated row data
             quarterly_headers = self.create_quarterly_sheet_headers()
-            updated_row_data = []
-            for header in quarterly_headers:
-                value = record_data.get(header, "") or record_data.get(
-                    header.replace(" ", "_").lower(), ""
-                )
-                updated_row_data.append(str(value) if value else "")
+            updated_row_data = self._record_to_row(record_data, quarterly_headers)
 
-            # Update the existing row
-            range_notation = (
-                f"A{target_row}:{self._col_to_a1(len(quarterly_headers))}{target_row}"
-            )
-            target_sheet.update(
-                range_notation, [updated_row_data], value_input_option="USER_ENTERED"
-            )
-
-            # Copy formulas to the updated row (preserving our data but updating calculated fields)
-            formula_copy_success = self._copy_formulas_only_to_row(
-                target_sheet, target_row
+            # Write only the changed cells (and formulas whose template changed)
+            key = self.policy_index.normalize(policy_number)
+            rows_by_key, cell_counts, failed, missing = self._update_policy_rows(
+                target_sheet,
+                quarterly_headers,
+                {
+                    key: (
+                        target_row,
+                        updated_row_data,
+                        self._field_columns(quarterly_headers, fields),
+                        policy_number,
+                    )
+                },
             )
+            if key in failed or key in missing:
+                return {"success": False, "error": {**failed, **missing}[key]}
+            target_row = rows_by_key[key]
 
             # Use the determined quarter info (either specified or current)
             final_quarter_name = f"Q{quarter}-{year}"
@@ -1646,12 +2550,213 @@ class QuarterlySheetManager:
                 "row_number": target_row,
                 "operation": "UPDATE",
                 "policy_number": policy_number,
+                "cells_written": cell_counts[key],
             }
 
         except Exception as e:
             logger.error(f"Error updating existing record by policy number: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    def sync_records_batch(
+        self, quarter: int, year: int, entries: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Write many records to one quarter sheet
+
+        Each entry is {"policy_number", "record_data", "operation"} with an
+        optional "fields" list of headers allowed to change. A CREATE appends a
+        row, like ``route_new_record_to_current_quarter``; later entries for
+        the same policy in the batch are folded into that append. An UPDATE
+        rewrites the row found by policy number, writing only the cells that
+        differ, and fails when the policy is not in the sheet, as in
+        ``update_existing_record_by_policy_number``. Changed cells go out in
+        chunked values.batchUpdate calls, new rows in chunked values.append
+        calls followed by their template formulas.
+
+        A failed API request is not turned into per-record errors: once every
+        entry has its result, ``SheetBatchWriteError`` is raised with them.
+
+        Args:
+            quarter: Target quarter (1-4)
+            year: Target year
+            entries: Records to write, applied in order (later entries win)
+
+        Returns:
+            One result per entry, in order, shaped like the single-record methods
+
+        Raises:
+            SheetBatchWriteError: A cell update or append request failed
+        """
+        sheet_name = self.get_quarterly_sheet_name(quarter, year)
+        worksheet = self.worksheet_directory.get(sheet_name)
+        if worksheet is None:
+            error = f"Quarter sheet {sheet_name} does not exist. Sheets must be created via Google Apps Script."
+            return [{"success": False, "error": error} for _ in entries]
+
+        headers = self.create_quarterly_sheet_headers()
+        lookups = sum(
+            1
+            for entry in entries
+            if str(entry.get("operation") or "CREATE").upper() != "CREATE"
+        )
+        if lookups > 1:
+            # One download serves every policy lookup and row check below
+            self.get_worksheet_snapshot(worksheet)
+
+        updates: Dict[str, Tuple[int, List[str], Optional[set], str]] = {}
+        appends: Dict[str, Tuple[List[str], str]] = {}
+        targets: List[Tuple[str, Any]] = []
+        for entry in entries:
+            policy_number = str(entry.get("policy_number") or "")
+            key = self.policy_index.normalize(policy_number)
+            row_data = self._record_to_row(entry.get("record_data") or {}, headers)
+            operation = str(entry.get("operation") or "CREATE").upper()
+
+            if key and key in appends:
+                appends[key] = (row_data, policy_number)
+                targets.append(("append", key))
+                continue
+
+            if operation == "CREATE":
+                append_key = key or f"__unkeyed_{len(appends)}"
+                appends[append_key] = (row_data, policy_number)
+                targets.append(("append", append_key))
+                continue
+
+            found = (
+                self.find_row_by_policy_number(worksheet, policy_number)
+                if key
+                else None
+            )
+            if found is not None:
+                updates[key] = (
+                    found["row_number"],
+                    row_data,
+                    self._field_columns(headers, entry.get("fields")),
+                    policy_number,
+                )
+                targets.append(("row", key))
+            else:
+                targets.append(
+                    (
+                        "error",
+                        f"Policy number '{policy_number}' not found in quarter sheet '{sheet_name}' for update.",
+                    )
+                )
+
+        updated_rows: Dict[str, int] = {}
+        cell_counts: Dict[str, int] = {}
+        failed_rows: Dict[str, str] = {}
+        missing_rows: Dict[str, str] = {}
+        if updates:
+            (
+                updated_rows,
+                cell_counts,
+                failed_rows,
+                missing_rows,
+            ) = self._update_policy_rows(worksheet, headers, updates)
+
+        # New records are inserted by the API, which reports their rows
+        append_rows_by_key: Dict[str, int] = {}
+        failed_appends: Dict[str, str] = {}
+        formula_warnings: Dict[int, str] = {}
+        append_keys = list(appends)
+        for chunk_start in range(0, len(append_keys), BATCH_WRITE_CHUNK_ROWS):
+            chunk = append_keys[chunk_start : chunk_start + BATCH_WRITE_CHUNK_ROWS]
+            try:
+                first_row, formula_error = self._append_record_rows(
+                    worksheet,
+                    headers,
+                    [appends[key][0] for key in chunk],
+                    [appends[key][1] for key in chunk],
+                )
+            except Exception as e:
+                logger.error(
+                    f"Append of {len(chunk)} rows to {sheet_name} failed: {str(e)}"
+                )
+                for key in append_keys[chunk_start:]:
+                    failed_appends[key] = str(e)
+                break
+
+            for offset, key in enumerate(chunk):
+                append_rows_by_key[key] = first_row + offset
+                if formula_error:
+                    # The row exists, so a retry must not append it again
+                    formula_warnings[first_row + offset] = formula_error
+
+        row_failures = {**failed_rows, **missing_rows}
+        results = []
+        for kind, target in targets:
+            if kind == "error":
+                results.append({"success": False, "error": target})
+                continue
+            failures = failed_appends if kind == "append" else row_failures
+            if target in failures:
+                results.append({"success": False, "error": failures[target]})
+                continue
+            row_number = (
+                updated_rows[target] if kind == "row" else append_rows_by_key[target]
+            )
+            result = {
+                "success": True,
+                "sheet_name": sheet_name,
+                "row_number": row_number,
+                "operation": "UPDATE" if kind == "row" else "CREATE",
+            }
+            if kind == "row":
+                result["cells_written"] = cell_counts.get(target, 0)
+            elif row_number in formula_warnings:
+                result["warning"] = formula_warnings[row_number]
+            results.append(result)
+
+        logger.info(
+            f"Synced {len(entries)} records to {sheet_name}: {len(updates)} rows updated, {len(appends)} appended, {len(failed_rows) + len(failed_appends)} failed"
+        )
+        if failed_rows or failed_appends:
+            error = next(iter({**failed_rows, **failed_appends}.values()))
+            raise SheetBatchWriteError(
+                f"Batch write to {sheet_name} failed: {error}", results
+            )
+        return results
+
+    def _records_from_values(
+        self, all_values: List[List[str]], sheet_name: str
+    ) -> List[Dict[str, Any]]:
+        """Convert a quarter sheet's values into record dictionaries (rows 3+)"""
+        # Get all records as dictionaries, but skip the first data row (row 2 - dummy data)
+        # Row 1 = headers, Row 2 = dummy data with formulas, Row 3+ = actual data
+        if len(all_values) < 3:  # Need at least header + dummy + 1 data row
+            logger.info(
+                f"No data rows found in {sheet_name} (only header and/or dummy row)"
+            )
+            return []
+
+        # Extract headers from row 1 and data from row 3 onwards
+        headers = all_values[0]  # Row 1 - headers
+        data_rows = all_values[
+            2:
+        ]  # Row 3 onwards - actual data (skip row 2 dummy data)
+
+        # Convert to list of dictionaries
+        all_records = []
+        for row in data_rows:
+            # Skip completely empty rows
+            if all(cell.strip() == "" for cell in row):
+                continue
+
+            record = {}
+            for i, header in enumerate(headers):
+                if i < len(row):
+                    record[header] = row[i]
+                else:
+                    record[header] = ""  # Fill missing columns with empty string
+            all_records.append(record)
+
+        logger.info(
+            f"Retrieved {len(all_records)} records from {sheet_name} (skipped dummy row)"
+        )
+        return all_records
+
     def get_all_records_from_quarter_sheet(
         self, quarter: int, year: int
     ) -> List[Dict[str, Any]]:
@@ -1668,49 +2773,33 @@ class QuarterlySheetManager:
         try:
             sheet_name = self.get_quarterly_sheet_name(quarter, year)
 
-            # Check if quarter sheet exists
-            if not self.sheet_exists(sheet_name):
+            # Served from the snapshot cache when fresh
+            snapshot = self.get_quarter_sheet_snapshot(quarter, year)
+            if snapshot is None:
                 logger.warning(f"Quarter sheet {sheet_name} does not exist")
                 return []
 
-            # Get the worksheet
-            worksheet = self.spreadsheet.worksheet(sheet_name)
-
-            # Get all records as dictionaries, but skip the first data row (row 2 - dummy data)
-            # Row 1 = headers, Row 2 = dummy data with formulas, Row 3+ = actual data
-            all_values = worksheet.get_all_values()
+            return self._records_from_values(snapshot.values, sheet_name)
 
-            if len(all_values) < 3:  # Need at least header + dummy + 1 data row
-                logger.info(
-                    f"No data rows found in {sheet_name} (only header and/or dummy row)"
-                )
-                return []
+        except Exception as e:
+            logger.error(
+                f"Error getting all records from quarter sheet Q{quarter}-{year}: {str(e)}"
+            )
+            return []
 
-            # Extract headers from row 1 and data from row 3 onwards
-            headers = all_values[0]  # Row 1 - headers
-            data_rows = all_values[
-                2:
-            ]  # Row 3 onwards - actual data (skip row 2 dummy data)
-
-            # Convert to list of dictionaries
-            all_records = []
-            for row in data_rows:
-                # Skip completely empty rows
-                if all(cell.strip() == "" for cell in row):
-                    continue
+    async def aget_all_records_from_quarter_sheet(
+        self, quarter: int, year: int
+    ) -> List[Dict[str, Any]]:
+        """Async variant of ``get_all_records_from_quarter_sheet``"""
+        try:
+            sheet_name = self.get_quarterly_sheet_name(quarter, year)
 
-                record = {}
-                for i, header in enumerate(headers):
-                    if i < len(row):
-                        record[header] = row[i]
-                    else:
-                        record[header] = ""  # Fill missing columns with empty string
-                all_records.append(record)
+            snapshot = await self.aget_quarter_sheet_snapshot(quarter, year)
+            if snapshot is None:
+                logger.warning(f"Quarter sheet {sheet_name} does not exist")
+                return []
 
-            logger.info(
-                f"Retrieved {len(all_records)} records from {sheet_name} (skipped dummy row)"
-            )
-            return all_records
+            return self._records_from_values(snapshot.values, sheet_name)
 
         except Exception as e:
             logger.error(
@@ -1730,30 +2819,13 @@ class QuarterlySheetManager:
                 logger.error("Google Sheets spreadsheet not initialized")
                 return None
 
-            # Get all worksheets
-            all_worksheets = self.spreadsheet.worksheets()
-            quarter_sheets = []
-
-            # Filter for quarterly sheets (format: Q{quarter}-{year})
-            import re
-
-            quarter_pattern = re.compile(r"^Q([1-4])-(\d{4})$")
-
-            for sheet in all_worksheets:
-                match = quarter_pattern.match(sheet.title)
-                if match:
-                    quarter = int(match.group(1))
-                    year = int(match.group(2))
-                    quarter_sheets.append((year, quarter, sheet.title))
+            # Quarter sheets (format: Q{quarter}-{year}) sorted oldest first
+            quarter_sheets = self.worksheet_directory.quarter_sheets()
 
             if not quarter_sheets:
                 logger.info("No quarterly sheets found")
                 return None
 
-            # Sort by year, then by quarter to find the oldest
-            quarter_sheets.sort(
-                key=lambda x: (x[0], x[1])
-            )  # Sort by year, then quarter
             oldest_sheet = quarter_sheets[0]
             oldest_name = oldest_sheet[2]
 
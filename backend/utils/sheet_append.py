@@ -0,0 +1,75 @@
+"""
+Appending rows to Google Sheets worksheets
+
+New records used to be written to a row number chosen by the backend, from a
+full-sheet scan or a cached high-water mark. Another thread or worker process
+could choose the same row between the probe and the write and overwrite it,
+and a probe that did not see every column could treat a used row as free.
+
+Rows are now added with the Sheets ``values.append`` API and
+``insertDataOption=INSERT_ROWS``. The API inserts new rows after the sheet's
+table and reports where they landed, so an append never overwrites existing
+cells, whichever process makes it.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+import gspread
+from gspread.utils import rowcol_to_a1
+
+logger = logging.getLogger(__name__)
+
+_RANGE_ROWS = re.compile(r"^\$?[A-Z]+\$?(\d+)(?::\$?[A-Z]+\$?(\d+))?$")
+
+
+def appended_rows(response: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    First and last row written by a values.append call
+
+    Args:
+        response: Raw values.append API response
+
+    Returns:
+        Tuple of 1-based (first row, last row)
+    """
+    updated_range = response["updates"]["updatedRange"]
+    cells = updated_range.rsplit("!", 1)[-1]
+    match = _RANGE_ROWS.match(cells)
+    if match is None:
+        raise ValueError(f"Unexpected appended range: {updated_range}")
+    first_row = int(match.group(1))
+    return first_row, int(match.group(2) or first_row)
+
+
+def append_rows(
+    worksheet: gspread.Worksheet,
+    rows: List[List[Any]],
+    value_input_option: str = "USER_ENTERED",
+) -> int:
+    """
+    Insert rows after the last row of a worksheet's table
+
+    Args:
+        worksheet: Target worksheet
+        rows: Row values, each starting at column A
+        value_input_option: "RAW" or "USER_ENTERED"
+
+    Returns:
+        1-based number of the first appended row (the rest follow it)
+    """
+    width = max(max((len(row) for row in rows), default=1), 1)
+    response = worksheet.append_rows(
+        rows,
+        value_input_option=value_input_option,
+        insert_data_option="INSERT_ROWS",
+        table_range=f"A1:{rowcol_to_a1(1, width)}",
+    )
+    first_row, last_row = appended_rows(response)
+    if last_row - first_row + 1 != len(rows):
+        raise ValueError(
+            f"Appended {len(rows)} rows to {worksheet.title} but the API reported rows {first_row}-{last_row}"
+        )
+    logger.info(f"Appended rows {first_row}-{last_row} to {worksheet.title}")
+    return first_row
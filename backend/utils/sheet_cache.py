@@ -0,0 +1,327 @@
+"""
+In-process snapshot cache for Google Sheets worksheets
+
+Quarter sheets are read far more often than they are written: every MIS
+dashboard, policy lookup and reconciliation run used to download the whole
+worksheet with ``get_all_values()``. This module keeps the last downloaded
+values of each worksheet in memory for a configurable TTL so repeated reads
+are served locally.
+
+Writes made through this backend patch the cached snapshot in place (or drop
+it) so that a read immediately after a write still sees the new data without
+another full download. The cache is per process: a patch only reaches the
+cache of the process that wrote, so other workers, like edits made directly
+in Google Sheets, see the change once their TTL expires.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import GOOGLE_SHEETS_SNAPSHOT_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, str]
+
+# Prefix of this process's snapshot tokens, so tokens of different workers never collide
+_PROCESS_TOKEN = uuid.uuid4().hex[:12]
+
+
+@dataclass(frozen=True)
+class SheetSnapshot:
+    """Immutable view of a worksheet's values at a point in time.
+
+    ``values`` holds every row exactly as returned by ``get_all_values()``
+    (row 1 = headers). Callers must treat it as read-only; writers replace the
+    snapshot instead of mutating it.
+    """
+
+    values: List[List[str]]
+    loaded_at: float
+    version: int = 0
+    # Id that changes whenever the snapshot content changes, unique across
+    # processes; it names neither the spreadsheet nor the worksheet
+    token: str = field(default="")
+
+    @property
+    def headers(self) -> List[str]:
+        return self.values[0] if self.values else []
+
+    @property
+    def row_count(self) -> int:
+        return len(self.values)
+
+
+class SheetSnapshotCache:
+    """Thread-safe TTL cache of worksheet snapshots keyed by (spreadsheet, worksheet)."""
+
+    def __init__(self, ttl_seconds: int = GOOGLE_SHEETS_SNAPSHOT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshots: Dict[SnapshotKey, SheetSnapshot] = {}
+        self._lock = threading.RLock()
+        # One loader lock per key so concurrent misses trigger a single download
+        self._load_locks: Dict[SnapshotKey, threading.Lock] = {}
+        self._async_load_locks: Dict[SnapshotKey, asyncio.Lock] = {}
+        self._generation = 0
+        # Bumped by every write so a download started before it is not cached
+        self._write_generations: Dict[SnapshotKey, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _is_fresh(self, snapshot: SheetSnapshot) -> bool:
+        return (time.monotonic() - snapshot.loaded_at) < self.ttl_seconds
+
+    def _next_token(self, key: SnapshotKey) -> Tuple[int, str]:
+        self._generation += 1
+        return self._generation, f"{_PROCESS_TOKEN}-{self._generation}"
+
+    def _write_generation(self, key: SnapshotKey) -> int:
+        with self._lock:
+            return self._write_generations.get(key, 0)
+
+    def _record_write(self, key: SnapshotKey) -> None:
+        self._write_generations[key] = self._write_generations.get(key, 0) + 1
+
+    def _load_lock_for(self, key: SnapshotKey) -> threading.Lock:
+        with self._lock:
+            lock = self._load_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._load_locks[key] = lock
+            return lock
+
+    def _fresh_snapshot(self, key: SnapshotKey) -> Optional[SheetSnapshot]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot and self._is_fresh(snapshot):
+                return snapshot
+        return None
+
+    def peek(self, spreadsheet_id: str, worksheet_title: str) -> Optional[SheetSnapshot]:
+        """Return the cached snapshot if it is still fresh, without loading."""
+        snapshot = self._fresh_snapshot((spreadsheet_id, worksheet_title))
+        if snapshot is not None:
+            self.hits += 1
+        return snapshot
+
+    def get(
+        self,
+        spreadsheet_id: str,
+        worksheet_title: str,
+        loader: Callable[[], List[List[str]]],
+        force_refresh: bool = False,
+    ) -> SheetSnapshot:
+        """
+        Get a worksheet snapshot, calling ``loader`` on a miss or expiry
+
+        Args:
+            spreadsheet_id: Spreadsheet document id
+            worksheet_title: Worksheet title (e.g. "Q3-2025")
+            loader: Callable returning the full ``get_all_values()`` payload
+            force_refresh: Ignore any cached snapshot and reload
+
+        Returns:
+            The current SheetSnapshot
+        """
+        key = (spreadsheet_id, worksheet_title)
+
+        if not force_refresh:
+            snapshot = self.peek(spreadsheet_id, worksheet_title)
+            if snapshot is not None:
+                return snapshot
+
+        with self._load_lock_for(key):
+            # Another thread may have loaded it while we waited
+            if not force_refresh:
+                snapshot = self.peek(spreadsheet_id, worksheet_title)
+                if snapshot is not None:
+                    return snapshot
+
+            self.misses += 1
+            started = self._write_generation(key)
+            return self.store(
+                spreadsheet_id, worksheet_title, loader() or [], written_after=started
+            )
+
+    async def aget(
+        self,
+        spreadsheet_id: str,
+        worksheet_title: str,
+        loader: Callable[[], Awaitable[List[List[str]]]],
+        force_refresh: bool = False,
+    ) -> SheetSnapshot:
+        """Async variant of ``get`` for loaders that are coroutines"""
+        key = (spreadsheet_id, worksheet_title)
+
+        if not force_refresh:
+            snapshot = self.peek(spreadsheet_id, worksheet_title)
+            if snapshot is not None:
+                return snapshot
+
+        with self._lock:
+            lock = self._async_load_locks.get(key)
+            if lock is None:
+                lock = asyncio.Lock()
+                self._async_load_locks[key] = lock
+
+        async with lock:
+            if not force_refresh:
+                snapshot = self.peek(spreadsheet_id, worksheet_title)
+                if snapshot is not None:
+                    return snapshot
+
+            self.misses += 1
+            started = self._write_generation(key)
+            return self.store(
+                spreadsheet_id,
+                worksheet_title,
+                (await loader()) or [],
+                written_after=started,
+            )
+
+    def store(
+        self,
+        spreadsheet_id: str,
+        worksheet_title: str,
+        values: List[List[str]],
+        written_after: Optional[int] = None,
+    ) -> SheetSnapshot:
+        """
+        Cache freshly downloaded values as the worksheet's current snapshot
+
+        Args:
+            spreadsheet_id: Spreadsheet document id
+            worksheet_title: Worksheet title
+            values: Downloaded ``get_all_values()`` payload
+            written_after: Write generation read before the download started;
+                if a write happened since, the values are returned but not
+                cached, since they may predate that write
+
+        Returns:
+            Snapshot of ``values``
+        """
+        key = (spreadsheet_id, worksheet_title)
+        with self._lock:
+            version, token = self._next_token(key)
+            snapshot = SheetSnapshot(
+                values=values,
+                loaded_at=time.monotonic(),
+                version=version,
+                token=token,
+            )
+            stale = (
+                written_after is not None
+                and self._write_generations.get(key, 0) != written_after
+            )
+            if stale:
+                logger.debug(
+                    f"Not caching snapshot of {worksheet_title}: written during download"
+                )
+            elif self.enabled:
+                self._snapshots[key] = snapshot
+        logger.debug(
+            f"Loaded snapshot for {worksheet_title} ({len(values)} rows, version {version})"
+        )
+        return snapshot
+
+    def patch_row(
+        self,
+        spreadsheet_id: str,
+        worksheet_title: str,
+        row_number: int,
+        row_values: Sequence[Optional[str]],
+        start_col: int = 1,
+    ) -> bool:
+        """
+        Apply a row write made through the API to the cached snapshot
+
+        Every value is applied, including "" for a cleared cell. None leaves
+        the cached cell untouched: it marks cells that were not written, or
+        formula cells whose computed value is not known locally.
+
+        Only this process's cache is patched. The write also bumps the
+        worksheet's write generation, so a download that started before it
+        cannot replace the patched snapshot with older values.
+
+        Args:
+            spreadsheet_id: Spreadsheet document id
+            worksheet_title: Worksheet title
+            row_number: 1-based sheet row that was written
+            row_values: Values written starting at ``start_col``
+            start_col: 1-based first column of the write
+
+        Returns:
+            True if a cached snapshot was patched, False if nothing was cached
+        """
+        key = (spreadsheet_id, worksheet_title)
+        with self._lock:
+            self._record_write(key)
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                return False
+
+            values = list(snapshot.values)
+            while len(values) < row_number:
+                values.append([])
+
+            row = list(values[row_number - 1])
+            end_col = start_col - 1 + len(row_values)
+            if len(row) < end_col:
+                row.extend([""] * (end_col - len(row)))
+            for offset, value in enumerate(row_values):
+                if value is not None:
+                    row[start_col - 1 + offset] = value
+            values[row_number - 1] = row
+
+            version, token = self._next_token(key)
+            self._snapshots[key] = SheetSnapshot(
+                values=values,
+                loaded_at=snapshot.loaded_at,
+                version=version,
+                token=token,
+            )
+            return True
+
+    def invalidate(
+        self, spreadsheet_id: str, worksheet_title: Optional[str] = None
+    ) -> None:
+        """Drop one worksheet's snapshot, or every snapshot of a spreadsheet"""
+        with self._lock:
+            if worksheet_title is not None:
+                key = (spreadsheet_id, worksheet_title)
+                self._record_write(key)
+                self._snapshots.pop(key, None)
+                return
+            keys = {k for k in self._snapshots if k[0] == spreadsheet_id}
+            keys.update(k for k in self._write_generations if k[0] == spreadsheet_id)
+            for key in keys:
+                self._record_write(key)
+                self._snapshots.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "cached_sheets": len(self._snapshots),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# Global instance shared by GoogleSheetsSync and QuarterlySheetManager
+sheet_snapshot_cache = SheetSnapshotCache()
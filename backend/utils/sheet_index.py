@@ -0,0 +1,206 @@
+"""
+Policy number → row index for quarterly sheets
+
+Finding a policy in a quarter sheet used to mean downloading every row and
+comparing the "Policy number" column one by one. This module keeps, per
+worksheet, a dictionary from normalized policy number to 1-based sheet row.
+
+The index is built from a single column read (or from a fresh snapshot when
+one is cached), kept current by our own appends, updates and deletes, and
+rebuilt when it expires or when a looked-up row no longer holds the expected
+policy number.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import GOOGLE_SHEETS_SNAPSHOT_TTL_SECONDS
+from utils.google_sheets import normalize_policy_number_for_sheets
+
+logger = logging.getLogger(__name__)
+
+IndexKey = Tuple[str, str]
+
+# First data row in quarter sheets (row 1 = headers, row 2 = template formulas)
+FIRST_DATA_ROW = 3
+
+POLICY_NUMBER_HEADERS = ("policy number", "policy_number")
+
+
+def find_policy_column(headers: List[str]) -> int:
+    """Return the 0-based index of the policy number column, or -1"""
+    for i, header in enumerate(headers):
+        if header.lower().strip() in POLICY_NUMBER_HEADERS:
+            return i
+    return -1
+
+
+@dataclass
+class _WorksheetIndex:
+    headers: List[str]
+    policy_col_index: int
+    rows: Dict[str, int] = field(default_factory=dict)
+    # Reverse map of ``rows`` for O(1) maintenance on writes
+    policies_by_row: Dict[int, str] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.monotonic)
+
+
+class PolicyRowIndex:
+    """Thread-safe per-worksheet map of normalized policy number to sheet row."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = GOOGLE_SHEETS_SNAPSHOT_TTL_SECONDS,
+        miss_refresh_seconds: int = 5,
+    ):
+        # Index entries older than ttl_seconds are rebuilt before use
+        self.ttl_seconds = max(ttl_seconds, 0)
+        # A miss on an index older than this triggers one rebuild, so rows
+        # added directly in Google Sheets are still found
+        self.miss_refresh_seconds = miss_refresh_seconds
+        self._indexes: Dict[IndexKey, _WorksheetIndex] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def normalize(policy_number) -> str:
+        return normalize_policy_number_for_sheets(policy_number)
+
+    @staticmethod
+    def build_rows(
+        column_values: List[str], first_row: int = FIRST_DATA_ROW
+    ) -> Dict[str, int]:
+        """Map normalized policy numbers to rows; the first occurrence wins."""
+        rows: Dict[str, int] = {}
+        for row_number, value in enumerate(
+            column_values[first_row - 1 :], start=first_row
+        ):
+            normalized = normalize_policy_number_for_sheets(value)
+            if normalized and normalized not in rows:
+                rows[normalized] = row_number
+        return rows
+
+    def _is_expired(self, index: _WorksheetIndex) -> bool:
+        return (time.monotonic() - index.built_at) >= self.ttl_seconds
+
+    def set_index(
+        self,
+        key: IndexKey,
+        headers: List[str],
+        column_values: List[str],
+    ) -> Optional[_WorksheetIndex]:
+        """Replace the index for a worksheet from its headers and policy column values"""
+        policy_col_index = find_policy_column(headers)
+        if policy_col_index == -1:
+            return None
+        rows = self.build_rows(column_values)
+        index = _WorksheetIndex(
+            headers=list(headers),
+            policy_col_index=policy_col_index,
+            rows=rows,
+            policies_by_row={row: policy for policy, row in rows.items()},
+        )
+        with self._lock:
+            self._indexes[key] = index
+        logger.debug(f"Built policy row index for {key[1]} ({len(index.rows)} policies)")
+        return index
+
+    def get_index(
+        self,
+        key: IndexKey,
+        builder: Callable[[], Optional[_WorksheetIndex]],
+        force_rebuild: bool = False,
+    ) -> Optional[_WorksheetIndex]:
+        """Return the current index for a worksheet, building it if missing or expired"""
+        with self._lock:
+            index = self._indexes.get(key)
+        if index is not None and not force_rebuild and not self._is_expired(index):
+            return index
+        return builder()
+
+    def current(self, key: IndexKey) -> Optional[_WorksheetIndex]:
+        """Return the cached index if it has not expired, without building"""
+        with self._lock:
+            index = self._indexes.get(key)
+        if index is None or self._is_expired(index):
+            return None
+        return index
+
+    def refresh_on_miss(self, index: _WorksheetIndex) -> bool:
+        """Whether a lookup miss on ``index`` justifies one rebuild"""
+        return (time.monotonic() - index.built_at) >= self.miss_refresh_seconds
+
+    def lookup(
+        self,
+        key: IndexKey,
+        policy_number: str,
+        builder: Callable[[], Optional[_WorksheetIndex]],
+    ) -> Tuple[Optional[int], Optional[_WorksheetIndex]]:
+        """
+        Find the sheet row of a policy number
+
+        Args:
+            key: (spreadsheet id, worksheet title)
+            policy_number: Raw policy number
+            builder: Callable that rebuilds and stores the index
+
+        Returns:
+            Tuple of (1-based row number or None, index used)
+        """
+        normalized = self.normalize(policy_number)
+        index = self.get_index(key, builder)
+        if index is None or not normalized:
+            return None, index
+
+        row_number = index.rows.get(normalized)
+        if row_number is None and self.refresh_on_miss(index):
+            index = self.get_index(key, builder, force_rebuild=True)
+            if index is None:
+                return None, None
+            row_number = index.rows.get(normalized)
+        return row_number, index
+
+    def record_row(self, key: IndexKey, policy_number, row_number: int) -> None:
+        """Record that a policy now lives at ``row_number`` (append or update)"""
+        normalized = self.normalize(policy_number)
+        if not normalized:
+            return
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                return
+            # Drop any other policy previously indexed at this row
+            previous = index.policies_by_row.get(row_number)
+            if previous is not None and previous != normalized:
+                index.rows.pop(previous, None)
+                index.policies_by_row.pop(row_number, None)
+            if normalized not in index.rows:
+                index.rows[normalized] = row_number
+                index.policies_by_row[row_number] = normalized
+
+    def record_delete(self, key: IndexKey, row_number: int) -> None:
+        """Remove a deleted row and shift every row below it up by one"""
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                return
+            index.rows = {
+                policy: (row - 1 if row > row_number else row)
+                for policy, row in index.rows.items()
+                if row != row_number
+            }
+            index.policies_by_row = {row: policy for policy, row in index.rows.items()}
+
+    def invalidate(self, spreadsheet_id: str, worksheet_title: Optional[str] = None) -> None:
+        with self._lock:
+            if worksheet_title is not None:
+                self._indexes.pop((spreadsheet_id, worksheet_title), None)
+                return
+            for key in [k for k in self._indexes if k[0] == spreadsheet_id]:
+                self._indexes.pop(key, None)
+
+
+# Global instance shared by QuarterlySheetManager and the routers
+policy_row_index = PolicyRowIndex()
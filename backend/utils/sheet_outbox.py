@@ -0,0 +1,455 @@
+"""
+Durable outbox for database → Google Sheets sync
+
+CutPay and Policy writes used to sync the quarterly sheet inline after the
+database commit. The request waited on several Google calls, and when a sync
+failed the change was silently missing from the sheet.
+
+Routes now call ``enqueue_sheet_sync`` inside the same transaction as the
+CutPay/Policy row, so the sheet write is recorded if and only if the database
+change commits. ``SheetSyncWorker`` runs in the background of each API
+process. It claims pending entries with ``FOR UPDATE SKIP LOCKED`` (safe with
+several workers), groups them by quarter sheet, and writes each group with
+``QuarterlySheetManager.sync_records_batch``. Failed entries are retried with
+exponential backoff.
+
+A CREATE appends a row, as the inline sync did; an UPDATE rewrites the row
+found by policy number. Newer entries for the same policy and quarter
+supersede older ones, and a CREATE still pending when an UPDATE for the same
+row arrives is written as one append with the newest data (the surviving
+entry becomes the CREATE, so a retry still appends). Once a CutPay row is
+written, its ``synced_to_cutpay_sheet`` flag and sheet row are stored.
+
+While a batch is written the worker refreshes ``locked_at`` of its entries.
+Entries are only updated, and rows only written, while the worker still holds
+that lease, so an entry reclaimed by another worker is never appended twice.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from config import (
+    SHEET_SYNC_BATCH_SIZE,
+    SHEET_SYNC_MAX_ATTEMPTS,
+    SHEET_SYNC_POLL_SECONDS,
+)
+from models import CutPay, SheetSyncOutbox
+from utils.google_sheets import normalize_policy_number_for_sheets
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Entries stuck in "processing" longer than this (crashed worker) are reclaimed
+PROCESSING_LEASE = timedelta(minutes=5)
+
+# How often a worker refreshes the lease of the batch it is writing
+HEARTBEAT_SECONDS = 60
+
+# Retry delay cap for failed entries
+MAX_RETRY_DELAY_SECONDS = 15 * 60
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Keep zero falsy so it is written as an empty cell, like the inline sync
+        return str(value) if value else 0
+    return str(value)
+
+
+def outbox_key(source: str, policy_number: str, quarter: int, year: int) -> str:
+    """Idempotency key of a sheet row: one per source, policy and quarter sheet"""
+    normalized = normalize_policy_number_for_sheets(policy_number)
+    return f"{source}:{normalized}:Q{quarter}-{year}"
+
+
+def enqueue_sheet_sync(
+    db: AsyncSession,
+    *,
+    source: str,
+    operation: str,
+    policy_number: str,
+    record_data: Dict[str, Any],
+    quarter: int,
+    year: int,
+    source_id: Optional[Any] = None,
+) -> SheetSyncOutbox:
+    """
+    Record a quarterly sheet write in the caller's open transaction
+
+    Args:
+        db: Session whose transaction also writes the CutPay/Policy row
+        source: "cutpay" or "policy"
+        operation: "CREATE" (append) or "UPDATE" (policy must exist in the sheet)
+        policy_number: Policy number identifying the sheet row
+        record_data: Complete sheet record keyed by sheet header
+        quarter: Target quarter (1-4)
+        year: Target year
+        source_id: Primary key of the CutPay/Policy row
+
+    Returns:
+        The pending outbox entry (flushed with the caller's commit)
+    """
+    entry = SheetSyncOutbox(
+        source=source,
+        source_id=str(source_id) if source_id is not None else None,
+        operation=operation.upper(),
+        policy_number=str(policy_number or ""),
+        quarter=quarter,
+        year=year,
+        idempotency_key=outbox_key(source, policy_number, quarter, year),
+        payload=json.loads(json.dumps(record_data, default=_json_default)),
+        status=STATUS_PENDING,
+        attempts=0,
+    )
+    db.add(entry)
+    logger.info(
+        f"Queued sheet sync ({entry.operation}) for policy '{policy_number}' in Q{quarter}-{year}"
+    )
+    return entry
+
+
+class _BatchLease:
+    """Entries of a claimed batch still owned by this worker, and their lock time"""
+
+    def __init__(self, entries: List[SheetSyncOutbox], locked_at: datetime):
+        self.locked_at = locked_at
+        self.owned = {entry.id for entry in entries}
+
+    def owns(self, entry: SheetSyncOutbox) -> bool:
+        return entry.id in self.owned
+
+
+class SheetSyncWorker:
+    """Background task draining the sheet sync outbox in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = SHEET_SYNC_BATCH_SIZE,
+        poll_seconds: float = SHEET_SYNC_POLL_SECONDS,
+        max_attempts: int = SHEET_SYNC_MAX_ATTEMPTS,
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the worker on the running event loop (idempotent)"""
+        if config.AsyncSessionLocal is None:
+            logger.warning("Sheet sync worker not started: database not configured")
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Sheet sync worker started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Sheet sync worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker after committing new outbox entries"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Sheet sync worker iteration failed: {str(e)}")
+                processed = 0
+
+            # A full batch means more entries are probably waiting
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim_batch(self) -> Tuple[List[SheetSyncOutbox], datetime]:
+        """Lock a batch of due entries and mark them as processing"""
+        async with config.AsyncSessionLocal() as session:
+            async with session.begin():
+                now = func.now()
+                result = await session.execute(
+                    select(SheetSyncOutbox)
+                    .where(
+                        or_(
+                            and_(
+                                SheetSyncOutbox.status == STATUS_PENDING,
+                                SheetSyncOutbox.available_at <= now,
+                            ),
+                            and_(
+                                SheetSyncOutbox.status == STATUS_PROCESSING,
+                                SheetSyncOutbox.locked_at < now - PROCESSING_LEASE,
+                            ),
+                        )
+                    )
+                    .order_by(SheetSyncOutbox.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                entries = list(result.scalars().all())
+                locked_at = datetime.now(timezone.utc)
+                for entry in entries:
+                    entry.status = STATUS_PROCESSING
+                    entry.locked_at = locked_at
+                    entry.attempts += 1
+            return entries, locked_at
+
+    async def _heartbeat(self, lease: _BatchLease, stop: asyncio.Event) -> None:
+        """
+        Refresh the lease of a batch until ``stop`` is set
+
+        Entries whose lease was taken over by another worker (this one stalled
+        past ``PROCESSING_LEASE``) are dropped from ``lease.owned``.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=HEARTBEAT_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                pass
+            refreshed_at = datetime.now(timezone.utc)
+            try:
+                async with config.AsyncSessionLocal() as session:
+                    async with session.begin():
+                        result = await session.execute(
+                            update(SheetSyncOutbox)
+                            .where(
+                                SheetSyncOutbox.id.in_(lease.owned),
+                                SheetSyncOutbox.status == STATUS_PROCESSING,
+                                SheetSyncOutbox.locked_at == lease.locked_at,
+                            )
+                            .values(locked_at=refreshed_at)
+                            .returning(SheetSyncOutbox.id)
+                        )
+                        owned = set(result.scalars().all())
+            except Exception as e:
+                logger.warning(f"Sheet sync lease refresh failed: {str(e)}")
+                continue
+            lost = lease.owned - owned
+            if lost:
+                logger.warning(
+                    f"Sheet sync lost the lease of {len(lost)} outbox entries to another worker"
+                )
+            lease.owned = owned
+            lease.locked_at = refreshed_at
+
+    async def drain_once(self) -> int:
+        """
+        Process one batch of outbox entries
+
+        Returns:
+            Number of entries claimed
+        """
+        entries, locked_at = await self._claim_batch()
+        if not entries:
+            return 0
+
+        lease = _BatchLease(entries, locked_at)
+        stop = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(lease, stop))
+        try:
+            outcomes, superseded = await self._write_batch(entries, lease)
+        finally:
+            # Let an in-flight refresh finish so lease.locked_at matches the row
+            stop.set()
+            await heartbeat
+
+        await self._finish(outcomes, superseded, lease)
+        return len(entries)
+
+    async def _write_batch(
+        self, entries: List[SheetSyncOutbox], lease: _BatchLease
+    ) -> Tuple[List[Tuple[SheetSyncOutbox, Dict[str, Any]]], List[SheetSyncOutbox]]:
+        """
+        Write the newest entry per idempotency key to the quarter sheets
+
+        Returns:
+            Tuple of ((entry, sync result) per written entry, superseded entries)
+        """
+        # Coalesce per idempotency key: only the newest payload is written, and
+        # it appends the row if any coalesced entry was a CREATE. The folded
+        # operation is stored with the entry, so a retry appends as well.
+        latest: Dict[str, SheetSyncOutbox] = {}
+        creates = set()
+        for entry in entries:
+            latest[entry.idempotency_key] = entry
+            if entry.operation == "CREATE":
+                creates.add(entry.idempotency_key)
+        for key in creates:
+            latest[key].operation = "CREATE"
+        superseded = [e for e in entries if latest[e.idempotency_key] is not e]
+
+        groups: Dict[Tuple[int, int], List[SheetSyncOutbox]] = {}
+        for entry in latest.values():
+            groups.setdefault((entry.quarter, entry.year), []).append(entry)
+
+        from utils.quarterly_sheets_manager import (
+            SheetBatchWriteError,
+            quarterly_manager,
+        )
+
+        outcomes: List[Tuple[SheetSyncOutbox, Dict[str, Any]]] = []
+        for (quarter, year), group in groups.items():
+            # Entries reclaimed by another worker are written by that worker
+            group = [entry for entry in group if lease.owns(entry)]
+            if not group:
+                continue
+            batch = [
+                {
+                    "policy_number": entry.policy_number,
+                    "record_data": entry.payload,
+                    "operation": entry.operation,
+                }
+                for entry in group
+            ]
+            try:
+                results = await asyncio.to_thread(
+                    quarterly_manager.sync_records_batch, quarter, year, batch
+                )
+            except SheetBatchWriteError as e:
+                # Rows written before the failure must not be written again
+                logger.error(f"Sheet sync batch for Q{quarter}-{year} failed: {str(e)}")
+                results = e.results
+            except Exception as e:
+                logger.error(f"Sheet sync batch for Q{quarter}-{year} failed: {str(e)}")
+                results = [{"success": False, "error": str(e)} for _ in group]
+            outcomes.extend(zip(group, results))
+
+        return outcomes, superseded
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(MAX_RETRY_DELAY_SECONDS, 2 ** max(attempts, 1)))
+
+    async def _mark_cutpay_synced(
+        self, session: AsyncSession, entry: SheetSyncOutbox, result: Dict[str, Any]
+    ) -> None:
+        """Set the CutPay row's sheet sync flags, as the inline sync used to"""
+        flags: Dict[str, Any] = {"synced_to_cutpay_sheet": True}
+        if result.get("row_number"):
+            flags["cutpay_sheet_row_id"] = str(result["row_number"])
+        try:
+            cutpay_id = int(entry.source_id)
+        except ValueError:
+            logger.warning(f"Outbox entry {entry.id} has a non-numeric CutPay ID")
+            return
+        await session.execute(
+            update(CutPay).where(CutPay.id == cutpay_id).values(**flags)
+        )
+
+    async def _finish(
+        self,
+        outcomes: List[Tuple[SheetSyncOutbox, Dict[str, Any]]],
+        superseded: List[SheetSyncOutbox],
+        lease: _BatchLease,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+
+        def leased(entry: SheetSyncOutbox):
+            # Only entries this worker still holds are updated
+            return (
+                SheetSyncOutbox.id == entry.id,
+                SheetSyncOutbox.status == STATUS_PROCESSING,
+                SheetSyncOutbox.locked_at == lease.locked_at,
+            )
+
+        async with config.AsyncSessionLocal() as session:
+            async with session.begin():
+                for entry, result in outcomes:
+                    if result.get("success"):
+                        values = {
+                            "status": STATUS_DONE,
+                            "processed_at": now,
+                            "sheet_row": result.get("row_number"),
+                            "last_error": None,
+                        }
+                        if entry.source == "cutpay" and entry.source_id:
+                            await self._mark_cutpay_synced(session, entry, result)
+                        # Older retries for the same row must not overwrite it later
+                        await session.execute(
+                            update(SheetSyncOutbox)
+                            .where(
+                                SheetSyncOutbox.idempotency_key == entry.idempotency_key,
+                                SheetSyncOutbox.id < entry.id,
+                                SheetSyncOutbox.status == STATUS_PENDING,
+                            )
+                            .values(
+                                status=STATUS_DONE,
+                                processed_at=now,
+                                last_error=f"Superseded by outbox entry {entry.id}",
+                            )
+                        )
+                    elif entry.attempts >= self.max_attempts:
+                        values = {
+                            "status": STATUS_FAILED,
+                            "processed_at": now,
+                            "last_error": result.get("error"),
+                        }
+                        logger.error(
+                            f"Sheet sync for policy '{entry.policy_number}' failed permanently after {entry.attempts} attempts: {result.get('error')}"
+                        )
+                    else:
+                        values = {
+                            "status": STATUS_PENDING,
+                            "available_at": now + self._retry_delay(entry.attempts),
+                            "locked_at": None,
+                            "last_error": result.get("error"),
+                        }
+                        logger.warning(
+                            f"Sheet sync for policy '{entry.policy_number}' failed (attempt {entry.attempts}), will retry: {result.get('error')}"
+                        )
+                    # A CREATE folded into this entry must still append on retry
+                    values["operation"] = entry.operation
+                    await session.execute(
+                        update(SheetSyncOutbox)
+                        .where(*leased(entry))
+                        .values(**values)
+                    )
+
+                for entry in superseded:
+                    await session.execute(
+                        update(SheetSyncOutbox)
+                        .where(*leased(entry))
+                        .values(
+                            status=STATUS_DONE,
+                            processed_at=now,
+                            last_error="Superseded by a newer entry in the same batch",
+                        )
+                    )
+
+        succeeded = sum(1 for _, result in outcomes if result.get("success"))
+        logger.info(
+            f"Sheet sync batch finished: {succeeded}/{len(outcomes)} rows written, {len(superseded)} superseded"
+        )
+
+
+# Global instance started with the application
+sheet_sync_worker = SheetSyncWorker()
@@ -0,0 +1,437 @@
+"""
+Quota-aware scheduler for Google Sheets API requests
+
+The Sheets API enforces per-minute read and write quotas. Universal-record
+uploads can use up a whole minute's budget, and the agent dashboards then fail
+with 429 errors. Every request made by GoogleSheetsSync, QuarterlySheetManager
+and the async Sheets client goes through the single scheduler in this module.
+The scheduler provides:
+
+- separate read and write token buckets, sized to the project quota
+- priority lanes: when tokens are scarce, waiting interactive requests are
+  served before normal ones, and normal ones before bulk ones
+- exponential backoff with full jitter, retrying 429 and 5xx responses
+- queue depth, wait time and throttling counters, exposed through ``stats()``
+
+The priority comes from a context variable, so a request handler sets it once
+(``use_sheets_priority``) and every Sheets call in that request inherits it,
+including calls made in the threadpool.
+
+The configured per-minute limits are the project quota, which every worker
+process shares. The buckets cannot see the other processes, so each one may
+burst up to the whole quota: an idle deployment never makes a request wait
+for a share it is not using. When processes overshoot the quota together,
+the API answers 429, the bucket is drained and the request backs off.
+Setting ``GOOGLE_SHEETS_WORKER_PROCESSES`` above 1 additionally splits the
+refill rate (not the burst) across that many processes.
+
+Waiting for a token and backing off both block the calling thread, so they
+only happen in the threadpool or in coroutines (``acall``). Blocking Sheets
+calls should be made through ``run_in_threadpool``; one still made on the
+event loop thread takes a token if there is one but never waits, and is not
+retried.
+"""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import gspread
+
+from config import (
+    GOOGLE_SHEETS_MAX_RETRIES,
+    GOOGLE_SHEETS_READ_REQUESTS_PER_MINUTE,
+    GOOGLE_SHEETS_WORKER_PROCESSES,
+    GOOGLE_SHEETS_WRITE_REQUESTS_PER_MINUTE,
+)
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+
+# HTTP statuses worth retrying: quota exhaustion and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class Priority(IntEnum):
+    """Scheduling lanes; lower values are served first"""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "sheets_priority", default=Priority.NORMAL
+)
+
+
+def use_sheets_priority(priority: Priority) -> None:
+    """Set the Sheets priority lane for the rest of the current request context"""
+    _current_priority.set(priority)
+
+
+@contextmanager
+def sheets_priority(priority: Priority):
+    """Run a block of Sheets calls in the given priority lane"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = max(rate_per_minute, 1) / 60.0
+        self.capacity = capacity if capacity is not None else max(rate_per_minute, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second
+        )
+        self.updated_at = now
+
+    def take_now(self) -> None:
+        """Take a token without waiting, without going into debt"""
+        self._refill()
+        self.tokens = max(self.tokens - 1, 0.0)
+
+    def time_until_token(self) -> float:
+        """Seconds until one token is available (0 if one is available now)"""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_second
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def drain(self) -> None:
+        """Empty the bucket after the API reported the quota as exhausted"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _Metrics:
+    def __init__(self):
+        self.acquired = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg_wait = self.total_wait_seconds / self.acquired if self.acquired else 0.0
+        return {
+            "acquired": self.acquired,
+            "avg_wait_seconds": round(avg_wait, 4),
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+def _on_event_loop_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def off_event_loop(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    Make a blocking function awaitable by running it in a worker thread
+
+    For coroutine APIs whose bodies only make blocking Sheets calls, so their
+    quota waits and retries never hold up the event loop.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+def _status_code_of(error: Exception) -> Optional[int]:
+    """Extract the HTTP status from gspread and async client errors"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+class SheetsRequestScheduler:
+    """Thread- and asyncio-safe scheduler shared by every Sheets client in the process."""
+
+    def __init__(
+        self,
+        read_per_minute: int = GOOGLE_SHEETS_READ_REQUESTS_PER_MINUTE,
+        write_per_minute: int = GOOGLE_SHEETS_WRITE_REQUESTS_PER_MINUTE,
+        max_retries: int = GOOGLE_SHEETS_MAX_RETRIES,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 64.0,
+        processes: int = GOOGLE_SHEETS_WORKER_PROCESSES,
+    ):
+        # Refill at this process's share of the quota, burst up to all of it
+        processes = max(processes, 1)
+        self._buckets = {
+            READ: TokenBucket(
+                read_per_minute / processes, capacity=read_per_minute
+            ),
+            WRITE: TokenBucket(
+                write_per_minute / processes, capacity=write_per_minute
+            ),
+        }
+        # Waiting tickets per bucket, ordered by (priority, arrival)
+        self._waiting: Dict[str, List[Tuple[int, int]]] = {READ: [], WRITE: []}
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._metrics = {READ: _Metrics(), WRITE: _Metrics()}
+
+    # ------------------------------------------------------------------
+    # Token acquisition
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, kind: str, priority: Priority) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting[kind], ticket)
+        return ticket
+
+    def _dequeue(self, kind: str, ticket: Tuple[int, int]) -> None:
+        """Remove an abandoned ticket (e.g. cancelled coroutine)"""
+        with self._cond:
+            waiting = self._waiting[kind]
+            if ticket in waiting:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._cond.notify_all()
+
+    def _try_take(self, kind: str, ticket: Tuple[int, int]) -> float:
+        """Take a token for ``ticket`` if it is first in line; else return the wait"""
+        waiting = self._waiting[kind]
+        wait = self._buckets[kind].time_until_token()
+        if waiting[0] != ticket:
+            # Someone with a higher priority (or earlier arrival) goes first
+            return max(wait, 0.01)
+        if wait > 0:
+            return wait
+        self._buckets[kind].take()
+        heapq.heappop(waiting)
+        self._cond.notify_all()
+        return 0.0
+
+    def _record_wait(self, kind: str, started_at: float) -> None:
+        waited = time.monotonic() - started_at
+        metrics = self._metrics[kind]
+        metrics.acquired += 1
+        metrics.total_wait_seconds += waited
+        metrics.max_wait_seconds = max(metrics.max_wait_seconds, waited)
+        if waited > 1:
+            logger.info(f"Sheets {kind} request waited {waited:.2f}s for quota")
+
+    def acquire(self, kind: str, priority: Optional[Priority] = None) -> None:
+        """
+        Block the calling thread until a ``kind`` token is granted
+
+        On the event loop thread the token is taken at once, since waiting
+        would stall every request served by the loop.
+        """
+        started_at = time.monotonic()
+        if _on_event_loop_thread():
+            with self._cond:
+                self._buckets[kind].take_now()
+            self._record_wait(kind, started_at)
+            return
+
+        ticket = self._enqueue(kind, priority if priority is not None else current_priority())
+        try:
+            with self._cond:
+                while True:
+                    wait = self._try_take(kind, ticket)
+                    if wait == 0:
+                        break
+                    self._cond.wait(timeout=wait)
+        except BaseException:
+            self._dequeue(kind, ticket)
+            raise
+        self._record_wait(kind, started_at)
+
+    async def aacquire(self, kind: str, priority: Optional[Priority] = None) -> None:
+        """Wait without blocking the event loop until a ``kind`` token is granted"""
+        started_at = time.monotonic()
+        ticket = self._enqueue(kind, priority if priority is not None else current_priority())
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(kind, ticket)
+                if wait == 0:
+                    break
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._dequeue(kind, ticket)
+            raise
+        self._record_wait(kind, started_at)
+
+    # ------------------------------------------------------------------
+    # Calls with retry
+    # ------------------------------------------------------------------
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+        ceiling = min(self.max_backoff_seconds, self.base_backoff_seconds * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def _should_retry(self, kind: str, error: Exception, attempt: int) -> bool:
+        status_code = _status_code_of(error)
+        if status_code not in RETRYABLE_STATUS_CODES:
+            return False
+        metrics = self._metrics[kind]
+        if status_code == 429:
+            metrics.throttled += 1
+            # The API says the quota is gone, stop handing out tokens for now
+            with self._cond:
+                self._buckets[kind].drain()
+        if attempt >= self.max_retries:
+            metrics.failures += 1
+            return False
+        metrics.retries += 1
+        return True
+
+    def call(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        *args: Any,
+        priority: Optional[Priority] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run a blocking Sheets call under the ``kind`` quota, retrying 429/5xx
+
+        Retries sleep between attempts, so on the event loop thread the
+        error is raised instead.
+
+        Args:
+            kind: READ or WRITE
+            func: Callable performing exactly one API request
+            priority: Lane override; defaults to the current context's priority
+
+        Returns:
+            Whatever ``func`` returns
+        """
+        attempt = 0
+        while True:
+            self.acquire(kind, priority)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(kind, e, attempt):
+                    raise
+                if _on_event_loop_thread():
+                    logger.warning(
+                        f"Sheets {kind} request failed ({_status_code_of(e)}) on the event loop thread, not retrying"
+                    )
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"Sheets {kind} request failed ({_status_code_of(e)}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    async def acall(
+        self,
+        kind: str,
+        func: Callable[[], Awaitable[Any]],
+        priority: Optional[Priority] = None,
+    ) -> Any:
+        """Async variant of ``call`` for coroutine factories"""
+        attempt = 0
+        while True:
+            await self.aacquire(kind, priority)
+            try:
+                return await func()
+            except Exception as e:
+                if not self._should_retry(kind, e, attempt):
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"Sheets {kind} request failed ({_status_code_of(e)}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth per lane, wait times and throttling counters per bucket"""
+        with self._cond:
+            result = {}
+            for kind, bucket in self._buckets.items():
+                bucket._refill()
+                queue_depth = {priority.name.lower(): 0 for priority in Priority}
+                for priority_value, _ in self._waiting[kind]:
+                    queue_depth[Priority(priority_value).name.lower()] += 1
+                result[kind] = {
+                    "rate_per_minute": round(bucket.rate_per_second * 60, 2),
+                    "tokens_available": round(bucket.tokens, 2),
+                    "queue_depth": queue_depth,
+                    **self._metrics[kind].as_dict(),
+                }
+            return result
+
+
+def request_kind(method: str, endpoint: str) -> str:
+    """Classify a Sheets REST request as a read or a write"""
+    if method.lower() == "get" or ":batchGet" in endpoint:
+        return READ
+    return WRITE
+
+
+# Global instance shared by every Sheets client in the process
+sheets_scheduler = SheetsRequestScheduler()
+
+
+class ScheduledClient(gspread.Client):
+    """gspread client whose every API request goes through ``sheets_scheduler``."""
+
+    def request(self, method, endpoint, *args, **kwargs):
+        return sheets_scheduler.call(
+            request_kind(method, endpoint),
+            super().request,
+            method,
+            endpoint,
+            *args,
+            **kwargs,
+        )
@@ -0,0 +1,132 @@
+"""
+Cached worksheet directory for a Google Sheets spreadsheet
+
+``spreadsheet.worksheets()`` and ``spreadsheet.worksheet(name)`` each fetch the
+whole spreadsheet's metadata. Looking up a quarter sheet, checking whether it
+exists, finding the oldest quarter, or probing alternative names for the
+Summary/Broker sheets used to make one or more of these calls per request.
+
+WorksheetDirectory keeps one title → Worksheet map, plus the parsed list of
+``Q{n}-{yyyy}`` sheets, for each spreadsheet. The map is refreshed on a timer,
+and also when a lookup misses (a quarter sheet just created by Apps Script) or
+when a caller reports a stale worksheet.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import gspread
+
+from config import GOOGLE_SHEETS_DIRECTORY_REFRESH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+QUARTER_SHEET_PATTERN = re.compile(r"^Q([1-4])-(\d{4})$")
+
+
+class WorksheetDirectory:
+    """Thread-safe in-memory directory of a spreadsheet's worksheets."""
+
+    def __init__(
+        self,
+        spreadsheet_getter: Callable[[], Optional[gspread.Spreadsheet]],
+        refresh_seconds: int = GOOGLE_SHEETS_DIRECTORY_REFRESH_SECONDS,
+        miss_refresh_seconds: int = 30,
+    ):
+        self._spreadsheet_getter = spreadsheet_getter
+        self.refresh_seconds = refresh_seconds
+        # Minimum gap between refreshes triggered by lookups of unknown titles
+        self.miss_refresh_seconds = miss_refresh_seconds
+        self._worksheets: Dict[str, gspread.Worksheet] = {}
+        self._quarter_sheets: List[Tuple[int, int, str]] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _is_expired(self) -> bool:
+        return (
+            self._loaded_at is None
+            or (time.monotonic() - self._loaded_at) >= self.refresh_seconds
+        )
+
+    def refresh(self) -> None:
+        """Reload the worksheet list with one metadata call"""
+        spreadsheet = self._spreadsheet_getter()
+        if spreadsheet is None:
+            return
+
+        worksheets = spreadsheet.worksheets()
+        quarter_sheets = []
+        for worksheet in worksheets:
+            match = QUARTER_SHEET_PATTERN.match(worksheet.title)
+            if match:
+                quarter_sheets.append(
+                    (int(match.group(2)), int(match.group(1)), worksheet.title)
+                )
+        # Sort by year, then by quarter
+        quarter_sheets.sort(key=lambda x: (x[0], x[1]))
+
+        with self._lock:
+            self._worksheets = {worksheet.title: worksheet for worksheet in worksheets}
+            self._quarter_sheets = quarter_sheets
+            self._loaded_at = time.monotonic()
+        logger.info(f"Worksheet directory refreshed: {len(worksheets)} worksheets")
+
+    def _ensure_loaded(self) -> None:
+        if self._is_expired():
+            self.refresh()
+
+    def get(self, title: str) -> Optional[gspread.Worksheet]:
+        """Return the worksheet with ``title``, or None if it does not exist"""
+        self._ensure_loaded()
+        worksheet = self._worksheets.get(title)
+        if worksheet is not None:
+            return worksheet
+
+        # The sheet may have been created since the last refresh
+        if (
+            self._loaded_at is not None
+            and (time.monotonic() - self._loaded_at) >= self.miss_refresh_seconds
+        ):
+            self.refresh()
+            worksheet = self._worksheets.get(title)
+        return worksheet
+
+    def first_of(self, titles: Iterable[str]) -> Optional[gspread.Worksheet]:
+        """Return the first existing worksheet among candidate titles"""
+        titles = list(titles)
+        self._ensure_loaded()
+        for title in titles:
+            worksheet = self._worksheets.get(title)
+            if worksheet is not None:
+                return worksheet
+
+        if (
+            self._loaded_at is not None
+            and (time.monotonic() - self._loaded_at) >= self.miss_refresh_seconds
+        ):
+            self.refresh()
+            for title in titles:
+                worksheet = self._worksheets.get(title)
+                if worksheet is not None:
+                    return worksheet
+        return None
+
+    def exists(self, title: str) -> bool:
+        return self.get(title) is not None
+
+    def titles(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._worksheets)
+
+    def quarter_sheets(self) -> List[Tuple[int, int, str]]:
+        """Return (year, quarter, title) for every quarter sheet, oldest first"""
+        self._ensure_loaded()
+        return list(self._quarter_sheets)
+
+    def invalidate(self) -> None:
+        """Force the next lookup to reload the directory"""
+        with self._lock:
+            self._loaded_at = None